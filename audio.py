@@ -0,0 +1,159 @@
+import time
+from dataclasses import dataclass
+from enum import Enum, auto
+from pathlib import Path
+from typing import Final
+
+import pygame
+
+import settings
+from paths import assetsPath
+
+# All the sound effects go through here
+# Sounds are decoded once (preload, called when a level is built) instead of on the first jump / cage landing,
+# and they play on a fixed pool of channels with a voice limit per sound, when the pool is full a lower priority
+# sound gets stolen, if there is none the new sound is dropped (counted in AudioStats)
+
+songsPath: Path = assetsPath / "songs"
+
+# Small buffer = low latency, 512 frames at 44.1kHz is ~11.6 ms
+mixerFrequency: Final[int] = 44100
+mixerBufferSize: Final[int] = 512
+channelCount: Final[int] = 8
+
+
+class Sfx(Enum):
+    JUMP = auto()
+    SLIDE = auto()
+    CAGE_FALL = auto()
+
+
+@dataclass(frozen=True, slots=True)
+class SfxSpec:
+    path: Path
+    maxVoices: int
+    priority: int
+    volume: float = 1.0
+
+
+sfxSpecs: dict[Sfx, SfxSpec] = {
+    Sfx.JUMP: SfxSpec(songsPath / "jump.ogg", maxVoices=2, priority=2),
+    Sfx.SLIDE: SfxSpec(songsPath / "cartoon-slide.ogg", maxVoices=1, priority=1),
+    Sfx.CAGE_FALL: SfxSpec(songsPath / "metal3.ogg", maxVoices=3, priority=3),
+}
+
+
+@dataclass(slots=True)
+class AudioStats:
+    plays: int = 0
+    dropped: int = 0
+    stolen: int = 0
+    muted: int = 0
+    lastPlayMs: float = 0.0
+
+    # What the mixer buffer alone adds between play() and the speakers
+    @property
+    def bufferLatencyMs(self) -> float:
+        init = pygame.mixer.get_init()
+        if not init:
+            return 0.0
+        return mixerBufferSize / init[0] * 1000.0
+
+
+stats: AudioStats = AudioStats()
+
+_sounds: dict[Sfx, pygame.mixer.Sound] = {}
+_channels: list[pygame.mixer.Channel] = []
+_channelSfx: list[Sfx | None] = []
+_channelStart: list[int] = []
+
+
+# Has to be called before pygame.init()
+def preInit() -> None:
+    pygame.mixer.pre_init(mixerFrequency, -16, 2, mixerBufferSize)
+
+
+def _ready() -> bool:
+    if not pygame.mixer.get_init():
+        return False
+    if not _channels:
+        pygame.mixer.set_num_channels(channelCount)
+        for i in range(channelCount):
+            _channels.append(pygame.mixer.Channel(i))
+            _channelSfx.append(None)
+            _channelStart.append(0)
+    return True
+
+
+def preload() -> None:
+    if not _ready():
+        return
+    for sfx, spec in sfxSpecs.items():
+        if sfx not in _sounds:
+            sound = pygame.mixer.Sound(spec.path)
+            sound.set_volume(spec.volume)
+            _sounds[sfx] = sound
+
+
+def _pickChannel(sfx: Sfx, spec: SfxSpec) -> int | None:
+    busySame: list[int] = []
+    free: int | None = None
+    victim: int | None = None
+    for i, channel in enumerate(_channels):
+        if not channel.get_busy():
+            if free is None:
+                free = i
+            continue
+        playing = _channelSfx[i]
+        if playing == sfx:
+            busySame.append(i)
+        elif playing is not None and sfxSpecs[playing].priority < spec.priority:
+            if victim is None or sfxSpecs[playing].priority < sfxSpecs[_channelSfx[victim] or sfx].priority:
+                victim = i
+
+    # Voice limit reached, restart the oldest voice of this sound
+    if len(busySame) >= spec.maxVoices:
+        stats.stolen += 1
+        return min(busySame, key=lambda i: _channelStart[i])
+    if free is not None:
+        return free
+    if victim is not None:
+        stats.stolen += 1
+        return victim
+    return None
+
+
+def play(sfx: Sfx) -> None:
+    if not settings.bSoundEnabled:
+        stats.muted += 1
+        return
+    if not _ready():
+        return
+
+    start = time.perf_counter()
+    sound = _sounds.get(sfx)
+    if sound is None:
+        preload()
+        sound = _sounds[sfx]
+
+    idx = _pickChannel(sfx, sfxSpecs[sfx])
+    if idx is None:
+        stats.dropped += 1
+        return
+
+    _channels[idx].play(sound)
+    _channelSfx[idx] = sfx
+    _channelStart[idx] = pygame.time.get_ticks()
+    stats.plays += 1
+    stats.lastPlayMs = (time.perf_counter() - start) * 1000.0
+
+
+# Muted = nothing left to mix, playing channels are stopped and the mixer is paused
+def applyMute() -> None:
+    if not pygame.mixer.get_init():
+        return
+    if settings.bSoundEnabled:
+        pygame.mixer.unpause()
+    else:
+        pygame.mixer.stop()
+        pygame.mixer.pause()
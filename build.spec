@@ -14,11 +14,11 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=datas,
-    hiddenimports=['pygame', 'pygame_gui', 'PIL'],
+    hiddenimports=['pygame'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['PIL', 'pytablericons'],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
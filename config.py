@@ -1,18 +1,62 @@
 import json
+import os
+import sys
+import threading
+import time
 from pathlib import Path
+from typing import Any, Final
 
 configFile: str = "config.json"
+# Before v2 the gamepad bindings had their own file, it gets merged into config.json the first time we load
+legacyJoyFile: str = "joybindings.json"
 
+# v1: no "version" key, v2: joybindings moved in config.json
+schemaVersion: Final[int] = 2
+# Rapid changes (options menu toggles, rebinding...) are coalesced in a single write
+saveDebounceS: Final[float] = 0.25
 
-def load() -> None:
+# No threads in the browser, we write right away there (it's a virtual fs anyway)
+_BROWSER: Final[bool] = sys.platform == "emscripten"
+
+_data: dict[str, Any] | None = None
+
+
+def _read() -> dict[str, Any]:
+    global _data
+    if _data is not None:
+        return _data
+
+    data: dict[str, Any] = {}
     path = Path(configFile)
-    if not path.exists():
-        return
-    try:
-        with open(path) as f:
-            data = json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return
+    if path.exists():
+        try:
+            with open(path) as f:
+                loaded = json.load(f)
+            if isinstance(loaded, dict):
+                data = loaded
+        except (json.JSONDecodeError, OSError):
+            pass
+
+    _data = _migrate(data)
+    return _data
+
+
+def _migrate(data: dict[str, Any]) -> dict[str, Any]:
+    version = data.get("version", 1)
+    if version < 2:
+        legacy = Path(legacyJoyFile)
+        if "joybindings" not in data and legacy.exists():
+            try:
+                with open(legacy) as f:
+                    data["joybindings"] = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                pass
+    data["version"] = schemaVersion
+    return data
+
+
+def load() -> None:
+    data = _read()
 
     from keybindings import keyBindings
     if "keybindings" in data:
@@ -26,6 +70,8 @@ def load() -> None:
     import settings
     if "bSoundEnabled" in data:
         settings.bSoundEnabled = data["bSoundEnabled"]
+    if data.get("frameCap") in settings.FrameCap.__members__:
+        settings.frameCap = settings.FrameCap[data["frameCap"]]
 
     if "levelCompleted" in data:
         settings.levelCompleted = {int(k): v for k, v in data["levelCompleted"].items()}
@@ -41,19 +87,124 @@ def load() -> None:
         settings.levelUnlocked[2] = True
 
 
-def save() -> None:
+# Raw "joybindings" section, JoyBindings parses it when it's created
+def joyBindingsData() -> dict[str, Any] | None:
+    section = _read().get("joybindings")
+    return section if isinstance(section, dict) else None
+
+
+def _snapshot() -> dict[str, Any]:
     from keybindings import keyBindings
+    from entities.input.joybindings import JoyBindings
     import settings
 
-    data = {
+    data = _read()
+    data.update({
+        "version": schemaVersion,
         "keybindings": {
             "jump": keyBindings.jump,
             "slide": keyBindings.slide,
             "restart": keyBindings.restart,
         },
         "bSoundEnabled": settings.bSoundEnabled,
+        "frameCap": settings.frameCap.name,
         "levelCompleted": {str(k): v for k, v in settings.levelCompleted.items()},
         "levelUnlocked": {str(k): v for k, v in settings.levelUnlocked.items()},
-    }
-    with open(configFile, "w") as f:
+    })
+    # If nobody touched the gamepad bindings this session we keep what was loaded
+    if JoyBindings._instance is not None:
+        data["joybindings"] = JoyBindings().toConfig()
+    for key in ("bLevel1Completed", "bLevel2Completed", "bLevel2Unlocked"):
+        data.pop(key, None)
+    # The sections above are all fresh dicts, a shallow copy is enough for the writer thread
+    return dict(data)
+
+
+# Temp file + rename, if we die in the middle the old config.json is still there
+def _writeAtomic(data: dict[str, Any]) -> None:
+    path = Path(configFile)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
         json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._pending: dict[str, Any] | None = None
+        self._dueAt: float = 0.0
+        self._bWriting: bool = False
+        self._thread: threading.Thread | None = None
+        self.writes: int = 0
+        self.coalesced: int = 0
+
+    def submit(self, data: dict[str, Any]) -> None:
+        with self._cond:
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = data
+            self._dueAt = time.monotonic() + saveDebounceS
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="config-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._pending is None:
+                        self._cond.wait()
+                        continue
+                    remaining = self._dueAt - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                data = self._pending
+                self._pending = None
+                self._bWriting = True
+            try:
+                _writeAtomic(data)
+                self.writes += 1
+            except OSError:
+                pass
+            finally:
+                with self._cond:
+                    self._bWriting = False
+                    self._cond.notify_all()
+
+    # Writes whatever is still waiting on the calling thread, used on quit
+    def flush(self) -> None:
+        with self._cond:
+            data = self._pending
+            self._pending = None
+            while self._bWriting:
+                self._cond.wait()
+        if data is not None:
+            try:
+                _writeAtomic(data)
+                self.writes += 1
+            except OSError:
+                pass
+
+
+_writer = _Writer()
+
+
+# Never touches the disk on the calling thread, safe to call mid frame
+def save() -> None:
+    data = _snapshot()
+    if _BROWSER:
+        try:
+            _writeAtomic(data)
+        except OSError:
+            pass
+        return
+    _writer.submit(data)
+
+
+def flush() -> None:
+    _writer.flush()
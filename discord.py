@@ -1,5 +1,7 @@
 from typing import Any, Final
+from dataclasses import dataclass, field
 from enum import Enum, auto
+import asyncio
 import time
 import sys
 
@@ -12,8 +14,15 @@ AioPresence: Any = None
 DiscordNotFound: Any = Exception
 PipeClosed: Any = Exception
 _PYPRESENCE_AVAILABLE: bool = False
+_bPypresenceLoaded: bool = False
 
-if not _BROWSER_ENV:
+
+# pypresence is imported on the first connect, not when the game starts
+def _loadPypresence() -> None:
+    global AioPresence, DiscordNotFound, PipeClosed, _PYPRESENCE_AVAILABLE, _bPypresenceLoaded
+    if _bPypresenceLoaded or _BROWSER_ENV:
+        return
+    _bPypresenceLoaded = True
     try:
         from pypresence import AioPresence as _AioPresence, DiscordNotFound as _DiscordNotFound, PipeClosed as _PipeClosed  # type: ignore
         AioPresence = _AioPresence
@@ -26,93 +35,175 @@ if not _BROWSER_ENV:
 
 clientId: Final[str] = "1468228058472386624"
 
+# Discord runs in its own task, the frame loop only drops the latest presence in a one slot mailbox and never awaits
+# the IPC pipe, a slow or hung Discord can't delay a frame anymore
+connectTimeoutS: Final[float] = 5.0
+callTimeoutS: Final[float] = 2.0
+backoffStartS: Final[float] = 2.0
+backoffMaxS: Final[float] = 60.0
+
+
 class PresenceState(Enum):
     MENU = auto()
     PLAYING = auto()
     GAME_OVER = auto()
 
 
+@dataclass(slots=True)
+class Presence:
+    state: PresenceState
+    score: int = 0
+    postedAt: float = field(default=0.0, compare=False)
+
+
+@dataclass(slots=True)
+class PresenceStats:
+    sent: int = 0
+    # replaced in the mailbox before the worker got to them
+    dropped: int = 0
+    failures: int = 0
+    reconnects: int = 0
+    # time between post() and Discord acknowledging it
+    lastAgeMs: float = 0.0
+
+
 class DiscordRPC:
     def __init__(self) -> None:
         self.rpc: Any = None
         self.bConnected: bool = False
-        self.currentState: PresenceState | None = None
-        self.currentScore: int = 0
         self.startTime: int = 0
+        self.stats: PresenceStats = PresenceStats()
 
-    async def connect(self) -> None:
-        if not _PYPRESENCE_AVAILABLE or AioPresence is None:
-            self.bConnected = False
-            return
-        try:
-            self.rpc = AioPresence(clientId)
-            await self.rpc.connect()
-            self.bConnected = True
-            self.startTime = int(time.time())
-        except (DiscordNotFound, PipeClosed, ConnectionRefusedError, FileNotFoundError):
-            self.bConnected = False
-        except Exception:
-            self.bConnected = False
+        self._mailbox: Presence | None = None
+        self._sent: Presence | None = None
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
 
-    async def updateMenu(self) -> None:
-        if not self.bConnected or self.rpc is None:
-            return
-        if self.currentState == PresenceState.MENU:
+    # Needs the running loop, called once the first frame is on screen
+    def start(self) -> None:
+        if self._task is not None or _BROWSER_ENV:
             return
-        self.currentState = PresenceState.MENU
-        try:
-            await self.rpc.update(
-                state=rpcInMenu,
-                large_image="game_logo",
-                large_text=rpcGameName,
-                start=self.startTime
-            )
-        except (PipeClosed, ConnectionRefusedError, BrokenPipeError, RuntimeError):
-            self.bConnected = False
+        self._wake = asyncio.Event()
+        self._task = asyncio.ensure_future(self._run())
 
-    async def updatePlaying(self, score: int) -> None:
-        if not self.bConnected or self.rpc is None:
-            return
-        if self.currentState == PresenceState.PLAYING and self.currentScore == score:
+    def post(self, state: PresenceState, score: int = 0) -> None:
+        presence = Presence(state, score, time.perf_counter())
+        if presence == self._mailbox or (self._mailbox is None and presence == self._sent):
             return
-        self.currentState = PresenceState.PLAYING
-        self.currentScore = score
-        try:
-            await self.rpc.update(
-                state=rpcPlaying.format(score=score),
-                large_image="game_logo",
-                large_text=rpcGameName,
-                start=self.startTime
-            )
-        except (PipeClosed, ConnectionRefusedError, BrokenPipeError, RuntimeError):
-            self.bConnected = False
+        if self._mailbox is not None:
+            self.stats.dropped += 1
+        self._mailbox = presence
+        if self._wake is not None:
+            self._wake.set()
 
-    async def updateGameOver(self, finalScore: int) -> None:
-        if not self.bConnected or self.rpc is None:
-            return
-        if self.currentState == PresenceState.GAME_OVER and self.currentScore == finalScore:
-            return
-        self.currentState = PresenceState.GAME_OVER
-        self.currentScore = finalScore
-        try:
-            await self.rpc.update(
-                state=rpcGameOver.format(score=finalScore),
-                large_image="game_logo",
-                large_text=rpcGameName,
-                start=self.startTime
-            )
-        except (PipeClosed, ConnectionRefusedError, BrokenPipeError, RuntimeError):
+    def updateMenu(self) -> None:
+        self.post(PresenceState.MENU)
+
+    def updatePlaying(self, score: int) -> None:
+        self.post(PresenceState.PLAYING, score)
+
+    def updateGameOver(self, finalScore: int) -> None:
+        self.post(PresenceState.GAME_OVER, finalScore)
+
+    async def _run(self) -> None:
+        assert self._wake is not None
+        delay = backoffStartS
+        while True:
+            if not self.bConnected:
+                if not await self.connect():
+                    if not _PYPRESENCE_AVAILABLE:
+                        return
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, backoffMaxS)
+                    continue
+                delay = backoffStartS
+                # Discord forgot about us, send the last one again
+                if self._mailbox is None:
+                    self._mailbox = self._sent
+
+            presence = self._mailbox
+            if presence is None:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+
+            self._mailbox = None
+            try:
+                await asyncio.wait_for(self._send(presence), callTimeoutS)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # pipe closed, timeout, Discord error... reconnect and retry with whatever is the latest by then
+                self.stats.failures += 1
+                self._dropRpc()
+                if self._mailbox is None:
+                    self._mailbox = presence
+                continue
+
+            self._sent = presence
+            self.stats.sent += 1
+            self.stats.lastAgeMs = (time.perf_counter() - presence.postedAt) * 1000.0
+
+    async def _send(self, presence: Presence) -> None:
+        if presence.state == PresenceState.MENU:
+            text = rpcInMenu
+        elif presence.state == PresenceState.PLAYING:
+            text = rpcPlaying.format(score=presence.score)
+        else:
+            text = rpcGameOver.format(score=presence.score)
+        await self.rpc.update(
+            state=text,
+            large_image="game_logo",
+            large_text=rpcGameName,
+            start=self.startTime
+        )
+
+    async def connect(self) -> bool:
+        _loadPypresence()
+        if not _PYPRESENCE_AVAILABLE or AioPresence is None:
             self.bConnected = False
+            return False
+        try:
+            self.rpc = AioPresence(clientId, connection_timeout=connectTimeoutS, response_timeout=callTimeoutS)
+            await asyncio.wait_for(self.rpc.connect(), connectTimeoutS)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._dropRpc()
+            return False
+        if self.startTime == 0:
+            self.startTime = int(time.time())
+        else:
+            self.stats.reconnects += 1
+        self.bConnected = True
+        return True
 
-    async def close(self) -> None:
+    # Close the pipe before forgetting about it, otherwise every reconnect leaks one
+    def _dropRpc(self) -> None:
         if self.rpc is not None:
-            try:
-                await self.rpc.clear()
-            except (PipeClosed, ConnectionRefusedError, BrokenPipeError, Exception):
-                pass
             try:
                 self.rpc.close()
             except (PipeClosed, ConnectionRefusedError, BrokenPipeError, Exception):
                 pass
         self.bConnected = False
         self.rpc = None
+
+    def statsText(self) -> str:
+        s = self.stats
+        status = "connected" if self.bConnected else "offline"
+        return f"{status}, {s.sent} sent, {s.dropped} dropped, {s.failures} failed, age {s.lastAgeMs:.0f} ms"
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        if self.rpc is not None and self.bConnected:
+            try:
+                await asyncio.wait_for(self.rpc.clear(), callTimeoutS)
+            except (PipeClosed, ConnectionRefusedError, BrokenPipeError, Exception):
+                pass
+        self._dropRpc()
@@ -1,13 +1,15 @@
-from .animation import AnimationFrame, AnimatedSprite, loadFrames
+from .animation import AnimationFrame, AnimatedSprite, loadFrames, loadFramesMeta
 from .player import Player, PlayerState
 from .chaser import Chaser
-from .obstacle import Obstacle, BaseObstacle, FallingCage, CageState, Ceiling
+from .obstacle import Obstacle, BaseObstacle, FallingCage, CageState, Ceiling, ScrollLane
+from .batch import SpriteBatch
 from .tilemap import Tile, TileSet, GroundTilemap, DecorSprite, DecorLayer, CeilingTileSet, CeilingTilemap, tileSize
 
 __all__ = [
-    'AnimationFrame', 'AnimatedSprite', 'loadFrames',
+    'AnimationFrame', 'AnimatedSprite', 'loadFrames', 'loadFramesMeta',
     'Player', 'PlayerState',
     'Chaser',
-    'Obstacle', 'BaseObstacle', 'FallingCage', 'CageState', 'Ceiling',
+    'Obstacle', 'BaseObstacle', 'FallingCage', 'CageState', 'Ceiling', 'ScrollLane',
+    'SpriteBatch',
     'Tile', 'TileSet', 'GroundTilemap', 'DecorSprite', 'DecorLayer', 'CeilingTileSet', 'CeilingTilemap', 'tileSize'
 ]
@@ -1,6 +1,7 @@
+import json
 import re
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import pygame
 from pygame import Surface
@@ -39,6 +40,23 @@ class AnimatedSprite(Sprite):
         return bAdvanced
 
 
+# Written next to the frames by python -m tools.build_assets: file, delay, size and alpha bbox of every frame
+framesMetaName: str = "frames.json"
+
+
+# None when the folder has no (or an outdated) frames.json, the caller then has to look at the gifs itself
+def loadFramesMeta(path: Path) -> list[dict[str, Any]] | None:
+    try:
+        with open(path / framesMetaName) as f:
+            meta = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    frames = meta.get("frames") if isinstance(meta, dict) else None
+    if not isinstance(frames, list) or [f.get("file") for f in frames] != [p.name for p in sorted(path.glob("*.gif"))]:
+        return None
+    return frames
+
+
 # Loading animation frames from a folder of .gif files
 # The filename is encoding the frame index and the delay (e.g. frame_0_delay-0.1s.gif)
 # You can scale them or slice to only load a portion of the animation
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from pygame import Rect, Surface
+
+BlitItem = tuple[Surface, tuple[int, int]]
+
+
+# Collects the blits of one draw layer (obstacles, cages...) for a frame and sends them in a single fblits call
+# Items are drawn in the order they are added, anything outside the viewport is dropped before it gets to SDL
+# The counts of the last flush are kept so the game screen can show them in the profiler
+class SpriteBatch:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.viewport = Rect(0, 0, 0, 0)
+        self._items: list[BlitItem] = []
+
+        self.drawn: int = 0
+        self.culled: int = 0
+        self.calls: int = 0
+
+    def begin(self, viewport: Rect) -> None:
+        self.viewport = viewport
+        self._items.clear()
+        self.culled = 0
+
+    def add(self, image: Surface, pos: tuple[int, int]) -> None:
+        x, y = pos
+        w, h = image.get_size()
+        vp = self.viewport
+        if x >= vp.right or y >= vp.bottom or x + w <= vp.left or y + h <= vp.top:
+            self.culled += 1
+            return
+        self._items.append((image, pos))
+
+    def flush(self, screen: Surface) -> None:
+        self.drawn = len(self._items)
+        self.calls = 1 if self._items else 0
+        if self._items:
+            screen.fblits(self._items)
+        self._items.clear()
+
+    def stats(self) -> str:
+        return f"{self.drawn} drawn, {self.culled} culled, {self.calls} call"
@@ -4,11 +4,11 @@ from enum import Enum, auto
 from pathlib import Path
 
 from pygame import Rect
-from pygame.sprite import Group
 
 from entities.animation import AnimatedSprite, AnimationFrame, loadFrames
-from entities.obstacle.cage import FallingCage, CageState
-from entities.obstacle.lane import Obstacle
+from entities.obstacle.base import BaseObstacle
+from entities.obstacle.cage import FallingCage
+from entities.lookahead import LookAhead
 from entities.player import getRunningHeight
 from paths import assetsPath
 
@@ -121,39 +121,18 @@ class Chaser(AnimatedSprite):
 
     # This logic is not accurated (100%), but was the best i could get to
     # Used when the chaser need to avoid a cage
-    def _findCageToJumpOn(self, cages: Group[FallingCage]) -> FallingCage | None:
-        for cage in cages:
-            if cage.state not in (CageState.FALLING, CageState.GROUNDED):
-                continue
-
-            cageCenterX = cage.rect.centerx
-            chaserCenterX = self.rect.centerx
-            dist = cageCenterX - chaserCenterX
-
-            if 0 < dist < self.cageDetectionRange:
-                return cage
-        return None
+    def _findCageToJumpOn(self, lookAhead: LookAhead) -> FallingCage | None:
+        return lookAhead.nextCage(self.rect.centerx, self.cageDetectionRange)
 
     # For lanes on the ground (aka body)
-    def _findObstacleToJumpOver(self, obstacles: Group[Obstacle]) -> Obstacle | None:
-        for obstacle in obstacles:
-            obstacleCenterX = obstacle.rect.centerx
-            chaserCenterX = self.rect.centerx
-            dist = obstacleCenterX - chaserCenterX
-            if 0 < dist < self.obstacleDetectionRange:
-                return obstacle
-        return None
-
-    def _checkLandOnCage(self, cages: Group[FallingCage]) -> FallingCage | None:
-        for cage in cages:
-            if cage.state not in (CageState.FALLING, CageState.GROUNDED):
-                continue
-
-            bOverCage = cage.rect.left < self.rect.centerx < cage.rect.right
-            bFallingOnto = self.velocityY > 0
-            bAtCageTop = self.rect.bottom >= cage.rect.top and self.rect.bottom <= cage.rect.top + 30
-
-            if bOverCage and bFallingOnto and bAtCageTop:
+    def _findObstacleToJumpOver(self, lookAhead: LookAhead) -> BaseObstacle | None:
+        return lookAhead.nextObstacle(self.rect.centerx, self.obstacleDetectionRange)
+
+    def _checkLandOnCage(self, lookAhead: LookAhead) -> FallingCage | None:
+        if self.velocityY <= 0:
+            return None
+        for cage in lookAhead.cagesUnder(self.rect.centerx):
+            if cage.rect.top <= self.rect.bottom <= cage.rect.top + 30:
                 return cage
         return None
 
@@ -170,17 +149,18 @@ class Chaser(AnimatedSprite):
         self.image = self._getFrame()
         self.rect = self.image.get_rect(midbottom=oldMidbottom)
 
-    def update(self, dt: float, cages: Group[FallingCage] | None = None, obstacles: Group[Obstacle] | None = None) -> None:
+    # lookAhead is None when the chaser shouldn't react to obstacles (catching the player)
+    def update(self, dt: float, lookAhead: LookAhead | None = None) -> None:
         if self.updateAnimation(dt):
             self._updateImage()
 
         if self.state == ChaserState.RUNNING:
-            if cages:
-                targetCage = self._findCageToJumpOn(cages)
+            if lookAhead:
+                targetCage = self._findCageToJumpOn(lookAhead)
                 if targetCage:
                     self._jump()
-            if obstacles and self.bOnGround:
-                targetObstacle = self._findObstacleToJumpOver(obstacles)
+            if lookAhead and self.bOnGround:
+                targetObstacle = self._findObstacleToJumpOver(lookAhead)
                 if targetObstacle:
                     self._jump()
 
@@ -189,8 +169,8 @@ class Chaser(AnimatedSprite):
             self.posY += self.velocityY * dt
             self.rect.bottom = int(self.posY)
 
-            if cages:
-                landedCage = self._checkLandOnCage(cages)
+            if lookAhead:
+                landedCage = self._checkLandOnCage(lookAhead)
                 if landedCage:
                     self.posY = float(landedCage.rect.top)
                     self.rect.bottom = landedCage.rect.top
@@ -6,6 +6,7 @@ from pygame import Surface
 from pygame.math import Vector2
 
 from entities.obstacle.geometric import GeometricObstacle
+from quality import QualityGovernor
 
 
 # Single particle spawned from a destroyed geometric obstacle
@@ -41,6 +42,7 @@ class DisintegrationEffect:
 
     def __init__(self, obstacle: GeometricObstacle) -> None:
         self.particles: list[DisintegrationParticle] = []
+        self.quality = QualityGovernor().tier
         self._sample(obstacle)
 
     def _sample(self, obs: GeometricObstacle) -> None:
@@ -80,8 +82,9 @@ class DisintegrationEffect:
                     worldPos, vel, life, radius, (c.r, c.g, c.b), angVel
                 ))
 
-        if len(candidates) > self.maxParticles:
-            self.particles = random.sample(candidates, self.maxParticles)
+        maxParticles = max(1, int(self.maxParticles * self.quality.particleScale))
+        if len(candidates) > maxParticles:
+            self.particles = random.sample(candidates, maxParticles)
         else:
             self.particles = candidates
 
@@ -107,7 +110,7 @@ class DisintegrationEffect:
             ix, iy = int(p.pos.x), int(p.pos.y)
 
             # Drawing a small glow effect behind the particle
-            if r >= 3:
+            if r >= 3 and self.quality.bParticleGlow:
                 gr = r * 2
                 gSurf = Surface((gr * 2, gr * 2), pygame.SRCALPHA)
                 pygame.draw.circle(gSurf, (rc, gc, bc, max(1, alpha // 4)), (gr, gr), gr)
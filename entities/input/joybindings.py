@@ -1,7 +1,5 @@
 from typing import Final
 from dataclasses import dataclass
-from pathlib import Path
-import json
 
 from .manager import GameAction
 
@@ -15,8 +13,6 @@ class JoyBinding:
 
 
 class JoyBindings:
-    CONFIG_FILE: Final[str] = "joybindings.json"
-
     DEFAULT_BINDINGS: Final[dict[GameAction, JoyBinding]] = {
         GameAction.JUMP: JoyBinding(button=0),
         GameAction.SLIDE: JoyBinding(button=1),
@@ -48,13 +44,13 @@ class JoyBindings:
                 if existing is None or (action in gameplayActions and existing not in gameplayActions):
                     self._buttonToAction[binding.button] = action
 
+    # The bindings live in the "joybindings" section of config.json (they used to have their own file)
     def _loadConfig(self) -> None:
-        configPath = Path(self.CONFIG_FILE)
-        if not configPath.exists():
+        import config
+        data = config.joyBindingsData()
+        if data is None:
             return
         try:
-            with open(configPath, 'r') as f:
-                data = json.load(f)
             for actionName, bindingData in data.items():
                 action = GameAction[actionName]
                 self.bindings[action] = JoyBinding(
@@ -64,10 +60,10 @@ class JoyBindings:
                     trigger=bindingData.get('trigger')
                 )
             self._rebuildLookup()
-        except (json.JSONDecodeError, KeyError, FileNotFoundError):
+        except (KeyError, AttributeError):
             pass
 
-    def saveConfig(self) -> None:
+    def toConfig(self) -> dict[str, dict[str, int | None]]:
         data = {}
         for action, binding in self.bindings.items():
             data[action.name] = {
@@ -76,12 +72,19 @@ class JoyBindings:
                 'axisDirection': binding.axisDirection,
                 'trigger': binding.trigger
             }
-        with open(self.CONFIG_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        return data
+
+    def saveConfig(self) -> None:
+        import config
+        config.save()
 
     def getActionForButton(self, button: int) -> GameAction | None:
         return self._buttonToAction.get(button)
 
+    # Rebuilt in place when the bindings change, the InputManager keeps a reference to it
+    def actionMap(self) -> dict[int, GameAction]:
+        return self._buttonToAction
+
     def setBinding(self, action: GameAction, binding: JoyBinding) -> None:
         self.bindings[action] = binding
         self._rebuildLookup()
@@ -74,9 +74,10 @@ class JoyIcons:
         pygame.draw.rect(surf, (100, 100, 100), surf.get_rect(), 2, border_radius=4)
 
         fontSize = max(10, sz[1] - 8)
-        font = pygame.font.Font(None, fontSize)
+        from screens.ui.fonts import getFont, renderText
+        font = getFont(fontSize)
         name = self.getButtonName(button)
-        text = font.render(name, True, (255, 255, 255))
+        text = renderText(font, name, (255, 255, 255))
         textRect = text.get_rect(center=(sz[0] // 2, sz[1] // 2))
         surf.blit(text, textRect)
 
@@ -1,6 +1,7 @@
 from enum import Enum, auto
 from dataclasses import dataclass
-from typing import Final
+from typing import Callable, Final
+import time
 
 import pygame
 
@@ -24,17 +25,31 @@ class GameAction(Enum):
     PAUSE = auto()
 
 
+# One bit per action, InputManager.held / pressed are ints made of these
+actionBits: Final[dict[GameAction, int]] = {action: 1 << action.value for action in GameAction}
+
+# Only the two stick axes are used (menu navigation), triggers / right stick motion is ignored right away
+_NAV_AXES: Final[int] = 2
+
+
 @dataclass(slots=True)
 class InputEvent:
     action: GameAction
     source: InputSource
     bPressed: bool
     rawValue: float = 1.0
+    # perf_counter ms of the SDL event (or of the poll that got it), used for the input latency
+    timestamp: float = 0.0
 
 
+# InputEvents are not allocated per event, they come from a small ring that is reused, so they are only valid until
+# RING_SIZE more events went through (nothing keeps them after handleEvent anyway)
+# Key / button -> action are dicts compiled by KeyBindings / JoyBindings when the bindings change, here we only
+# dispatch on the event type and do one lookup
 class InputManager:
     DEADZONE: Final[float] = 0.3
     AXIS_THRESHOLD: Final[float] = 0.5
+    RING_SIZE: Final[int] = 32
 
     _instance: "InputManager | None" = None
 
@@ -53,6 +68,31 @@ class InputManager:
         self._axisStates: dict[int, dict[int, int]] = {}
         self._hatStates: dict[int, dict[int, tuple[int, int]]] = {}
 
+        self.pollTimeMs: float = 0.0
+        self._ticksOffsetMs: float = 0.0
+
+        # Bitsets of actions (see actionBits): held right now, and pressed since the last poll
+        self.held: int = 0
+        self.pressed: int = 0
+
+        self._ring: list[InputEvent] = [InputEvent(GameAction.JUMP, InputSource.KEYBOARD, False)
+                                        for _ in range(self.RING_SIZE)]
+        self._ringIndex: int = 0
+
+        from keybindings import KeyBindings
+        from .joybindings import JoyBindings
+        self._keyBindings = KeyBindings()
+        self._buttonActions = JoyBindings().actionMap()
+
+        self._handlers: dict[int, Callable[[pygame.event.Event], InputEvent | None]] = {
+            pygame.KEYDOWN: self._onKeyDown,
+            pygame.KEYUP: self._onKeyUp,
+            pygame.JOYBUTTONDOWN: self._onButtonDown,
+            pygame.JOYBUTTONUP: self._onButtonUp,
+            pygame.JOYAXISMOTION: self._processAxisEvent,
+            pygame.JOYHATMOTION: self._processHatEvent,
+        }
+
         pygame.joystick.init()
         self._scanJoysticks()
 
@@ -89,52 +129,82 @@ class InputManager:
             self.activeJoystickId = next(iter(self.joysticks.keys()), None)
         self.bJoystickConnected = len(self.joysticks) > 0
 
-    def processEvent(self, event: pygame.event.Event) -> InputEvent | None:
-        from .joybindings import JoyBindings
-        from keybindings import KeyBindings
+    # Called right before pygame.event.get()
+    def beginPoll(self) -> None:
+        self.pollTimeMs = time.perf_counter() * 1000.0
+        self._ticksOffsetMs = self.pollTimeMs - pygame.time.get_ticks()
+        self.pressed = 0
 
-        if event.type == pygame.KEYDOWN:
-            self.lastInputSource = InputSource.KEYBOARD
-            action = KeyBindings().getActionForKey(event.key)
-            if action:
-                return InputEvent(action, InputSource.KEYBOARD, True)
-
-        elif event.type == pygame.KEYUP:
-            action = KeyBindings().getActionForKey(event.key)
-            if action:
-                return InputEvent(action, InputSource.KEYBOARD, False)
-
-        elif event.type == pygame.JOYBUTTONDOWN:
-            if event.instance_id != self.activeJoystickId:
-                return None
-            self.lastInputSource = InputSource.JOYSTICK
-            action = JoyBindings().getActionForButton(event.button)
-            if action:
-                inputEvent = InputEvent(action, InputSource.JOYSTICK, True)
-                return inputEvent
-
-        elif event.type == pygame.JOYBUTTONUP:
-            if event.instance_id != self.activeJoystickId:
-                return None
-            action = JoyBindings().getActionForButton(event.button)
-            if action:
-                return InputEvent(action, InputSource.JOYSTICK, False)
-
-        elif event.type == pygame.JOYAXISMOTION:
-            if event.instance_id != self.activeJoystickId:
-                return None
-            return self._processAxisEvent(event)
-
-        elif event.type == pygame.JOYHATMOTION:
-            if event.instance_id != self.activeJoystickId:
-                return None
-            return self._processHatEvent(event)
+    # pygame doesn't give us the SDL timestamp of the events (yet), if it's there we convert it from SDL ticks,
+    # otherwise the poll time is the closest we have (that's why the low latency loop polls late)
+    def eventTimeMs(self, event: pygame.event.Event) -> float:
+        sdlTimestamp = getattr(event, "timestamp", None)
+        if isinstance(sdlTimestamp, int) and sdlTimestamp > 0:
+            return sdlTimestamp + self._ticksOffsetMs
+        return self.pollTimeMs
 
-        return None
+    def processEvent(self, event: pygame.event.Event) -> InputEvent | None:
+        handler = self._handlers.get(event.type)
+        if handler is None:
+            return None
+        inputEvent = handler(event)
+        if inputEvent is not None:
+            inputEvent.timestamp = self.eventTimeMs(event)
+        return inputEvent
+
+    def isHeld(self, action: GameAction) -> bool:
+        return bool(self.held & actionBits[action])
+
+    def wasPressed(self, action: GameAction) -> bool:
+        return bool(self.pressed & actionBits[action])
+
+    def _emit(self, action: GameAction, source: InputSource, bPressed: bool, bHold: bool = True) -> InputEvent:
+        bit = actionBits[action]
+        if bPressed:
+            self.pressed |= bit
+            if bHold:
+                self.held |= bit
+        else:
+            self.held &= ~bit
+
+        inputEvent = self._ring[self._ringIndex]
+        self._ringIndex = (self._ringIndex + 1) % self.RING_SIZE
+        inputEvent.action = action
+        inputEvent.source = source
+        inputEvent.bPressed = bPressed
+        inputEvent.rawValue = 1.0
+        return inputEvent
+
+    def _onKeyDown(self, event: pygame.event.Event) -> InputEvent | None:
+        self.lastInputSource = InputSource.KEYBOARD
+        action = self._keyBindings.actionMap().get(event.key)
+        return self._emit(action, InputSource.KEYBOARD, True) if action else None
+
+    def _onKeyUp(self, event: pygame.event.Event) -> InputEvent | None:
+        action = self._keyBindings.actionMap().get(event.key)
+        return self._emit(action, InputSource.KEYBOARD, False) if action else None
+
+    def _onButtonDown(self, event: pygame.event.Event) -> InputEvent | None:
+        if event.instance_id != self.activeJoystickId:
+            return None
+        self.lastInputSource = InputSource.JOYSTICK
+        action = self._buttonActions.get(event.button)
+        return self._emit(action, InputSource.JOYSTICK, True) if action else None
+
+    def _onButtonUp(self, event: pygame.event.Event) -> InputEvent | None:
+        if event.instance_id != self.activeJoystickId:
+            return None
+        action = self._buttonActions.get(event.button)
+        return self._emit(action, InputSource.JOYSTICK, False) if action else None
 
+    # Axis events come by the hundreds when a stick moves, most of them return before touching any dict
     def _processAxisEvent(self, event: pygame.event.Event) -> InputEvent | None:
-        joyId = event.instance_id
         axis = event.axis
+        if axis >= _NAV_AXES:
+            return None
+        joyId = event.instance_id
+        if joyId != self.activeJoystickId:
+            return None
         value = event.value
 
         if abs(value) < self.DEADZONE:
@@ -156,19 +226,21 @@ class InputManager:
 
         if axis == 0:
             if newState == -1:
-                return InputEvent(GameAction.MENU_LEFT, InputSource.JOYSTICK, True)
+                return self._emit(GameAction.MENU_LEFT, InputSource.JOYSTICK, True, bHold=False)
             elif newState == 1:
-                return InputEvent(GameAction.MENU_RIGHT, InputSource.JOYSTICK, True)
+                return self._emit(GameAction.MENU_RIGHT, InputSource.JOYSTICK, True, bHold=False)
         elif axis == 1:
             if newState == -1:
-                return InputEvent(GameAction.MENU_UP, InputSource.JOYSTICK, True)
+                return self._emit(GameAction.MENU_UP, InputSource.JOYSTICK, True, bHold=False)
             elif newState == 1:
-                return InputEvent(GameAction.MENU_DOWN, InputSource.JOYSTICK, True)
+                return self._emit(GameAction.MENU_DOWN, InputSource.JOYSTICK, True, bHold=False)
 
         return None
 
     def _processHatEvent(self, event: pygame.event.Event) -> InputEvent | None:
         joyId = event.instance_id
+        if joyId != self.activeJoystickId:
+            return None
         hat = event.hat
         x, y = event.value
 
@@ -181,13 +253,13 @@ class InputManager:
         self.lastInputSource = InputSource.JOYSTICK
 
         if y == 1 and oldState[1] != 1:
-            return InputEvent(GameAction.MENU_UP, InputSource.JOYSTICK, True)
+            return self._emit(GameAction.MENU_UP, InputSource.JOYSTICK, True, bHold=False)
         elif y == -1 and oldState[1] != -1:
-            return InputEvent(GameAction.MENU_DOWN, InputSource.JOYSTICK, True)
+            return self._emit(GameAction.MENU_DOWN, InputSource.JOYSTICK, True, bHold=False)
         elif x == -1 and oldState[0] != -1:
-            return InputEvent(GameAction.MENU_LEFT, InputSource.JOYSTICK, True)
+            return self._emit(GameAction.MENU_LEFT, InputSource.JOYSTICK, True, bHold=False)
         elif x == 1 and oldState[0] != 1:
-            return InputEvent(GameAction.MENU_RIGHT, InputSource.JOYSTICK, True)
+            return self._emit(GameAction.MENU_RIGHT, InputSource.JOYSTICK, True, bHold=False)
 
         return None
 
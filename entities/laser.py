@@ -5,6 +5,8 @@ import pygame
 from pygame import Surface
 from pygame.math import Vector2
 
+from quality import QualityGovernor
+
 
 # Our laser particle, it's just a small glowing dot that drifts away
 class LaserParticle:
@@ -43,6 +45,8 @@ class LaserBeam:
 
         self.particles: list[LaserParticle] = []
         self.impactParticles: list[LaserParticle] = []
+        # quality is picked when the beam is fired, it doesn't change during its 0.18 s
+        self.quality = QualityGovernor().tier
         self._spawnBeamParticles()
         if self.bHitSomething:
             self._spawnImpactParticles()
@@ -55,7 +59,7 @@ class LaserBeam:
         direction = direction.normalize()
         perp = Vector2(-direction.y, direction.x)
 
-        for _ in range(self.particleCount):
+        for _ in range(max(1, int(self.particleCount * self.quality.particleScale))):
             t = random.random()  # where on the beam (0 = start, 1 = end)
             basePos = self.start.lerp(self.end, t)
             offset = perp * random.uniform(-6, 6)
@@ -72,7 +76,7 @@ class LaserBeam:
 
     def _spawnImpactParticles(self) -> None:
         # Sparks that fly backward from where the laser hit, it's giving a impact feel
-        for _ in range(self.impactParticleCount):
+        for _ in range(max(1, int(self.impactParticleCount * self.quality.particleScale))):
             speed = random.uniform(60, 200)
             angle = random.uniform(math.pi * 0.3, math.pi * 1.7)
             vel = Vector2(math.cos(angle) * speed, math.sin(angle) * speed)
@@ -126,17 +130,18 @@ class LaserBeam:
 
         if self.bActive and t > 0.01:
             # Drawing the beam, there is 4 layers on top of each other
+            # lower tiers drop the outer glow layers first, the core is always there
             layerWidths = [22, 14, 9, 4]
-            for layer in range(4):
+            for layer in range(4 - self.quality.beamLayers, 4):
                 color = self._beamColor(t, layer)
                 points = self._buildSegmentPoints(layer)
                 if len(points) >= 2:
                     pygame.draw.lines(screen, color, False, points, layerWidths[layer])
 
-            if self.bHitSomething:
-                self._drawImpactFlash(screen, t)
-
-            self._drawMuzzleFlash(screen, t)
+            if self.quality.bBeamFlashes:
+                if self.bHitSomething:
+                    self._drawImpactFlash(screen, t)
+                self._drawMuzzleFlash(screen, t)
 
         self._drawParticles(screen, self.particles, t, bImpact=False)
         self._drawParticles(screen, self.impactParticles, t, bImpact=True)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Any
+
+from entities.obstacle.base import BaseObstacle
+from entities.obstacle.cage import FallingCage, CageState
+from entities.obstacle.scroll import ScrollLane
+
+
+# Shared look-ahead for the AI (chaser today, more chasers / bots later)
+# refresh() runs once per frame and snapshots the lanes by centerx (they are already in x order), then every agent
+# query is a bisect instead of each agent scanning the obstacles and cages again
+class LookAhead:
+    def __init__(self, obstacles: ScrollLane[Any], cages: ScrollLane[FallingCage]) -> None:
+        self.obstacles = obstacles
+        self.cages = cages
+
+        self._obstacleXs: list[int] = []
+        self._obstacleList: list[BaseObstacle] = []
+        # Only the cages you can jump on (falling or on the ground)
+        self._cageXs: list[int] = []
+        self._cageList: list[FallingCage] = []
+        self._cageMaxHalfW: int = 0
+
+    def refresh(self) -> None:
+        # The lane is already ordered by rect.left, only sprites of different widths can swap their centers
+        # so a single insertion pass puts it back in centerx order
+        obstacles = list(self.obstacles.ordered)
+        xs = [o.rect.centerx for o in obstacles]
+        for i in range(1, len(xs)):
+            x, obstacle = xs[i], obstacles[i]
+            j = i
+            while j > 0 and xs[j - 1] > x:
+                xs[j], obstacles[j] = xs[j - 1], obstacles[j - 1]
+                j -= 1
+            xs[j], obstacles[j] = x, obstacle
+        self._obstacleList = obstacles
+        self._obstacleXs = xs
+
+        # Only a few cages are falling / on the ground at once, sorting them is nothing
+        cages = sorted((c for c in self.cages.ordered if c.state in (CageState.FALLING, CageState.GROUNDED)),
+                       key=lambda c: c.rect.centerx)
+        self._cageList = cages
+        self._cageXs = [c.rect.centerx for c in cages]
+        self._cageMaxHalfW = max((c.rect.width // 2 + 1 for c in cages), default=0)
+
+    # First obstacle whose center is strictly between x and x + maxDist
+    def nextObstacle(self, x: int, maxDist: float) -> BaseObstacle | None:
+        i = bisect_right(self._obstacleXs, x)
+        if i < len(self._obstacleXs) and self._obstacleXs[i] < x + maxDist:
+            return self._obstacleList[i]
+        return None
+
+    def nextCage(self, x: int, maxDist: float) -> FallingCage | None:
+        i = bisect_right(self._cageXs, x)
+        if i < len(self._cageXs) and self._cageXs[i] < x + maxDist:
+            return self._cageList[i]
+        return None
+
+    # Cages whose rect spans x (strictly), closest center first
+    def cagesUnder(self, x: int) -> list[FallingCage]:
+        lo = bisect_left(self._cageXs, x - self._cageMaxHalfW)
+        hi = bisect_right(self._cageXs, x + self._cageMaxHalfW)
+        found = [c for c in self._cageList[lo:hi] if c.rect.left < x < c.rect.right]
+        found.sort(key=lambda c: abs(c.rect.centerx - x))
+        return found
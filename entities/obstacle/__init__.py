@@ -2,6 +2,14 @@ from .base import BaseObstacle
 from .lane import Obstacle
 from .cage import FallingCage, CageState
 from .ceiling import Ceiling
-from .geometric import GeometricObstacle
+from .scroll import ScrollLane
 
-__all__ = ['BaseObstacle', 'Obstacle', 'FallingCage', 'CageState', 'Ceiling', 'GeometricObstacle']
+__all__ = ['BaseObstacle', 'Obstacle', 'FallingCage', 'CageState', 'Ceiling', 'ScrollLane', 'GeometricObstacle']
+
+
+# Level 3 geometry is only imported when it's actually used
+def __getattr__(name: str) -> object:
+    if name == 'GeometricObstacle':
+        from .geometric import GeometricObstacle
+        return GeometricObstacle
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,14 +3,10 @@ from enum import Enum, auto
 import pygame
 from pygame import Surface, Rect
 
-import settings
-from paths import assetsPath
+import audio
 from settings import Color
 from .base import BaseObstacle
 
-cageFallSoundPath = assetsPath / "songs" / "metal3.ogg"
-_cageFallSound: pygame.mixer.Sound | None = None
-
 
 # The differents states of a cage
 class CageState(Enum):
@@ -179,14 +175,10 @@ class FallingCage(BaseObstacle):
             self.rect.y += int(self.fallVelocity * dt)
 
             if self.rect.bottom >= self.groundY:
-                global _cageFallSound
                 self.rect.bottom = self.groundY
                 self.state = CageState.GROUNDED
                 self.groundedTimer = self.groundedDuration
-                if _cageFallSound is None:
-                    _cageFallSound = pygame.mixer.Sound(cageFallSoundPath)
-                if settings.bSoundEnabled:
-                    _cageFallSound.play()
+                audio.play(audio.Sfx.CAGE_FALL)
 
         elif self.state == CageState.GROUNDED:
             self.groundedTimer -= dt
@@ -204,14 +196,19 @@ class FallingCage(BaseObstacle):
         if self.rect.right < -50:
             self.kill()
 
-    def draw(self, surface: Surface) -> None:
-        # Drawing the chain first then the cage on top, if it's warning we add the shake offset
+    # Chain first then the cage on top, if it's warning we add the shake offset
+    def blitItems(self) -> list[tuple[Surface, tuple[int, int]]]:
+        items: list[tuple[Surface, tuple[int, int]]] = []
         if self.chainImage.get_height() > 1:
-            surface.blit(self.chainImage, self.chainRect)
+            items.append((self.chainImage, self.chainRect.topleft))
 
         drawX = self.rect.x
         if self.state == CageState.WARNING:
             drawX += int(self.shakeOffset)
 
-        surface.blit(self.image, (drawX, self.rect.y))
+        items.append((self.image, (drawX, self.rect.y)))
+        return items
+
+    def draw(self, surface: Surface) -> None:
+        surface.fblits(self.blitItems())
 
@@ -33,7 +33,8 @@ class GeometricObstacle(BaseObstacle):
         y = posY if posY is not None else groundY
         self.rect = self.image.get_rect(centerx=x, bottom=y)
 
-    def _getSizeForShape(self, shape: str, scale: float) -> int:
+    @staticmethod
+    def _getSizeForShape(shape: str, scale: float) -> int:
         baseSizes = {"triangle": 60, "square": 70, "hexagon": 70}
         return max(1, int(baseSizes.get(shape, 50) * scale))
 
@@ -1,5 +1,7 @@
+import json
 import random
 from pathlib import Path
+from typing import Any
 
 import pygame
 from pygame import Surface, Rect
@@ -17,6 +19,42 @@ playerRunningFramesPath = assetsPath / "player" / "running" / "frames"
 
 _defaultDir: Path = assetsPath / "lanes"
 
+# Written by python -m tools.build_assets: the textures already cropped, packed in one png (+ their rects)
+atlasName: str = "atlas"
+
+
+# Took from a pygame forum, for a issue where the sprite couldn't be croped right
+# Also used by the asset pipeline to crop offline, keep it that way
+def contentRect(surface: Surface) -> Rect | None:
+    mask = pygame.mask.from_surface(surface, threshold=10)
+    rects: list[Rect] = mask.get_bounding_rects()  # type: ignore
+    if not rects:
+        return None
+
+    minArea = 100
+    significantRects = [r for r in rects if r.width * r.height >= minArea]
+
+    if not significantRects:
+        significantRects = rects
+
+    content = significantRects[0].copy()
+    for r in significantRects[1:]:
+        content.union_ip(r)
+
+    content.inflate_ip(4, 4)
+    content.clamp_ip(surface.get_rect())
+    return content
+
+
+def loadAtlasMeta(path: Path) -> dict[str, Any] | None:
+    try:
+        with open(path / f"{atlasName}.json") as f:
+            meta = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return meta if isinstance(meta, dict) else None
+
+
 class Obstacle(BaseObstacle):
     _textures: list[Surface] | None = None
     _cache: dict[tuple[int, int, int], Surface] = {}
@@ -33,11 +71,15 @@ class Obstacle(BaseObstacle):
             cls._playerHeight = getRunningHeight(cls.playerScale)
         return cls._playerHeight
 
-    def __init__(self, x: int, groundY: int, scale: float = 1.0) -> None:
+    # variant comes from the level timeline, any number works (it wraps around the textures)
+    def __init__(self, x: int, groundY: int, scale: float = 1.0, variant: int | None = None) -> None:
         super().__init__()
         self.scale = scale
         textures = self._loadTextures()
-        self.variant = random.randrange(len(textures)) if textures else -1
+        if not textures:
+            self.variant = -1
+        else:
+            self.variant = random.randrange(len(textures)) if variant is None else variant % len(textures)
         playerH = self._getPlayerHeight()
         h = max(1, int(playerH * self.heightRatio * scale))
         w = max(1, int(h * self.widthRatio))
@@ -61,8 +103,13 @@ class Obstacle(BaseObstacle):
         if cls._textures is not None:
             return cls._textures
 
-        paths = sorted(cls._obstacleDir.glob("*.png"))
-        loaded: list[Surface] = []
+        paths = [p for p in sorted(cls._obstacleDir.glob("*.png")) if p.stem != atlasName]
+        loaded = cls._loadAtlas([p.name for p in paths])
+        if loaded is not None:
+            cls._textures = loaded
+            return loaded
+
+        loaded = []
         for p in paths:
             try:
                 raw = pygame.image.load(str(p))
@@ -75,28 +122,31 @@ class Obstacle(BaseObstacle):
         cls._textures = loaded
         return loaded
 
-    # Took from a pygame forum, for a issue where the sprite couldn't be croped right
+    # One decode instead of one per texture (body_1 is 4096x4096 before the crop), only used when the atlas was
+    # built from exactly the pngs that are in the folder, otherwise we crop at load like before
+    @classmethod
+    def _loadAtlas(cls, names: list[str]) -> list[Surface] | None:
+        meta = loadAtlasMeta(cls._obstacleDir)
+        if meta is None:
+            return None
+        textures = meta.get("textures", [])
+        if [t.get("file") for t in textures] != names:
+            return None
+        try:
+            atlas = pygame.image.load(str(cls._obstacleDir / f"{atlasName}.png"))
+            if pygame.display.get_surface():
+                atlas = atlas.convert_alpha()
+            return [atlas.subsurface(Rect(t["rect"])) for t in textures]
+        except (pygame.error, ValueError, KeyError, FileNotFoundError):
+            return None
+
     @classmethod
     def _cropToContent(cls, surface: Surface) -> Surface:
-        mask = pygame.mask.from_surface(surface, threshold=10)
-        rects: list[Rect] = mask.get_bounding_rects()  # type: ignore
-        if not rects:
+        rect = contentRect(surface)
+        if rect is None:
             return surface
-
-        minArea = 100
-        significantRects = [r for r in rects if r.width * r.height >= minArea]
-
-        if not significantRects:
-            significantRects = rects
-
-        contentRect = significantRects[0].copy()
-        for r in significantRects[1:]:
-            contentRect.union_ip(r)
-
-        contentRect.inflate_ip(4, 4)
-        contentRect.clamp_ip(surface.get_rect())
-        cropped = pygame.Surface(contentRect.size, pygame.SRCALPHA)
-        cropped.blit(surface, (0, 0), contentRect)
+        cropped = pygame.Surface(rect.size, pygame.SRCALPHA)
+        cropped.blit(surface, (0, 0), rect)
         return cropped
 
     @classmethod
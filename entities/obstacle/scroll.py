@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from typing import Any, TypeVar
+
+from pygame.sprite import Group
+
+from .base import BaseObstacle
+
+T = TypeVar("T", bound=BaseObstacle)
+
+
+def _left(sprite: BaseObstacle) -> int:
+    return sprite.rect.left
+
+
+# Obstacles and cages all spawn on the right and scroll left at (almost) the same speed, so on top of the Group we
+# keep them ordered by rect.left: the ones going off screen are always at the front (O(1) removal) and the queries
+# below only look at the few sprites in the x range they ask for instead of the whole group
+# Still a Group, so draw / update / kill / empty work like before
+class ScrollLane(Group[T]):
+    def __init__(self) -> None:
+        super().__init__()
+        self._order: deque[T] = deque()
+        self._maxWidth: int = 0
+
+    def add_internal(self, sprite: T, layer: Any = None) -> None:
+        super().add_internal(sprite, layer)
+        self._maxWidth = max(self._maxWidth, sprite.rect.width)
+        if not self._order or self._order[-1].rect.left <= sprite.rect.left:
+            self._order.append(sprite)
+        else:
+            self._order.insert(bisect_left(self._order, sprite.rect.left, key=_left), sprite)
+
+    def remove_internal(self, sprite: T) -> None:
+        super().remove_internal(sprite)
+        if self._order and self._order[0] is sprite:
+            self._order.popleft()
+        else:
+            self._order.remove(sprite)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self.sort()
+
+    # Speeds can differ a bit (speed growth, trapped cages...) so after moving them we fix the order
+    # Insertion sort since it's already sorted (or almost), that's a single pass most of the time
+    def sort(self) -> None:
+        order = self._order
+        # rects can change size (rotation, cage states), keep the widest one for inRange
+        self._maxWidth = max((sprite.rect.width for sprite in order), default=0)
+        for i in range(1, len(order)):
+            sprite = order[i]
+            j = i
+            while j > 0 and order[j - 1].rect.left > sprite.rect.left:
+                order[j] = order[j - 1]
+                j -= 1
+            order[j] = sprite
+
+    # Every sprite, ordered by rect.left (don't mutate it)
+    @property
+    def ordered(self) -> deque[T]:
+        return self._order
+
+    # Sprites overlapping [x0, x1), ordered from left to right
+    def inRange(self, x0: int, x1: int) -> list[T]:
+        order = self._order
+        found: list[T] = []
+        for i in range(bisect_left(order, x0 - self._maxWidth, key=_left), len(order)):
+            sprite = order[i]
+            if sprite.rect.left >= x1:
+                break
+            if sprite.rect.right > x0:
+                found.append(sprite)
+        return found
+
+    # Sprites that are fully on the left of x
+    def behind(self, x: int) -> list[T]:
+        found: list[T] = []
+        for sprite in self._order:
+            if sprite.rect.left >= x:
+                break
+            if sprite.rect.right < x:
+                found.append(sprite)
+        return found
@@ -8,27 +8,28 @@ from pygame.math import Vector2
 if TYPE_CHECKING:
     from entities.input.manager import InputEvent
 
-import settings
-from entities.animation import AnimatedSprite, AnimationFrame, loadFrames
-from keybindings import keyBindings
+import audio
+from latency import LatencyTracker
+from entities.animation import AnimatedSprite, AnimationFrame, loadFrames, loadFramesMeta
 from paths import assetsPath
 
 # Assets path for frames (running / sliding / trapped)
 runningFramesPath = assetsPath / "player" / "running" / "frames"
 slidingFramesPath = assetsPath / "player" / "sliding" / "frames"
 trappedFramesPath = assetsPath / "player" / "trapped"
-jumpSoundPath = assetsPath / "songs" / "jump.ogg"
-_jumpSound: pygame.mixer.Sound | None = None
-slideSoundPath = assetsPath / "songs" / "cartoon-slide.ogg"
-_slideSound: pygame.mixer.Sound | None = None
 
 _cachedRunningHeight: int | None = None
 
 def getRunningHeight(scale: float = 0.15) -> int:
     global _cachedRunningHeight
     if _cachedRunningHeight is None:
-        frames = loadFrames(runningFramesPath, scale=scale, frameSlice=slice(116, 117))
-        _cachedRunningHeight = frames[0].surface.get_height()
+        # The build metadata has the size, no need to decode a 720x1280 gif just for that
+        meta = loadFramesMeta(runningFramesPath)
+        if meta is not None and len(meta) > 116:
+            _cachedRunningHeight = int(meta[116]["size"][1] * scale)
+        else:
+            frames = loadFrames(runningFramesPath, scale=scale, frameSlice=slice(116, 117))
+            _cachedRunningHeight = frames[0].surface.get_height()
     return _cachedRunningHeight
 
 class PlayerState(Enum):
@@ -83,6 +84,8 @@ class Player(AnimatedSprite):
         self.jumpBufferTime: float = jumpBuffer
         self.coyoteTimer: float = 0.0
         self.jumpBufferTimer: float = 0.0
+        # timestamp of the input behind the buffered jump, for the latency stats
+        self.jumpBufferInputMs: float = 0.0
         self.bLaserEnabled: bool = bLaserEnabled
         self.laserCooldown: float = laserCooldown
         self.laserCooldownTimer: float = 0.0
@@ -101,37 +104,25 @@ class Player(AnimatedSprite):
     def handleInput(self, event: pygame.event.Event, inputEvent: "InputEvent | None" = None) -> None:
         from entities.input.manager import GameAction, InputEvent
 
-        bJumpPressed = False
-        bSlidePressed = False
-
-        if inputEvent:
-            if inputEvent.action == GameAction.JUMP and inputEvent.bPressed:
-                bJumpPressed = True
-            elif inputEvent.action == GameAction.SLIDE and inputEvent.bPressed:
-                bSlidePressed = True
-
-        if event.type == pygame.KEYDOWN:
-            if event.key == keyBindings.jump:
-                bJumpPressed = True
-            elif event.key == keyBindings.slide:
-                bSlidePressed = True
+        if inputEvent is None or not inputEvent.bPressed:
+            return
 
-        if bJumpPressed:
-            if not self._jump():
+        inputMs = inputEvent.timestamp
+        if inputEvent.action == GameAction.JUMP:
+            if self._jump():
+                LatencyTracker().actionDone("jump", inputMs)
+            else:
                 self.jumpBufferTimer = self.jumpBufferTime
-        if bSlidePressed:
-            self._slide()
+                self.jumpBufferInputMs = inputMs
+        elif inputEvent.action == GameAction.SLIDE and self._slide():
+            LatencyTracker().actionDone("slide", inputMs)
 
     def _jump(self) -> bool:
-        global _jumpSound
         if self.state == PlayerState.SLIDING:
             return False
         bCoyote = not self.bOnGround and self.coyoteTimer > 0
         if self.bOnGround or bCoyote:
-            if _jumpSound is None:
-                _jumpSound = pygame.mixer.Sound(jumpSoundPath)
-            if settings.bSoundEnabled:
-                _jumpSound.play()
+            audio.play(audio.Sfx.JUMP)
             self.velocity.y = self.jumpForce
             self.state = PlayerState.JUMPING
             self.bOnGround = False
@@ -141,10 +132,7 @@ class Player(AnimatedSprite):
             self.rect = self.image.get_rect(midbottom=self.rect.midbottom)
             return True
         elif self.bDoubleJumpEnabled and self.bDoubleJumpAvailable:
-            if _jumpSound is None:
-                _jumpSound = pygame.mixer.Sound(jumpSoundPath)
-            if settings.bSoundEnabled:
-                _jumpSound.play()
+            audio.play(audio.Sfx.JUMP)
             self.velocity.y = self.doubleJumpForce
             self.bDoubleJumpAvailable = False
             self.image = self._getFrame()
@@ -152,15 +140,11 @@ class Player(AnimatedSprite):
             return True
         return False
 
-    def _slide(self) -> None:
-        global _slideSound
+    def _slide(self) -> bool:
         if not self.bSlideEnabled:
-            return
+            return False
         if self.bOnGround and self.state == PlayerState.RUNNING and self.slideCooldownTimer <= 0:
-            if _slideSound is None:
-                _slideSound = pygame.mixer.Sound(slideSoundPath)
-            if settings.bSoundEnabled:
-                _slideSound.play()
+            audio.play(audio.Sfx.SLIDE)
             self.state = PlayerState.SLIDING
             self.slideTimer = self.slideDuration
             self.slideBoostTimer = self.slideDuration
@@ -169,6 +153,8 @@ class Player(AnimatedSprite):
             self._setFrames(self.slidingFrames)
             self.image = self._getFrame()
             self.rect = self.image.get_rect(centerx=oldCenterx, bottom=self.groundY + self.slideYOffset)
+            return True
+        return False
 
     def canShoot(self) -> bool:
         return self.bLaserEnabled and self.laserCooldownTimer <= 0
@@ -249,7 +235,8 @@ class Player(AnimatedSprite):
         if self.jumpBufferTimer > 0:
             self.jumpBufferTimer -= dt
             if self.bOnGround:
-                self._jump()
+                if self._jump():
+                    LatencyTracker().actionDone("jump", self.jumpBufferInputMs)
                 self.jumpBufferTimer = 0.0
 
         if self.slideBoostTimer > 0:
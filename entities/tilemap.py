@@ -2,6 +2,7 @@ from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Final
+import json
 import random
 
 import pygame
@@ -9,6 +10,53 @@ from pygame import Surface
 
 tileSize: Final[int] = 64
 
+# Written by tools/extract_tiles: every unique tile once (one row per stored height) + the tile of every column
+tileAtlasName: Final[str] = "atlas"
+
+
+# Everything lives in one surface (one decode, one convert) and columns with the same pixels share a subsurface
+@dataclass(slots=True)
+class TileAtlas:
+    surface: Surface
+    tileWidth: int
+    count: int
+    # height -> y of its row, the first one is the native height
+    rows: dict[int, int]
+    columns: list[int]
+
+    @property
+    def nativeHeight(self) -> int:
+        return next(iter(self.rows))
+
+    def row(self, height: int) -> dict[int, Surface] | None:
+        y = self.rows.get(height)
+        return self._split(self.surface, y, height) if y is not None else None
+
+    # Any other height: the whole native row is scaled in one call (transform.scale works per pixel, same result as
+    # scaling every tile) and the tiles stay next to each other in one surface
+    def scaledRow(self, height: int) -> dict[int, Surface]:
+        row = self.row(height)
+        if row is not None:
+            return row
+        native = self.nativeHeight
+        strip = self.surface.subsurface((0, self.rows[native], self.tileWidth * self.count, native))
+        return self._split(pygame.transform.scale(strip, (strip.get_width(), height)), 0, height)
+
+    def _split(self, surface: Surface, y: int, height: int) -> dict[int, Surface]:
+        unique = [surface.subsurface((i * self.tileWidth, y, self.tileWidth, height)) for i in range(self.count)]
+        return {column: unique[u] for column, u in enumerate(self.columns)}
+
+
+def loadTileAtlas(path: Path) -> TileAtlas | None:
+    try:
+        with open(path / f"{tileAtlasName}.json") as f:
+            index = json.load(f)
+        surface = pygame.image.load(str(path / f"{tileAtlasName}.png")).convert()
+        rows = {int(h): int(y) for h, y in index["rows"].items()}
+        return TileAtlas(surface, index["tileWidth"], index["count"], rows, list(index["columns"]))
+    except (OSError, json.JSONDecodeError, pygame.error, KeyError, ValueError):
+        return None
+
 
 # Slots is used severals time in the code, from what i saw on the docs it allow us to optimize memory by pre allocating memory for each field (con is we can't add fields in runtime) > Needs to see if i'm letting this?
 @dataclass(slots=True)
@@ -27,6 +75,12 @@ class TileSet:
             self._createFallbackTiles()
 
     def _loadTiles(self, path: Path) -> None:
+        atlas = loadTileAtlas(path)
+        if atlas is not None:
+            native = atlas.scaledRow(atlas.nativeHeight)
+            self.tiles = {i: Tile(id=i, surface=surf, solid=True) for i, surf in native.items()}
+            return
+
         pngs = sorted(path.glob("*.png"))
         for i, p in enumerate(pngs):
             try:
@@ -157,12 +211,19 @@ class DecorLayer:
 class CeilingTileSet:
     def __init__(self, path: Path) -> None:
         self.tiles: dict[int, Tile] = {}
+        self.atlas: TileAtlas | None = None
         if path.exists() and path.is_dir():
             self._loadTiles(path)
         if not self.tiles:
             self._createFallbackTiles()
 
     def _loadTiles(self, path: Path) -> None:
+        self.atlas = loadTileAtlas(path)
+        if self.atlas is not None:
+            native = self.atlas.scaledRow(self.atlas.nativeHeight)
+            self.tiles = {i: Tile(id=i, surface=surf, solid=True) for i, surf in native.items()}
+            return
+
         pngs = sorted(path.glob("*.png"))
         for i, p in enumerate(pngs):
             try:
@@ -203,14 +264,11 @@ class CeilingTileSet:
 @dataclass(slots=True)
 class CeilingTileData:
     tileId: int
-    bHasCage: bool = False
-    bCageSpawned: bool = False
 
 
+# The cages used to be rolled here on every new tile, they come from the level timeline now (timeline.py)
 class CeilingTilemap:
     bufferColumns: int = 3
-    cageChance: float = 0.06
-    minTilesBetweenCages: int = 10
 
     def __init__(self, tileset: CeilingTileSet, screenW: int, ceilingH: int = 60) -> None:
         self.tileset = tileset
@@ -219,7 +277,6 @@ class CeilingTilemap:
         self.scrollOffset: float = 0.0
         self.pattern: deque[CeilingTileData] = deque()
         self.stripCache: dict[int, Surface] = {}
-        self._tilesSinceCage: int = self.minTilesBetweenCages
         self._setup()
 
     def _setup(self) -> None:
@@ -237,6 +294,10 @@ class CeilingTilemap:
 
     def _buildStripCache(self) -> None:
         self.stripCache.clear()
+        if self.tileset.atlas is not None:
+            self.stripCache.update(self.tileset.atlas.scaledRow(self.ceilingH))
+            return
+
         bDisplayReady = pygame.display.get_surface() is not None
         for tileId, tile in self.tileset.tiles.items():
             orig = tile.surface
@@ -246,44 +307,19 @@ class CeilingTilemap:
             else:
                 self.stripCache[tileId] = orig
 
-    def _maybeAddCage(self, tileData: CeilingTileData) -> None:
-        if self._tilesSinceCage >= self.minTilesBetweenCages:
-            if random.random() < self.cageChance:
-                tileData.bHasCage = True
-                self._tilesSinceCage = 0
-                return
-        self._tilesSinceCage += 1
-
     def _appendNewTile(self) -> None:
         if self.tileset.tiles:
             tileIds = list(self.tileset.tiles.keys())
-            newTile = CeilingTileData(tileId=random.choice(tileIds))
-            self._maybeAddCage(newTile)
-            self.pattern.append(newTile)
+            self.pattern.append(CeilingTileData(tileId=random.choice(tileIds)))
 
-    def update(self, scrollDelta: float) -> list[int]:
+    def update(self, scrollDelta: float) -> None:
         self.scrollOffset += scrollDelta
-        cageSpawnXs: list[int] = []
 
         while self.scrollOffset >= tileSize:
             self.scrollOffset -= tileSize
             self.pattern.popleft()
             self._appendNewTile()
 
-        spawnThreshold = self.screenW + tileSize
-        x = -int(self.scrollOffset)
-        for tileData in self.pattern:
-            if x > spawnThreshold:
-                break
-            if tileData.bHasCage and not tileData.bCageSpawned:
-                if x + tileSize > self.screenW:
-                    cageX = x + tileSize // 2
-                    cageSpawnXs.append(cageX)
-                    tileData.bCageSpawned = True
-            x += tileSize
-
-        return cageSpawnXs
-
     def draw(self, screen: Surface) -> None:
         x = -int(self.scrollOffset)
         for tileData in self.pattern:
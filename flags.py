@@ -5,12 +5,15 @@ import sys
 
 bDisableChaser: bool = False
 bUnlockAllLevels: bool = False
+bProfile: bool = False
+bStartupReport: bool = False
+bLowLatency: bool = False
 
 _BROWSER: bool = sys.platform == "emscripten"
 
 
 def parse(args: list[str] | None = None) -> None:
-    global bDisableChaser, bUnlockAllLevels
+    global bDisableChaser, bUnlockAllLevels, bProfile, bStartupReport, bLowLatency
 
     if _BROWSER:
         bDisableChaser = False
@@ -21,6 +24,12 @@ def parse(args: list[str] | None = None) -> None:
     parser = ArgumentParser()
     parser.add_argument("--disableChaser", action="store_true")
     parser.add_argument("--unlockAllLevels", action="store_true")
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--startupReport", action="store_true")
+    parser.add_argument("--lowLatency", action="store_true")
     parsed = parser.parse_args(args)
     bDisableChaser = parsed.disableChaser
     bUnlockAllLevels = parsed.unlockAllLevels
+    bProfile = parsed.profile
+    bStartupReport = parsed.startupReport
+    bLowLatency = parsed.lowLatency
@@ -1,31 +1,49 @@
 import asyncio
+from typing import Callable, TYPE_CHECKING
+
 import pygame
 from pygame import Surface
 from pygame.event import Event
-from pygame.time import Clock
 
 from settings import (
-    width, height, minWidth, minHeight, fps, title,
-    GameState, displayFlags, ScreenSize
+    width, height, minWidth, minHeight, title, resizeDebounceMs,
+    GameState, FrameCap, displayFlags, ScreenSize
 )
-from screens import MainMenu, GameScreen, OptionsScreen, LevelSelectScreen, ScreenTransition, SlideDir, FadeTransition
+from screens import MainMenu, ScreenTransition, SlideDir, FadeTransition
 from discord import DiscordRPC
-from levels import level1Config, levelConfigs
+from levels import LevelConfig, level1Config, levelConfigs
 from paths import assetsPath
+from screens.ui.fonts import textCacheInfo
+from screens.ui.surfaces import uiCacheInfo
+from profiler import FrameProfiler
+from latency import LatencyTracker
+from pacing import FramePacer, simStepS
+from quality import QualityGovernor
+import audio
 import config
+import startup
+import flags
 import settings
 
+if TYPE_CHECKING:
+    from screens import GameScreen, LevelSelectScreen, OptionsScreen
+
 
 class Game:
     def __init__(self) -> None:
+        audio.preInit()
         pygame.init()
         config.load()
+        audio.applyMute()
         pygame.display.set_mode((width, height), 0)
-        self.screen: Surface = pygame.display.set_mode((width, height), displayFlags)
+        self.pacer: FramePacer = FramePacer()
+        self._frameCap: FrameCap = settings.frameCap
+        self.screen: Surface = self._setMode((width, height), displayFlags)
         pygame.display.set_caption(title)
         iconPath = assetsPath / "logo" / "logo_32.ico"
         pygame.display.set_icon(pygame.image.load(iconPath))
-        self.clock: Clock = pygame.time.Clock()
+        self.latency: LatencyTracker = LatencyTracker()
+        self.quality: QualityGovernor = QualityGovernor()
 
         self.screenSize: ScreenSize = (width, height)
         self.bFullscreen: bool = False
@@ -34,17 +52,25 @@ class Game:
         self.state: GameState = GameState.MENU
         self.currentLevel: int = 1
 
+        # Only the menu is built up front, the other screens are created the first time they're needed
+        # (or by the warmup steps once the menu is on screen), startLevel creates the game screen
         self.menu: MainMenu = MainMenu(self.setState)
-        self.levelSelect: LevelSelectScreen = LevelSelectScreen(
-            self.screenSize, self.setState, self.startLevel
-        )
-        self.gameScreen: GameScreen = GameScreen(self.setState, level1Config)
-        self.optionsScreen: OptionsScreen = OptionsScreen((width, height), self.setState)
+        self._levelSelect: "LevelSelectScreen | None" = None
+        self._gameScreen: "GameScreen | None" = None
+        self._optionsScreen: "OptionsScreen | None" = None
 
         self.transition: ScreenTransition = ScreenTransition(self.screenSize)
         self.fadeTransition: FadeTransition = FadeTransition(self.screenSize)
         self._pendingState: GameState | None = None
-        self._snapSurf: Surface = Surface(self.screenSize)
+
+        # Resizes are debounced, while the user drags the window edge we only scale the last frame
+        # Hidden screens are resized the next time they're shown (see _syncSize)
+        self._pendingSize: ScreenSize | None = None
+        self._resizeTick: int = 0
+        self._resizeFrame: Surface | None = None
+        self._sizedFor: dict[GameState, ScreenSize] = {
+            state: self.screenSize for state in (GameState.MENU, GameState.LEVEL_SELECT, GameState.GAME, GameState.OPTIONS)
+        }
 
         self.discordRpc: DiscordRPC = DiscordRPC()
         self.rpcUpdateTimer: float = 0.0
@@ -53,13 +79,58 @@ class Game:
         from entities.input.manager import InputManager
         self.inputManager: InputManager = InputManager()
 
+        self.profiler: FrameProfiler = FrameProfiler()
+        self.profiler.bVisible = flags.bProfile
+
+        # One step per frame after the first frame, so the first navigations don't have to build anything
+        self._warmupSteps: list[Callable[[], object]] = [
+            self.transition.prepare,
+            lambda: self.levelSelect,
+            lambda: self.optionsScreen,
+        ]
+
+    @property
+    def levelSelect(self) -> "LevelSelectScreen":
+        if self._levelSelect is None:
+            from screens import LevelSelectScreen
+            self._levelSelect = LevelSelectScreen(self.screenSize, self.setState, self.startLevel)
+            self._sizedFor[GameState.LEVEL_SELECT] = self.screenSize
+        return self._levelSelect
+
+    # Normally set by startLevel, level 1 is only built here if something needs a game screen before that
+    @property
+    def gameScreen(self) -> "GameScreen":
+        if self._gameScreen is None:
+            self._gameScreen = self._createGameScreen(level1Config)
+        return self._gameScreen
+
+    @property
+    def optionsScreen(self) -> "OptionsScreen":
+        if self._optionsScreen is None:
+            from screens.options import OptionsScreen
+            self._optionsScreen = OptionsScreen(self.screenSize, self.setState)
+            self._sizedFor[GameState.OPTIONS] = self.screenSize
+        return self._optionsScreen
+
     def startLevel(self, levelId: int) -> None:
         self.currentLevel = levelId
         cfg = levelConfigs.get(levelId, level1Config)
-        self.gameScreen = GameScreen(self.setState, cfg)
-        self.gameScreen.onResize(self.screenSize)
+        self._gameScreen = self._createGameScreen(cfg)
         self.setState(GameState.GAME)
 
+    def _createGameScreen(self, cfg: LevelConfig) -> "GameScreen":
+        from screens import GameScreen
+        gameScreen = GameScreen(self.setState, cfg)
+        gameScreen.onResize(self.screenSize)
+        self._sizedFor[GameState.GAME] = self.screenSize
+        return gameScreen
+
+    def _warmupStep(self) -> None:
+        if not self._warmupSteps or self.transition.bActive or self.fadeTransition.bActive:
+            return
+        with self.profiler.section("warmup"):
+            self._warmupSteps.pop(0)()
+
     def _transitionPair(self, fromState: GameState, toState: GameState) -> tuple[SlideDir, bool, bool]:
         if fromState == GameState.MENU and toState == GameState.OPTIONS:
             return SlideDir.LEFT, True, False
@@ -73,7 +144,29 @@ class Game:
             return SlideDir.LEFT, False, True
         return SlideDir.LEFT, False, False
 
+    def _screenFor(self, state: GameState) -> "MainMenu | LevelSelectScreen | GameScreen | OptionsScreen | None":
+        if state == GameState.MENU:
+            return self.menu
+        if state == GameState.LEVEL_SELECT:
+            return self.levelSelect
+        if state == GameState.GAME:
+            return self.gameScreen
+        if state == GameState.OPTIONS:
+            return self.optionsScreen
+        return None
+
+    def _syncSize(self, state: GameState) -> None:
+        if self._sizedFor.get(state) == self.screenSize:
+            return
+        screen = self._screenFor(state)
+        if screen is None:
+            return
+        with self.profiler.section("resize"):
+            screen.onResize(self.screenSize)
+        self._sizedFor[state] = self.screenSize
+
     def _renderStateToSurf(self, state: GameState, surf: Surface) -> None:
+        self._syncSize(state)
         if state == GameState.MENU:
             self.menu.draw(surf)
         elif state == GameState.OPTIONS:
@@ -88,6 +181,7 @@ class Game:
             return
 
         direction, bSlide, bFade = self._transitionPair(self.state, newState)
+        self._syncSize(newState)
 
         if newState == GameState.OPTIONS:
             self.optionsScreen.refreshBackground()
@@ -99,16 +193,8 @@ class Game:
 
         if bSlide:
             self._pendingState = newState
-
-            fromSurf = self._snapSurf
-            fromSurf.fill((0, 0, 0))
-            self._renderStateToSurf(self.state, fromSurf)
-
-            toSurf = Surface(self.screenSize)
-            toSurf.fill((0, 0, 0))
-            self._renderStateToSurf(newState, toSurf)
-
-            self.transition.start(fromSurf, toSurf, direction)
+            # self.screen still holds the last frame of the current state, no need to render it again
+            self.transition.start(self.screen, lambda surf: self._renderStateToSurf(newState, surf), direction)
             return
 
         if newState == GameState.GAME and self.state != GameState.GAME:
@@ -117,6 +203,29 @@ class Game:
         if self.state == GameState.QUIT:
             self.bRunning = False
 
+    # vsync goes through the renderer, if the driver refuses it the limiter in FramePacer still caps the frames
+    def _setMode(self, size: ScreenSize, flags: int) -> Surface:
+        if settings.frameCap == FrameCap.VSYNC:
+            try:
+                screen = pygame.display.set_mode(size, flags, vsync=1)
+                self.pacer.bVsync = True
+                return screen
+            except pygame.error:
+                pass
+        self.pacer.bVsync = False
+        return pygame.display.set_mode(size, flags)
+
+    # The options only change settings.frameCap, vsync needs the window to be recreated
+    def _applyFrameCap(self) -> None:
+        bVsyncChanged = (self._frameCap == FrameCap.VSYNC) != (settings.frameCap == FrameCap.VSYNC)
+        self._frameCap = settings.frameCap
+        if not bVsyncChanged:
+            return
+        if self.bFullscreen:
+            self.screen = self._setMode((0, 0), pygame.FULLSCREEN)
+        else:
+            self.screen = self._setMode(self.screen.get_size(), displayFlags)
+
     def _toggleFullscreen(self) -> None:
         result: int = pygame.display.toggle_fullscreen()
 
@@ -132,36 +241,49 @@ class Game:
             self.bFullscreen = not self.bFullscreen
             if self.bFullscreen:
                 self.windowedSize = self.screenSize
-                self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+                self.screen = self._setMode((0, 0), pygame.FULLSCREEN)
                 info = pygame.display.Info()
                 self.screenSize = (info.current_w, info.current_h)
             else:
                 self.screenSize = self.windowedSize
-                self.screen = pygame.display.set_mode(self.screenSize, displayFlags)
+                self.screen = self._setMode(self.screenSize, displayFlags)
+
+        self._pendingSize = None
+        self._resizeFrame = None
+        self._applySize()
 
-        self.menu.onResize(self.screenSize)
-        self.levelSelect.onResize(self.screenSize)
-        self.gameScreen.onResize(self.screenSize)
-        self.optionsScreen.onResize(self.screenSize)
+    # Only the visible screen is rebuilt here, the others follow lazily through _syncSize
+    def _applySize(self) -> None:
         self.transition.onResize(self.screenSize)
         self.fadeTransition.onResize(self.screenSize)
-        self._snapSurf = Surface(self.screenSize)
+        self._syncSize(self.state)
 
     def _handleResize(self, event: Event) -> None:
         w: int = max(event.w, minWidth)
         h: int = max(event.h, minHeight)
-        self.screenSize = (w, h)
-        self.screen = pygame.display.set_mode(self.screenSize, displayFlags)
-        self.menu.onResize(self.screenSize)
-        self.levelSelect.onResize(self.screenSize)
-        self.gameScreen.onResize(self.screenSize)
-        self.optionsScreen.onResize(self.screenSize)
-        self.transition.onResize(self.screenSize)
-        self.fadeTransition.onResize(self.screenSize)
-        self._snapSurf = Surface(self.screenSize)
+        if self._resizeFrame is None:
+            self._resizeFrame = self.screen.copy()
+        self._pendingSize = (w, h)
+        self._resizeTick = pygame.time.get_ticks()
+
+    def _updateResize(self) -> None:
+        if self._pendingSize is None:
+            return
+        if self._pendingSize != self.screen.get_size():
+            self.screen = self._setMode(self._pendingSize, displayFlags)
+        if pygame.time.get_ticks() - self._resizeTick < resizeDebounceMs:
+            return
+        self.screenSize = self._pendingSize
+        self._pendingSize = None
+        self._resizeFrame = None
+        self._applySize()
 
     def handleEvents(self) -> None:
-        for event in pygame.event.get():
+        self.inputManager.beginPoll()
+        events = pygame.event.get()
+        if events:
+            self.pacer.noteInput()
+        for event in events:
             if event.type == pygame.JOYDEVICEADDED:
                 self.inputManager.handleJoyDeviceAdded(event)
                 continue
@@ -180,10 +302,12 @@ class Game:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_F11:
                     self._toggleFullscreen()
+                elif event.key == pygame.K_F3:
+                    self.profiler.toggle()
                 elif event.key == pygame.K_ESCAPE and self.bFullscreen:
                     self._toggleFullscreen()
 
-            if self.transition.bActive or self.fadeTransition.bActive:
+            if self.transition.bActive or self.fadeTransition.bActive or self._pendingSize is not None:
                 continue
 
             if self.state == GameState.MENU:
@@ -205,6 +329,10 @@ class Game:
                     self.setState(GameState.MENU)
 
     def update(self, dt: float) -> None:
+        self._updateResize()
+        if self._pendingSize is not None:
+            return
+
         if self.transition.bActive:
             bDone = self.transition.update(dt)
             if bDone and self._pendingState is not None:
@@ -234,17 +362,40 @@ class Game:
         elif self.state == GameState.LEVEL_SELECT:
             self.levelSelect.update(dt)
         elif self.state == GameState.GAME:
-            self.gameScreen.update(dt)
+            # Fixed step for the world, only the drawing follows the frame cap (the HUD still animates on dt)
+            for _ in range(self.pacer.simSteps(dt)):
+                self.gameScreen.update(simStepS)
+            self.gameScreen.dt = dt
             if self.gameScreen.bLevelComplete and not settings.bIsLevelCompleted(self.currentLevel):
                 settings.completeLevel(self.currentLevel)
                 config.save()
         elif self.state == GameState.OPTIONS:
             self.optionsScreen.update(dt)
 
+    def _reportCaches(self) -> None:
+        fonts, texts, textBytes = textCacheInfo()
+        shapes, shapeBytes = uiCacheInfo()
+        self.profiler.setInfo("text cache", f"{fonts} fonts, {texts} texts, {textBytes / 1024:.0f} KB")
+        self.profiler.setInfo("ui cache", f"{shapes} surfaces, {shapeBytes / 1024:.0f} KB")
+        sfx = audio.stats
+        self.profiler.setInfo("audio", f"{sfx.plays} plays, {sfx.dropped} dropped, {sfx.stolen} stolen, "
+                                       f"buffer {sfx.bufferLatencyMs:.1f} ms")
+        self.profiler.setInfo("discord", self.discordRpc.statsText())
+        self.profiler.setInfo("pacing", self.pacer.statsText())
+        self.profiler.setInfo("quality", self.quality.statsText())
+        for kind in self.latency.kinds():
+            self.profiler.setInfo(f"latency {kind}", self.latency.summary(kind))
+
     def draw(self) -> None:
+        if self._resizeFrame is not None:
+            pygame.transform.scale(self._resizeFrame, self.screen.get_size(), self.screen)
+            self.profiler.draw(self.screen)
+            return
+
+        self._syncSize(self.state)
         if self.transition.bActive:
             self.transition.draw(self.screen)
-            pygame.display.flip()
+            self.profiler.draw(self.screen)
             return
 
         if self.state == GameState.MENU:
@@ -259,34 +410,58 @@ class Game:
         if self.fadeTransition.bActive:
             self.fadeTransition.draw(self.screen)
 
-        pygame.display.flip()
+        if self.profiler.bVisible:
+            self._reportCaches()
+        self.profiler.draw(self.screen)
 
-    # Used for updating the action on discord
-    async def _updateDiscordRpc(self, dt: float) -> None:
+    # Used for updating the action on discord, only fills the mailbox, the Discord task does the IPC
+    def _updateDiscordRpc(self, dt: float) -> None:
         self.rpcUpdateTimer += dt
         if self.rpcUpdateTimer < self.rpcUpdateInterval:
             return
         self.rpcUpdateTimer = 0.0
 
         if self.state in (GameState.MENU, GameState.OPTIONS, GameState.LEVEL_SELECT):
-            await self.discordRpc.updateMenu()
+            self.discordRpc.updateMenu()
         elif self.state == GameState.GAME:
             if self.gameScreen.bGameOver:
-                await self.discordRpc.updateGameOver(self.gameScreen.score)
+                self.discordRpc.updateGameOver(self.gameScreen.score)
             else:
-                await self.discordRpc.updatePlaying(self.gameScreen.score)
+                self.discordRpc.updatePlaying(self.gameScreen.score)
 
     async def run(self) -> None:
-        await self.discordRpc.connect()
+        bFirstFrame = True
         try:
             while self.bRunning:
-                dt: float = self.clock.tick(fps) / 1000.0
-                self.handleEvents()
-                self.update(dt)
-                await self._updateDiscordRpc(dt)
-                self.draw()
+                if settings.frameCap != self._frameCap:
+                    self._applyFrameCap()
+                dt = await self.pacer.wait(self.pacer.targetFor(self.state == GameState.GAME))
+                self.profiler.beginFrame()
+                with self.profiler.section("events"):
+                    self.handleEvents()
+                with self.profiler.section("update"):
+                    self.update(dt)
+                self._updateDiscordRpc(dt)
+                with self.profiler.section("draw"):
+                    self.draw()
+                self.pacer.flipping()
+                pygame.display.flip()
+                self.latency.presented()
+                self.pacer.presented()
+                self.quality.observe(self.pacer.lastWorkS * 1000.0, self.pacer.budgetS * 1000.0)
+                self.profiler.endFrame()
+
+                # Discord (and pypresence) is only loaded once the first frame is on screen
+                if bFirstFrame:
+                    bFirstFrame = False
+                    startup.markFirstFrame()
+                    self.profiler.setInfo("first frame", f"{startup.firstFrameMs:.0f} ms")
+                    self.discordRpc.start()
+                else:
+                    self._warmupStep()
                 await asyncio.sleep(0)
         finally:
             config.save()
+            config.flush()
             await self.discordRpc.close()
             pygame.quit()
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import Any, TYPE_CHECKING
 
 import pygame
 from pygame import Surface
@@ -18,12 +18,21 @@ class KeyBindings:
         return cls._instance
 
     def _init(self) -> None:
+        # key -> action, compiled from the bindings below the first time it's needed after they changed
+        self._keyToAction: dict[int, "GameAction"] = {}
+        self._bDirty: bool = True
         self.jump: int = pygame.K_UP
         self.slide: int = pygame.K_DOWN
         self.shoot: int = pygame.K_x
         self.restart: int = pygame.K_r
         self._defaults: dict[str, int] = {"jump": pygame.K_UP, "slide": pygame.K_DOWN, "shoot": pygame.K_x, "restart": pygame.K_r}
 
+    # Options / config assign the attributes directly, that's how we know the map has to be rebuilt
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in ("jump", "slide", "shoot", "restart"):
+            super().__setattr__("_bDirty", True)
+
     def reset(self) -> None:
         self.jump = self._defaults["jump"]
         self.slide = self._defaults["slide"]
@@ -38,35 +47,39 @@ class KeyBindings:
         return getKeyIcon(key, size)
 
     def getActionForKey(self, key: int) -> "GameAction | None":
-        from entities.input.manager import GameAction
+        return self.actionMap().get(key)
 
+    # The dict is updated in place so the InputManager can keep it
+    def actionMap(self) -> dict[int, "GameAction"]:
+        if self._bDirty:
+            self._rebuild()
+        return self._keyToAction
+
+    def _rebuild(self) -> None:
+        from entities.input.manager import GameAction
 
-        # TODO: Clean this conditional branching
-        if key == self.jump:
-            return GameAction.JUMP
-        elif key == self.slide:
-            return GameAction.SLIDE
-        elif key == self.shoot:
-            return GameAction.SHOOT
-        elif key in (pygame.K_SPACE, pygame.K_z, pygame.K_w):
-            return GameAction.JUMP
-        elif key == pygame.K_s:
-            return GameAction.SLIDE
-        elif key == self.restart:
-            return GameAction.RESTART
-        elif key == pygame.K_ESCAPE:
-            return GameAction.PAUSE
-        elif key == pygame.K_RETURN:
-            return GameAction.MENU_CONFIRM
-        elif key == pygame.K_UP:
-            return GameAction.MENU_UP
-        elif key == pygame.K_DOWN:
-            return GameAction.MENU_DOWN
-        elif key == pygame.K_LEFT:
-            return GameAction.MENU_LEFT
-        elif key == pygame.K_RIGHT:
-            return GameAction.MENU_RIGHT
-        return None
+        # Same priorities as the old if chain, the first binding of a key wins
+        # The user's bindings come before the fixed aliases, a restart key moved to space / z / w / s stays restart
+        order: list[tuple[int, GameAction]] = [
+            (self.jump, GameAction.JUMP),
+            (self.slide, GameAction.SLIDE),
+            (self.shoot, GameAction.SHOOT),
+            (self.restart, GameAction.RESTART),
+            (pygame.K_SPACE, GameAction.JUMP),
+            (pygame.K_z, GameAction.JUMP),
+            (pygame.K_w, GameAction.JUMP),
+            (pygame.K_s, GameAction.SLIDE),
+            (pygame.K_ESCAPE, GameAction.PAUSE),
+            (pygame.K_RETURN, GameAction.MENU_CONFIRM),
+            (pygame.K_UP, GameAction.MENU_UP),
+            (pygame.K_DOWN, GameAction.MENU_DOWN),
+            (pygame.K_LEFT, GameAction.MENU_LEFT),
+            (pygame.K_RIGHT, GameAction.MENU_RIGHT),
+        ]
+        self._keyToAction.clear()
+        for key, action in order:
+            self._keyToAction.setdefault(key, action)
+        self._bDirty = False
 
 
 keyBindings = KeyBindings()
@@ -0,0 +1,87 @@
+import time
+from typing import Final
+
+# Input to photon latency: how long between the key / button event and the flip of the frame that shows its effect
+# The player reports the actions it performed (jump, slide) with the timestamp of the input that caused them, on the
+# next flip we close the samples, two histograms per action: input -> simulation and input -> flip
+# There is no way to know when the monitor actually lights the pixels, flip is as close as we can get
+
+bucketMs: Final[float] = 0.5
+maxMs: Final[float] = 250.0
+
+
+def nowMs() -> float:
+    return time.perf_counter() * 1000.0
+
+
+class LatencyHistogram:
+    def __init__(self) -> None:
+        self.counts: list[int] = [0] * (int(maxMs / bucketMs) + 1)
+        self.total: int = 0
+        self.maxSeen: float = 0.0
+
+    def add(self, ms: float) -> None:
+        self.counts[min(int(max(ms, 0.0) / bucketMs), len(self.counts) - 1)] += 1
+        self.total += 1
+        self.maxSeen = max(self.maxSeen, ms)
+
+    # Upper edge of the bucket, so it's never optimistic
+    def percentile(self, p: float) -> float:
+        if self.total == 0:
+            return 0.0
+        rank = p / 100.0 * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return (i + 1) * bucketMs
+        return maxMs
+
+    def clear(self) -> None:
+        self.counts = [0] * len(self.counts)
+        self.total = 0
+        self.maxSeen = 0.0
+
+
+class LatencyTracker:
+    _instance: "LatencyTracker | None" = None
+
+    def __new__(cls) -> "LatencyTracker":
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._init()
+        return cls._instance
+
+    def _init(self) -> None:
+        self.toSim: dict[str, LatencyHistogram] = {}
+        self.toFlip: dict[str, LatencyHistogram] = {}
+        self._pending: list[tuple[str, float]] = []
+
+    # The action happened in the simulation, inputMs is the InputEvent timestamp
+    def actionDone(self, kind: str, inputMs: float) -> None:
+        if inputMs <= 0.0:
+            return
+        if kind not in self.toSim:
+            self.toSim[kind] = LatencyHistogram()
+            self.toFlip[kind] = LatencyHistogram()
+        self.toSim[kind].add(nowMs() - inputMs)
+        self._pending.append((kind, inputMs))
+
+    # Right after display.flip()
+    def presented(self) -> None:
+        if not self._pending:
+            return
+        now = nowMs()
+        for kind, inputMs in self._pending:
+            self.toFlip[kind].add(now - inputMs)
+        self._pending.clear()
+
+    def summary(self, kind: str) -> str:
+        sim = self.toSim[kind]
+        flip = self.toFlip[kind]
+        return (f"sim p50 {sim.percentile(50):.1f}, flip p50 {flip.percentile(50):.1f} "
+                f"p95 {flip.percentile(95):.1f} p99 {flip.percentile(99):.1f} max {flip.maxSeen:.1f} ms "
+                f"(n={flip.total})")
+
+    def kinds(self) -> list[str]:
+        return list(self.toFlip)
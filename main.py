@@ -7,7 +7,6 @@
 # The async code is also for WASM, please don't remove that
 
 import sys
-import asyncio
 
 if sys.platform == "emscripten":
     sys.path.insert(0, "/data/data/mma/assets")
@@ -15,12 +14,17 @@ else:
     import os
     sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import startup
+import asyncio
+
 
 async def main() -> None:
     import flags
-    from game import Game
-
     flags.parse()
+    if flags.bStartupReport:
+        startup.enable()
+
+    from game import Game
 
     game = Game()
     await game.run()
@@ -0,0 +1,153 @@
+import asyncio
+import math
+import sys
+import time
+from collections import deque
+from typing import Final
+
+import pygame
+
+import flags
+import settings
+from settings import FrameCap
+
+# Frame pacing, replaces Clock.tick
+# Clock.tick sleeps with SDL_Delay (1 ms granularity at best, a lot worse on some Windows timers) so frame times
+# jitter, here we sleep with asyncio (so the Discord task etc still run) until just before the deadline and spin the
+# rest (hybrid limiter)
+# With --lowLatency the deadline is moved earlier by the time the last frames took to simulate + draw: the input is
+# sampled as late as possible and the flip still lands on the frame period (late-latch)
+
+_BROWSER: Final[bool] = sys.platform == "emscripten"
+
+# Below this we stop sleeping and spin on perf_counter
+spinS: Final[float] = 0.002
+# Safety margin on top of the work estimate so a slightly slower frame doesn't miss the period
+latchMarginS: Final[float] = 0.001
+# In VSYNC mode the limiter sits a bit above the refresh rate, the flip is what paces if vsync really is on
+vsyncHeadroom: Final[float] = 1.05
+
+jitterWindow: Final[int] = 240
+
+# The game world always steps by simStepS, whatever the cap: the movement is in whole px per step so a smaller dt
+# would move things slower (and not at all above ~400 fps), and the obstacle chunks are checked at that step
+simStepS: Final[float] = 1.0 / settings.fps
+# A step can run up to that early, so at a cap of settings.fps the frame jitter doesn't give 0 then 2 steps
+simSlack: Final[float] = 0.25
+# After a hitch we don't catch up more than that, the world just slows down
+maxSimSteps: Final[int] = 5
+
+
+class FramePacer:
+    smoothing: Final[float] = 0.1
+
+    def __init__(self) -> None:
+        now = time.perf_counter()
+        self._frameStart: float = now
+        self._lastPresent: float = now
+        self._lastInput: float = now
+        self._flipAt: float = now
+        # when the next flip should happen (late-latch only)
+        self._deadline: float = now
+        self.workS: float = 0.0
+        self.lastWorkS: float = 0.0
+        self.targetFps: int = settings.fps
+        self.bVsync: bool = False
+        self.refreshRate: int = _refreshRate()
+        self.intervals: deque[float] = deque(maxlen=jitterWindow)
+        self._simTime: float = 0.0
+
+    def noteInput(self) -> None:
+        self._lastInput = time.perf_counter()
+
+    # 0 = no limit
+    def targetFor(self, bInGame: bool) -> int:
+        cap = settings.frameCap
+        if cap == FrameCap.VSYNC:
+            target = math.ceil(self.refreshRate * vsyncHeadroom)
+        else:
+            target = cap.value
+
+        if not bInGame:
+            bIdle = time.perf_counter() - self._lastInput > settings.menuIdleAfterS
+            menu = settings.menuIdleFps if bIdle else settings.menuFps
+            target = menu if target == 0 else min(target, menu)
+        return target
+
+    async def wait(self, targetFps: int) -> float:
+        self.targetFps = targetFps
+        if targetFps > 0:
+            if flags.bLowLatency:
+                # the deadlines follow each other by exactly one period, after a hitch we start again from the flip
+                self._deadline += 1.0 / targetFps
+                if self._deadline < self._lastPresent:
+                    self._deadline = self._lastPresent + 1.0 / targetFps
+                target = self._deadline - self.workS - latchMarginS
+            else:
+                target = self._frameStart + 1.0 / targetFps
+            await sleepUntil(target)
+
+        now = time.perf_counter()
+        dt = now - self._frameStart
+        self._frameStart = now
+        return dt
+
+    # How many simStepS the world runs this frame, the time left over goes to the next frames
+    def simSteps(self, dt: float) -> int:
+        self._simTime += dt
+        steps = min(int(self._simTime / simStepS + simSlack), maxSimSteps)
+        self._simTime = min(self._simTime - steps * simStepS, simStepS)
+        return steps
+
+    # Right before display.flip(), the work is events + update + draw: with vsync the flip blocks until the vblank
+    # and would count the wait as work
+    def flipping(self) -> None:
+        self._flipAt = time.perf_counter()
+
+    # Right after display.flip()
+    def presented(self) -> None:
+        now = time.perf_counter()
+        self.intervals.append(now - self._lastPresent)
+        self._lastPresent = now
+        self.lastWorkS = self._flipAt - self._frameStart
+        self.workS += (self.lastWorkS - self.workS) * self.smoothing
+
+    # The frame period we are really running at: the refresh rate when vsync paces, 60 fps when uncapped
+    @property
+    def budgetS(self) -> float:
+        if self.bVsync:
+            return 1.0 / self.refreshRate
+        return 1.0 / (self.targetFps or settings.fps)
+
+    def statsText(self) -> str:
+        if not self.intervals:
+            return ""
+        ms = sorted(i * 1000.0 for i in self.intervals)
+        mean = sum(ms) / len(ms)
+        jitter = math.sqrt(sum((m - mean) ** 2 for m in ms) / len(ms))
+        p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+        missed = 0
+        if self.targetFps > 0:
+            budget = 1500.0 / self.targetFps
+            missed = sum(1 for m in ms if m > budget)
+        cap = str(self.targetFps) if self.targetFps else "off"
+        vsync = ", vsync" if self.bVsync else ""
+        return (f"cap {cap}{vsync}, avg {mean:.2f} ms, jitter {jitter:.2f} ms, p99 {p99:.2f} ms, "
+                f"missed {missed}/{len(ms)}")
+
+
+def _refreshRate() -> int:
+    try:
+        rates = pygame.display.get_desktop_refresh_rates()
+    except (pygame.error, AttributeError):
+        return settings.fps
+    return rates[0] if rates and rates[0] > 0 else settings.fps
+
+
+# Hybrid sleep: coarse asyncio sleep then spin for the last couple of ms
+async def sleepUntil(target: float) -> None:
+    remaining = target - time.perf_counter()
+    if remaining > spinS or _BROWSER:
+        await asyncio.sleep(max(0.0, remaining - (0.0 if _BROWSER else spinS)))
+    while time.perf_counter() < target and not _BROWSER:
+        pass
@@ -0,0 +1,78 @@
+import time
+from contextlib import contextmanager
+from typing import Final, Iterator
+
+import pygame
+from pygame import Surface
+
+# Small frame profiler, every frame is split in named sections (events, update, draw, transition...)
+# Times are smoothed so the overlay is readable, start with --profile or toggle the overlay with F3
+
+
+class FrameProfiler:
+    smoothing: Final[float] = 0.1
+
+    _instance: "FrameProfiler | None" = None
+
+    def __new__(cls) -> "FrameProfiler":
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._init()
+        return cls._instance
+
+    def _init(self) -> None:
+        self.bVisible: bool = False
+        self.frameMs: float = 0.0
+        self.sectionsMs: dict[str, float] = {}
+        self.info: dict[str, str] = {}
+
+        self._frameStart: float = 0.0
+        self._current: dict[str, float] = {}
+
+    def beginFrame(self) -> None:
+        self._frameStart = time.perf_counter()
+        self._current.clear()
+
+    def endFrame(self) -> None:
+        a = self.smoothing
+        self.frameMs += ((time.perf_counter() - self._frameStart) * 1000.0 - self.frameMs) * a
+        for name in self.sectionsMs.keys() | self._current.keys():
+            ms = self._current.get(name, 0.0)
+            self.sectionsMs[name] = self.sectionsMs.get(name, ms) + (ms - self.sectionsMs.get(name, ms)) * a
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._current[name] = self._current.get(name, 0.0) + (time.perf_counter() - start) * 1000.0
+
+    # Free text lines shown under the timings (cache sizes, quality tier...)
+    def setInfo(self, name: str, text: str) -> None:
+        self.info[name] = text
+
+    def toggle(self) -> None:
+        self.bVisible = not self.bVisible
+
+    def lines(self) -> list[str]:
+        out = [f"frame {self.frameMs:6.2f} ms"]
+        out += [f"{name:<12}{ms:6.2f} ms" for name, ms in self.sectionsMs.items()]
+        out += [f"{name}: {text}" for name, text in self.info.items()]
+        return out
+
+    def draw(self, screen: Surface) -> None:
+        if not self.bVisible:
+            return
+        from screens.ui.fonts import getFont
+
+        # numbers change every frame so we don't go through the text cache here
+        font = getFont(20)
+        lineH = font.get_linesize()
+        lines = self.lines()
+        w = max(font.size(line)[0] for line in lines) + 12
+        panel = Surface((w, lineH * len(lines) + 8), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            panel.blit(font.render(line, True, (120, 255, 120)), (6, 4 + i * lineH))
+        screen.blit(panel, (8, 8))
@@ -0,0 +1,101 @@
+import sys
+from collections import deque
+from dataclasses import dataclass
+from typing import Final
+
+# Adaptive quality: watches how long the frames take to simulate + draw (not the limiter sleep) and steps the
+# quality tier down when we are over budget, back up when there is room again
+# Hysteresis: going down needs one bad window, going up needs several good ones in a row, and every time we go back
+# down right after going up, the wait before trying again doubles (so a level that sits on the edge doesn't flicker)
+# The tiers only cut effects, never the resolution: the game screen sizes its world (ground, obstacles, spawner) from
+# the window, resizing it mid level would change the gameplay
+
+
+@dataclass(frozen=True, slots=True)
+class QualityTier:
+    name: str
+    # fraction of the particles spawned by lasers / disintegrations
+    particleScale: float
+    # glow disc behind the disintegration particles
+    bParticleGlow: bool
+    # laser line layers, from the core outward (4 = all)
+    beamLayers: int
+    # muzzle / impact flashes of the laser
+    bBeamFlashes: bool
+    # step between the glow rings of the titles (2 = every ring)
+    glowStep: int
+    bVignette: bool
+
+
+tiers: Final[list[QualityTier]] = [
+    QualityTier("HIGH", 1.0, True, 4, True, 2, True),
+    QualityTier("MEDIUM", 0.6, True, 3, True, 4, True),
+    QualityTier("LOW", 0.35, False, 2, False, 6, False),
+    QualityTier("LOWEST", 0.2, False, 1, False, 8, False),
+]
+
+windowFrames: Final[int] = 60
+# p90 of the window above downRatio * budget -> one tier down, below upRatio * budget -> counts as a good window
+downRatio: Final[float] = 0.9
+upRatio: Final[float] = 0.55
+upWindows: Final[int] = 3
+maxUpWindows: Final[int] = 24
+# loading a level, resizing... are not what we want to react to
+ignoreAboveMs: Final[float] = 250.0
+
+
+class QualityGovernor:
+    _instance: "QualityGovernor | None" = None
+
+    def __new__(cls) -> "QualityGovernor":
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._init()
+        return cls._instance
+
+    def _init(self) -> None:
+        # The browser build starts one step down, it's a lot slower than desktop
+        self.index: int = 1 if sys.platform == "emscripten" else 0
+        self.tier: QualityTier = tiers[self.index]
+        self.lastP90Ms: float = 0.0
+        self.budgetMs: float = 1000.0 / 60
+
+        self._window: deque[float] = deque(maxlen=windowFrames)
+        self._goodWindows: int = 0
+        self._upWindows: int = upWindows
+        self._bJustWentUp: bool = False
+
+    def observe(self, workMs: float, budgetMs: float) -> None:
+        if workMs > ignoreAboveMs:
+            return
+        self.budgetMs = budgetMs
+        self._window.append(workMs)
+        if len(self._window) < windowFrames:
+            return
+
+        ordered = sorted(self._window)
+        self.lastP90Ms = ordered[int(len(ordered) * 0.9)]
+        self._window.clear()
+
+        if self.lastP90Ms > budgetMs * downRatio:
+            self._goodWindows = 0
+            if self._bJustWentUp:
+                self._upWindows = min(self._upWindows * 2, maxUpWindows)
+            self._bJustWentUp = False
+            self._setIndex(self.index + 1)
+        elif self.lastP90Ms < budgetMs * upRatio:
+            self._goodWindows += 1
+            if self._goodWindows >= self._upWindows and self.index > 0:
+                self._goodWindows = 0
+                self._bJustWentUp = True
+                self._setIndex(self.index - 1)
+        else:
+            self._goodWindows = 0
+            self._bJustWentUp = False
+
+    def _setIndex(self, index: int) -> None:
+        self.index = max(0, min(index, len(tiers) - 1))
+        self.tier = tiers[self.index]
+
+    def statsText(self) -> str:
+        return f"{self.tier.name}, p90 {self.lastP90Ms:.1f} / {self.budgetMs:.1f} ms"
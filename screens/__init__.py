@@ -1,7 +1,28 @@
-from .menu import MainMenu
-from .game import GameScreen
-from .options import OptionsScreen
-from .level_select import LevelSelectScreen
-from .transition import ScreenTransition, SlideDir, FadeTransition
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .menu import MainMenu
+    from .game import GameScreen
+    from .options import OptionsScreen
+    from .level_select import LevelSelectScreen
+    from .transition import ScreenTransition, SlideDir, FadeTransition
 
 __all__ = ['MainMenu', 'GameScreen', 'OptionsScreen', 'LevelSelectScreen', 'ScreenTransition', 'SlideDir', 'FadeTransition']
+
+# Each screen is imported the first time it's asked for, so importing one screen doesn't load all the others
+_modules: dict[str, str] = {
+    'MainMenu': '.menu',
+    'GameScreen': '.game',
+    'OptionsScreen': '.options',
+    'LevelSelectScreen': '.level_select',
+    'ScreenTransition': '.transition',
+    'SlideDir': '.transition',
+    'FadeTransition': '.transition',
+}
+
+
+def __getattr__(name: str) -> object:
+    if name not in _modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    return getattr(import_module(_modules[name], __name__), name)
@@ -3,9 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 import pygame
-from pygame.sprite import Group
-
-from entities import Player, PlayerState, Chaser, Obstacle, BaseObstacle, FallingCage, CageState
+from entities import Player, PlayerState, Chaser, Obstacle, BaseObstacle, FallingCage, CageState, ScrollLane
+from settings import width, height
 
 
 @dataclass
@@ -19,18 +18,16 @@ class CollisionResult:
 class GameCollision:
     baseW: int = 1920
     baseH: int = 1080
-
-    def __init__(self, screenSize: tuple[int, int]) -> None:
-        self.scale = min(screenSize[0] / self.baseW, screenSize[1] / self.baseH)
+    # Fixed like ObstacleSpawner.scale, the player and the obstacles don't scale with the window
+    scale: float = min(width / baseW, height / baseH)
+    # A jumping player whose feet are less than that into the obstacle's top goes over it
+    jumpClearance: int = 15
+    laserThickness: int = 30
 
     # Scaling func
     def _s(self, val: int) -> int:
         return max(1, int(val * self.scale))
 
-    def onResize(self, screenSize: tuple[int, int]) -> None:
-        self.scale = min(screenSize[0] / self.baseW, screenSize[1] / self.baseH)
-
-
     # When a player hit obstacle, returns true if its a real hit (not jumping over it)
     def _obstacleCallback(self, player: Player, obstacle: Obstacle) -> bool:
         playerHitbox = player.getHitbox()
@@ -40,7 +37,7 @@ class GameCollision:
             return False
 
         if player.state == PlayerState.JUMPING:
-            if playerHitbox.bottom < obstacleHitbox.top + self._s(15):
+            if playerHitbox.bottom < obstacleHitbox.top + self._s(self.jumpClearance):
                 return False
 
         return True
@@ -63,8 +60,9 @@ class GameCollision:
         return True
 
     # Run every frame and we are checking if the player hit a obstacle/cage or was caught by the chaser (it's like the update func)
-    def check(self, player: Player, chaser: Chaser | None, obstacles: Group[Obstacle],
-              cages: Group[FallingCage], bInvincible: bool) -> CollisionResult:
+    # Only the obstacles / cages around the player are tested (see ScrollLane.inRange)
+    def check(self, player: Player, chaser: Chaser | None, obstacles: ScrollLane[Obstacle],
+              cages: ScrollLane[FallingCage], bInvincible: bool) -> CollisionResult:
         result = CollisionResult()
 
         if bInvincible:
@@ -72,17 +70,15 @@ class GameCollision:
                 result.bCaught = True
             return result
 
-        hitObstacles: list[Obstacle] = pygame.sprite.spritecollide(
-            player, obstacles, dokill=False, collided=self._obstacleCallback
-        )
+        playerRect = player.rect
+        hitObstacles = [o for o in obstacles.inRange(playerRect.left, playerRect.right)
+                        if self._obstacleCallback(player, o)]
 
         if hitObstacles:
             result.bHitObstacle = True
             hitObstacles[0].kill()
 
-        hitCages: list[FallingCage] = pygame.sprite.spritecollide(
-            player, cages, dokill=False, collided=self._cageCallback
-        )
+        hitCages = [c for c in cages.inRange(playerRect.left, playerRect.right) if self._cageCallback(player, c)]
 
         if hitCages:
             result.bHitCage = True
@@ -94,13 +90,14 @@ class GameCollision:
         return result
 
     # Func only for level 3, allow us to know if the laser hit a obstacle
-    def checkLaserHit(self, playerX: int, playerY: int, obstacles: Group[BaseObstacle],
+    # Obstacles come from inRange sorted by x, so the first hit is the closest one
+    def checkLaserHit(self, playerX: int, playerY: int, obstacles: ScrollLane[BaseObstacle],
                       laserRange: float) -> BaseObstacle | None:
         from entities.obstacle.geometric import GeometricObstacle
 
-        laserRect = pygame.Rect(playerX, playerY - 15, int(laserRange), 30)
+        laserRect = pygame.Rect(playerX, playerY - self.laserThickness // 2, int(laserRange), self.laserThickness)
 
-        for obstacle in obstacles:
+        for obstacle in obstacles.inRange(laserRect.left, laserRect.right):
             if isinstance(obstacle, GeometricObstacle):
                 if laserRect.colliderect(obstacle.getHitbox()):
                     return obstacle
@@ -8,7 +8,7 @@ from strings import (
     gameOver, gameRestartKey, gameRestartButton, hudJump, hudSlide, hudDoubleJump,
     levelComplete, levelCompleteRestart, gameOverMenuKey, gameOverMenuButton
 )
-from screens.ui import _gradientRect, tablerIcon, drawTextWithShadow, glassPanel, drawGlowTitle
+from screens.ui import _gradientRect, tablerIcon, drawTextWithShadow, glassPanel, drawGlowTitle, getFont, renderText
 from screens.ui.controls import ControlHint, buildControlsPanel
 from screens.ui.ecg import EcgMonitor
 from screens.ui.score import ScoreDisplay
@@ -58,9 +58,9 @@ class HUD:
         return glassPanel(w, h, self.scale)
 
     def _createFonts(self) -> None:
-        self.font: Font = pygame.font.Font(None, self._s(96))
-        self.smallFont: Font = pygame.font.Font(None, self._s(42))
-        self.scoreFont: Font = pygame.font.Font(None, self._s(64))
+        self.font: Font = getFont(self._s(96))
+        self.smallFont: Font = getFont(self._s(42))
+        self.scoreFont: Font = getFont(self._s(64))
 
     def onResize(self, newSize: ScreenSize) -> None:
         self.screenSize = newSize
@@ -194,7 +194,7 @@ class HUD:
             drawGlowTitle(surf, gameOver, self.font, cx, titleY,
                           (255, 55, 55), (160, 0, 0), (40, 0, 0),
                           self._s(12), peakAlpha=50, shadowOffset=self._s(3), bDiagonal=True)
-            titleSurf = self.font.render(gameOver, True, (255, 55, 55))
+            titleSurf = renderText(self.font, gameOver, (255, 55, 55))
 
             divY = titleY + titleSurf.get_height() // 2 + self._s(22)
             divW = panelW - self._s(80)
@@ -208,7 +208,7 @@ class HUD:
                 surf.blit(divSurf, (cx - divW // 2, divY))
 
             scoreText = f"Score Final: {score}"
-            scoreSurf = self.scoreFont.render(scoreText, True, (220, 230, 255))
+            scoreSurf = renderText(self.scoreFont, scoreText, (220, 230, 255))
             scoreY = divY + self._s(35)
 
             pillW = scoreSurf.get_width() + self._s(50)
@@ -218,7 +218,7 @@ class HUD:
             pygame.draw.rect(pill, (180, 150, 0, 80), (0, 0, pillW, pillH), 1, border_radius=pillCr)
             surf.blit(pill, (cx - pillW // 2, scoreY - self._s(10)))
 
-            scoreShadow = self.scoreFont.render(scoreText, True, (30, 35, 50))
+            scoreShadow = renderText(self.scoreFont, scoreText, (30, 35, 50))
             surf.blit(scoreShadow, scoreSurf.get_rect(center=(cx + self._s(2), scoreY + pillH // 2 - self._s(10) + self._s(2))))
             surf.blit(scoreSurf, scoreSurf.get_rect(center=(cx, scoreY + pillH // 2 - self._s(10))))
 
@@ -239,13 +239,13 @@ class HUD:
                 menuText = gameOverMenuKey
 
             actionsY = scoreY + pillH + self._s(20)
-            restartSurf = self.smallFont.render(restartText, True, (240, 240, 245))
+            restartSurf = renderText(self.smallFont, restartText, (240, 240, 245))
             restartRect = restartSurf.get_rect(center=(cx, actionsY))
-            restartShadow = self.smallFont.render(restartText, True, (0, 0, 0))
+            restartShadow = renderText(self.smallFont, restartText, (0, 0, 0))
             surf.blit(restartShadow, restartSurf.get_rect(center=(cx + 1, actionsY + 1)))
             surf.blit(restartSurf, restartRect)
 
-            menuSurf = self.smallFont.render(menuText, True, (130, 132, 150))
+            menuSurf = renderText(self.smallFont, menuText, (130, 132, 150))
             menuRect = menuSurf.get_rect(center=(cx, actionsY + self._s(40)))
             surf.blit(menuSurf, menuRect)
 
@@ -306,9 +306,9 @@ class HUD:
                       self._s(15), shadowOffset=self._s(4))
 
         scoreText = f"Score Final: {score}"
-        scoreSurf = self.scoreFont.render(scoreText, True, gold)
+        scoreSurf = renderText(self.scoreFont, scoreText, gold)
         scoreRect = scoreSurf.get_rect(center=(cx, cy))
-        scoreShadow = self.scoreFont.render(scoreText, True, (100, 80, 0))
+        scoreShadow = renderText(self.scoreFont, scoreText, (100, 80, 0))
         surf.blit(scoreShadow, scoreSurf.get_rect(center=(cx + self._s(2), cy + self._s(2))))
         surf.blit(scoreSurf, scoreRect)
 
@@ -328,11 +328,11 @@ class HUD:
             restartText = levelCompleteRestart.format(key=restartKeyName)
             menuText = gameOverMenuKey
 
-        restartSurf = self.smallFont.render(restartText, True, white)
+        restartSurf = renderText(self.smallFont, restartText, white)
         restartRect = restartSurf.get_rect(center=(cx, cy + self._s(70)))
         surf.blit(restartSurf, restartRect)
 
-        menuSurf = self.smallFont.render(menuText, True, (160, 162, 175))
+        menuSurf = renderText(self.smallFont, menuText, (160, 162, 175))
         menuRect = menuSurf.get_rect(center=(cx, cy + self._s(110)))
         surf.blit(menuSurf, menuRect)
 
@@ -13,16 +13,19 @@ if TYPE_CHECKING:
 import random
 from enum import Enum, auto
 
+import audio
 import flags
 from keybindings import keyBindings
 from levels import LevelConfig, level1Config
-from settings import GameState, ScreenSize, width, height, obstacleSpawnEvent
+from settings import GameState, ScreenSize, width, height
 from entities import (
-    Player, PlayerState, Chaser, Obstacle, FallingCage, Ceiling,
+    Player, PlayerState, Chaser, Obstacle, FallingCage, Ceiling, ScrollLane, SpriteBatch,
     TileSet, GroundTilemap, CeilingTileSet, CeilingTilemap
 )
 from entities.obstacle.cage import CageState
+from entities.lookahead import LookAhead
 from paths import assetsPath
+from profiler import FrameProfiler
 
 from .hud import HUD
 from .spawner import ObstacleSpawner
@@ -44,6 +47,10 @@ class GameScreen:
     groundRatio: float = 1.0
     ceilingRatio: float = 0.0542
     cageDodgeScore: int = 150
+    playerX: int = 320
+    # Height of the laser under the top of the player (from the center when sliding), in player px so not scaled
+    eyeOffset: int = 60
+    slideEyeOffset: int = 10
 
     def __init__(self, setStateCallback: Callable[[GameState], None],
                  levelConfig: LevelConfig = level1Config) -> None:
@@ -54,6 +61,8 @@ class GameScreen:
 
         Obstacle.setDir(levelConfig.obstacleDir)
         self._loadBackground()
+        # Decode the sfx now, not on the first jump mid-run
+        audio.preload()
 
         self.dt: float = 0.0
         self.scrollX: float = 0.0
@@ -69,9 +78,10 @@ class GameScreen:
         if self.chaser:
             self.allSprites.add(self.chaser)
 
-        self.obstacles: Group[Any] = pygame.sprite.Group()
+        self.obstacles: ScrollLane[Any] = ScrollLane()
         self.ceiling = Ceiling(self.screenSize[0], self.screenSize[1], self.ceilingY)
-        self.fallingCages: Group[Any] = pygame.sprite.Group()
+        self.fallingCages: ScrollLane[FallingCage] = ScrollLane()
+        self.lookAhead = LookAhead(self.obstacles, self.fallingCages)
 
         self.score: int = 0
         self.bGameOver: bool = False
@@ -107,7 +117,6 @@ class GameScreen:
             self._initCeilingTilemap()
 
         self._eeStep: int = 0
-        self._eeHeld: set[str] = set()
         self._eeMode: EasterEggMode = EasterEggMode.OFF
 
         self._headEeJumps: int = 0
@@ -118,17 +127,17 @@ class GameScreen:
                        bSlideEnabled=levelConfig.bSlideEnabled,
                        bFallingCages=levelConfig.bFallingCages,
                        bShowHitCounter=levelConfig.bGeometricObstacles)
-        self.spawner = ObstacleSpawner(
-            self.screenSize, self.groundY, self.scrollSpeed,
-            levelConfig.obstacleMinDelay, levelConfig.obstacleMaxDelay,
-            levelConfig.bGeometricObstacles
-        )
-        self.gameCollision = GameCollision(self.screenSize)
+        self.spawner = ObstacleSpawner(self.screenSize, self.groundY, self.scrollSpeed, levelConfig)
+        self.gameCollision = GameCollision()
+
+        # One fblits per layer instead of a blit per sprite (two per cage)
+        self.obstacleBatch = SpriteBatch("obstacles")
+        self.cageBatch = SpriteBatch("cages")
 
     def _createPlayer(self) -> Player:
         cfg = self.levelConfig
         return Player(
-            self._s(320), self.groundY,
+            self._s(self.playerX), self.groundY,
             gravity=cfg.gravity, jumpForce=cfg.jumpForce,
             bDoubleJump=cfg.bDoubleJump, doubleJumpForce=cfg.doubleJumpForce,
             bSlideEnabled=cfg.bSlideEnabled,
@@ -150,9 +159,9 @@ class GameScreen:
 
         playerX = self.localPlayer.rect.right
         if self.localPlayer.state == PlayerState.SLIDING:
-            eyeY = self.localPlayer.rect.centery + self._s(10)
+            eyeY = self.localPlayer.rect.centery + self.slideEyeOffset
         else:
-            eyeY = self.localPlayer.rect.top + self._s(60)
+            eyeY = self.localPlayer.rect.top + self.eyeOffset
         laserRange = self.levelConfig.laserRange
 
         hitObstacle = self.gameCollision.checkLaserHit(
@@ -242,7 +251,6 @@ class GameScreen:
 
         self.hud.onResize(newSize)
         self.spawner.onResize(newSize, self.groundY)
-        self.gameCollision.onResize(newSize)
 
     def reset(self) -> None:
         cfg = self.levelConfig
@@ -286,7 +294,6 @@ class GameScreen:
         self.disintegrationEffects = []
 
         self._eeStep = 0
-        self._eeHeld.clear()
         self._eeMode = EasterEggMode.OFF
         self._headEeJumps = 0
         self._headEeTimer = 0.0
@@ -296,43 +303,38 @@ class GameScreen:
         self.hud.resetGameOverCache()
 
     def handleEvent(self, event: Event, inputEvent: "InputEvent | None" = None) -> None:
-        from entities.input.manager import InputEvent, GameAction
+        from entities.input.manager import InputEvent, GameAction, InputManager, actionBits
 
+        # Keys and buttons both arrive as actions (the key -> action map is compiled in KeyBindings)
+        # A key has one action in the map, so the restart key still restarts when it's also the jump / slide key
         bCanRestart = self.bGameOver or self.bLevelComplete
+        if bCanRestart and event.type == pygame.KEYDOWN and event.key == keyBindings.restart:
+            self.reset()
+            return
+
         if inputEvent:
             if inputEvent.action == GameAction.RESTART and inputEvent.bPressed and bCanRestart:
                 self.reset()
                 return
 
-        if event.type == pygame.KEYDOWN:
-            if event.key == keyBindings.restart and bCanRestart:
-                self.reset()
-            elif not self.bGameOver and not self.bLevelComplete:
-                if event.key == keyBindings.shoot:
-                    if self.localPlayer.shoot():
+            if not self.bGameOver and not self.bLevelComplete:
+                if inputEvent.action == GameAction.SHOOT:
+                    if inputEvent.bPressed and self.localPlayer.shoot():
                         self._fireLaser()
                 else:
                     self.localPlayer.handleInput(event, inputEvent)
-        elif inputEvent and not self.bGameOver and not self.bLevelComplete:
-            if inputEvent.action == GameAction.SHOOT and inputEvent.bPressed:
-                if self.localPlayer.shoot():
-                    self._fireLaser()
-            else:
-                self.localPlayer.handleInput(event, inputEvent)
 
-        if inputEvent:
             name = inputEvent.action.name
-            if inputEvent.bPressed:
-                self._eeHeld.add(name)
-            else:
-                self._eeHeld.discard(name)
+            held = InputManager().held
+            jumpBit = actionBits[GameAction.JUMP]
+            slideBit = actionBits[GameAction.SLIDE]
 
             if inputEvent.bPressed:
-                if self._eeStep == 0 and name == "JUMP" and "SLIDE" not in self._eeHeld:
+                if self._eeStep == 0 and name == "JUMP" and not held & slideBit:
                     self._eeStep = 1
-                elif self._eeStep == 1 and self._eeHeld >= {"JUMP", "SLIDE"}:
+                elif self._eeStep == 1 and held & (jumpBit | slideBit) == jumpBit | slideBit:
                     self._eeStep = 2
-                elif self._eeStep == 2 and name == "SLIDE" and "JUMP" not in self._eeHeld:
+                elif self._eeStep == 2 and name == "SLIDE" and not held & jumpBit:
                     self._eeMode = random.choice([EasterEggMode.MIRROR, EasterEggMode.INVERTED]) if self._eeMode == EasterEggMode.OFF else EasterEggMode.OFF
                     self._eeStep = 0
                 elif name not in ("JUMP", "SLIDE"):
@@ -344,7 +346,6 @@ class GameScreen:
                         self._bHeadEeActive = True
                         self.spawner.bHeadMode = True
 
-        self.spawner.handleEvent(event, self.obstacles, self.bGameOver or self.bFinaleArmed)
 
     def update(self, dt: float) -> None:
         self.dt = dt
@@ -385,17 +386,17 @@ class GameScreen:
         if self.groundTilemap:
             self.groundTilemap.update(scrollDelta)
 
-        if self.ceilingTilemap and cfg.bFallingCages:
-            cageXs = self.ceilingTilemap.update(scrollDelta)
-            if not self.finaleCage:
-                for cx in cageXs:
-                    if self.spawner.canSpawnCage():
-                        self.spawner.spawnCageAt(cx, self.ceiling.height, self.fallingCages)
-                        if self.bFinaleArmed:
-                            self.finaleCage = self.fallingCages.sprites()[-1]
-        elif self.ceilingTilemap:
+        if self.ceilingTilemap:
             self.ceilingTilemap.update(scrollDelta)
 
+        # Once the finale is armed no more bodies, and the next cage is the one for the chaser
+        # The timeline is in the distance the obstacles travel, the slide boost / hit slowdown only scroll the decor
+        bCages = cfg.bFallingCages and self.ceilingTilemap is not None and not self.finaleCage
+        cage = self.spawner.update(self.scrollSpeed * dt, self.obstacles, self.fallingCages, self.ceiling.height,
+                                   bObstacles=not self.bFinaleArmed, bCages=bCages)
+        if cage and self.bFinaleArmed:
+            self.finaleCage = cage
+
         if not cfg.bGeometricObstacles:
             self.score += int(self.scrollSpeed * dt * 0.1 * slowMult)
 
@@ -407,13 +408,15 @@ class GameScreen:
         self._updateDisintegrations(dt)
         if self.chaser:
             self.chaser.setTarget(self.localPlayer.rect.centerx)
-            self.chaser.update(dt, self.fallingCages, self.obstacles)
+            self.lookAhead.refresh()
+            self.chaser.update(dt, self.lookAhead)
         self.obstacles.update(dt)
 
         playerX = self.localPlayer.rect.centerx
         chaserX = self.chaser.rect.centerx if self.chaser else None
         for cage in self.fallingCages:
             cage.update(dt, chaserX if cage is self.finaleCage else playerX)
+        self.fallingCages.sort()
 
         self._handleCollisions()
         self._checkDodgeScore()
@@ -422,12 +425,10 @@ class GameScreen:
     def _updateFinale(self, dt: float) -> None:
         if not self.chaser and self.score >= self.levelConfig.finaleScore and not self.bLevelComplete:
             self.bLevelComplete = True
-            pygame.time.set_timer(obstacleSpawnEvent, 0)
             return
 
         if not self.bFinaleArmed and self.score >= self.levelConfig.finaleScore and self.chaser:
             self.bFinaleArmed = True
-            pygame.time.set_timer(obstacleSpawnEvent, 0)
             if not self.ceilingTilemap:
                 cageX = self.localPlayer.rect.centerx + self._s(400)
                 cage = FallingCage(cageX, 0, self.groundY, self.scrollSpeed)
@@ -457,12 +458,11 @@ class GameScreen:
             self.localPlayer.rect.bottom = self.groundY
         if self.trappedTimer <= 0:
             self.bGameOver = True
-            pygame.time.set_timer(obstacleSpawnEvent, 0)
 
     def _updateChaserCatching(self, dt: float) -> None:
         self.localPlayer.update(dt)
         if self.chaser:
-            self.chaser.update(dt, None, None)
+            self.chaser.update(dt, None)
             if self.chaser.hasCaughtPlayer(self.localPlayer.rect):
                 self.localPlayer.tackle()
                 self.bChaserCatching = False
@@ -476,7 +476,6 @@ class GameScreen:
             self.chaser.rect.centerx = self.localPlayer.rect.centerx
         if self.tackleTimer <= 0:
             self.bGameOver = True
-            pygame.time.set_timer(obstacleSpawnEvent, 0)
 
     def _handleCollisions(self) -> None:
         bInvincible = self.slowdownTimer > 0
@@ -494,10 +493,8 @@ class GameScreen:
                 if self.chaser and not self.bFinaleArmed:
                     self.bChaserCatching = True
                     self.chaser.startCatching(self.localPlayer.rect.centerx)
-                    pygame.time.set_timer(obstacleSpawnEvent, 0)
                 elif not self.chaser:
                     self.bGameOver = True
-                    pygame.time.set_timer(obstacleSpawnEvent, 0)
 
         if result.bHitCage and result.trappingCage and result.trappingCage is not self.finaleCage:
             self.bPlayerTrapped = True
@@ -505,16 +502,14 @@ class GameScreen:
             self.trappingCage = result.trappingCage
             self.trappingCage.trapPlayer(self.localPlayer.rect.centerx)
             self.localPlayer.trap()
-            pygame.time.set_timer(obstacleSpawnEvent, 0)
 
         if result.bCaught:
             self.bGameOver = True
-            pygame.time.set_timer(obstacleSpawnEvent, 0)
 
     def _checkDodgeScore(self) -> None:
         playerLeft = self.localPlayer.rect.left
-        for obstacle in self.obstacles:
-            if not obstacle.bScored and obstacle.rect.right < playerLeft:
+        for obstacle in self.obstacles.behind(playerLeft):
+            if not obstacle.bScored:
                 obstacle.bScored = True
                 self.score += self.levelConfig.laneDodgeScore
 
@@ -527,7 +522,14 @@ class GameScreen:
         self._drawScrollingBackground(screen)
         if self.groundTilemap:
             self.groundTilemap.draw(screen)
-        self.obstacles.draw(screen)
+
+        viewport = screen.get_rect()
+        # inRange skips everything that scrolled out (still alive until rect.right < -50) or isn't on screen yet,
+        # the sprites come back left to right which is also their spawn order so the z-order doesn't change
+        self.obstacleBatch.begin(viewport)
+        for obstacle in self.obstacles.inRange(viewport.left, viewport.right):
+            self.obstacleBatch.add(obstacle.image, obstacle.rect.topleft)
+        self.obstacleBatch.flush(screen)
 
         for fx in self.disintegrationEffects:
             fx.draw(screen)
@@ -549,10 +551,19 @@ class GameScreen:
         if self.ceilingTilemap:
             self.ceilingTilemap.draw(screen)
 
-        for cage in self.fallingCages:
+        # a bit of margin for the warning shake
+        self.cageBatch.begin(viewport)
+        for cage in self.fallingCages.inRange(viewport.left - 8, viewport.right + 8):
             if cage is self.finaleCage and self.bChaserTrapped:
                 continue
-            cage.draw(screen)
+            for image, pos in cage.blitItems():
+                self.cageBatch.add(image, pos)
+        self.cageBatch.flush(screen)
+
+        profiler = FrameProfiler()
+        if profiler.bVisible:
+            for batch in (self.obstacleBatch, self.cageBatch):
+                profiler.setInfo(batch.name, batch.stats())
 
         self.hud.draw(screen, self.score, self.bGameOver, self.dt, self.hitCount,
                       self.levelConfig.maxHits, self.bLevelComplete)
@@ -1,98 +1,95 @@
 from __future__ import annotations
 
-import random
-import time
-
-import pygame
-from pygame.event import Event
 from pygame.sprite import Group
 
-from settings import ScreenSize, obstacleSpawnEvent
+import timeline
+from levels import LevelConfig
+from settings import ScreenSize, width, height
 from entities import Obstacle, BaseObstacle, FallingCage
+from entities.tilemap import tileSize
+from timeline import Kind, Timeline, TimelineEntry
+
+shapes: list[str] = ["triangle", "square", "hexagon"]
+shapeColors: list[tuple[int, int, int]] = [(0, 255, 255), (255, 0, 255), (255, 255, 0), (0, 255, 100)]
 
 
+# Streams the level timeline in as we scroll: every entry whose distance we reached is spawned right of the screen
+# Before this it was a pygame timer with a random delay + wall clock gaps between bodies and cages, the timeline
+# generator now does the same dice once per entry (see timeline.py) and a level can also ship its own timeline
 class ObstacleSpawner:
     baseW: int = 1920 # Need to be reworked since those are not the good resolutions, but somehow it's working fine?
     baseH: int = 1080
-    minGapBetweenTypes: float = 2.0
-
-    def __init__(self, screenSize: ScreenSize, groundY: int, scrollSpeed: float,
-                 obstacleMinDelay: float = 2.5, obstacleMaxDelay: float = 5.0,
-                 bGeometricObstacles: bool = False) -> None:
+    # The obstacles are sized against the player and the player doesn't scale with the window, so they keep the size
+    # they have in the default window whatever the window is (a body scaled for 1080p is too tall to jump over)
+    scale: float = min(width / baseW, height / baseH)
+    # The bodies / shapes spawn that far right of the screen, every height tier of the shapes is tierHeight higher
+    spawnOffset: int = 100
+    tierHeight: int = 100
+
+    def __init__(self, screenSize: ScreenSize, groundY: int, scrollSpeed: float, levelConfig: LevelConfig) -> None:
         self.screenSize = screenSize
-        self.scale = min(screenSize[0] / self.baseW, screenSize[1] / self.baseH)
         self.groundY = groundY
         self.scrollSpeed = scrollSpeed
-        self.obstacleMinDelay: float = obstacleMinDelay
-        self.obstacleMaxDelay: float = obstacleMaxDelay
-        self.obstacleSpawnDelay: float = 3.0
-        self.lastBodyTime: float = 0.0
-        self.lastCageTime: float = 0.0
-        self.bGeometricObstacles: bool = bGeometricObstacles # Level 3 only
+        self.levelConfig = levelConfig
+        self.bGeometricObstacles: bool = levelConfig.bGeometricObstacles # Level 3 only
         self.bHeadMode: bool = False # Special easter egg from level 3
 
+        self.timeline: Timeline = timeline.forLevel(levelConfig)
+        self.distance: float = 0.0
+        self._next: int = 0
+
     # Scaling func
     def _s(self, val: int) -> int:
         return max(1, int(val * self.scale))
 
     def onResize(self, newSize: ScreenSize, groundY: int) -> None:
         self.screenSize = newSize
-        self.scale = min(newSize[0] / self.baseW, newSize[1] / self.baseH)
         self.groundY = groundY
 
-
-    # Handle spawn timer event, so we know when we can spawn a new obstacle
-    def handleEvent(self, event: Event, obstacles: Group[BaseObstacle], bGameOver: bool) -> None:
-        if event.type == obstacleSpawnEvent and not bGameOver:
-            now = time.monotonic()
-            if now - self.lastCageTime >= self.minGapBetweenTypes:
-                self._spawnObstacle(obstacles)
-                self.lastBodyTime = now
-            self.obstacleSpawnDelay = random.uniform(self.obstacleMinDelay, self.obstacleMaxDelay)
-            pygame.time.set_timer(obstacleSpawnEvent, int(self.obstacleSpawnDelay * 1000))
-
-    # Spawn a obstacle, right now all this code is wayy too hardcoded (there is logic specific for level 3)
-    def _spawnObstacle(self, obstacles: Group[BaseObstacle]) -> None:
-        from entities.obstacle.base import BaseObstacle
-        x = self.screenSize[0] + self._s(100)
+    # Returns the last cage spawned this frame (the finale wants it)
+    def update(self, scrollDelta: float, obstacles: Group[BaseObstacle], cages: Group[FallingCage],
+               ceilingY: int, bObstacles: bool = True, bCages: bool = True) -> FallingCage | None:
+        self.distance += scrollDelta
+        cage: FallingCage | None = None
+        while self.timeline.ensure(self._next) and self.timeline.distanceAt(self._next) <= self.distance:
+            entry = self.timeline.entryAt(self._next)
+            self._next += 1
+            if entry.kind == Kind.CAGE:
+                if bCages:
+                    cage = self.spawnCageAt(self.screenSize[0] + tileSize // 2, ceilingY, cages)
+            elif bObstacles:
+                self._spawnObstacle(entry, obstacles)
+        return cage
+
+    # Right now all this code is wayy too hardcoded (there is logic specific for level 3)
+    def _spawnObstacle(self, entry: TimelineEntry, obstacles: Group[BaseObstacle]) -> None:
+        x = self.screenSize[0] + self._s(self.spawnOffset)
         obstacle: BaseObstacle
 
-        if self.bGeometricObstacles:
-            heightTiers = [
-                self.groundY,
-                self.groundY - self._s(100),
-                self.groundY - self._s(200),
-                self.groundY - self._s(300),
-            ]
-            posY = random.choice(heightTiers)
+        if entry.kind == Kind.SHAPE:
+            posY = self.groundY - self._s(self.tierHeight * entry.tier) if entry.tier else self.groundY
 
             if self.bHeadMode:
                 from entities.obstacle.geometric import HeadObstacle
                 obstacle = HeadObstacle(x, self.groundY, self.scale, posY=posY)
             else:
                 from entities.obstacle.geometric import GeometricObstacle
-                shapes = ["triangle", "square", "hexagon"]
-                colors = [(0, 255, 255), (255, 0, 255), (255, 255, 0), (0, 255, 100)]
-                obstacle = GeometricObstacle(x, self.groundY, self.scale,
-                                             random.choice(shapes), random.choice(colors), posY=posY)
+                obstacle = GeometricObstacle(x, self.groundY, self.scale, shapes[entry.variant % len(shapes)],
+                                             shapeColors[entry.extra % len(shapeColors)], posY=posY)
         else:
-            obstacle = Obstacle(x, self.groundY, self.scale)
+            obstacle = Obstacle(x, self.groundY, self.scale, variant=entry.variant)
 
         obstacle.speed = self.scrollSpeed
         obstacles.add(obstacle)
 
-    def canSpawnCage(self) -> bool:
-        now = time.monotonic()
-        return now - self.lastBodyTime >= self.minGapBetweenTypes
-
-    def spawnCageAt(self, x: int, ceilingY: int, cages: Group[FallingCage]) -> None:
-        self.lastCageTime = time.monotonic()
+    def spawnCageAt(self, x: int, ceilingY: int, cages: Group[FallingCage]) -> FallingCage:
         cage = FallingCage(x, ceilingY, self.groundY, self.scrollSpeed)
         cages.add(cage)
+        return cage
 
     def reset(self) -> None:
-        self.obstacleSpawnDelay = random.uniform(self.obstacleMinDelay, self.obstacleMaxDelay)
-        self.lastBodyTime = 0.0
+        self.timeline.close()
+        self.timeline = timeline.forLevel(self.levelConfig)
+        self.distance = 0.0
+        self._next = 0
         self.bHeadMode = False
-        self.lastCageTime = 0.0
-        pygame.time.set_timer(obstacleSpawnEvent, int(self.obstacleSpawnDelay * 1000))
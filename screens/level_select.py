@@ -1,4 +1,5 @@
-from typing import Callable, TYPE_CHECKING
+import time
+from typing import Callable, Iterator, TYPE_CHECKING
 
 import pygame
 from pygame import Surface
@@ -9,20 +10,26 @@ if TYPE_CHECKING:
 
 import flags
 import settings
-from settings import GameState, ScreenSize, lastCompletedLevel
+from settings import GameState, ScreenSize
 from levels import levelConfigs
 from strings import levelSelectTitle, levelTarget, optionsBack
-from screens.menu_bg import MenuBackground
-from screens.ui import Button, tablerIcon, drawGlowTitle
+from screens.menu_bg import MenuBackground, sharedMenuBackground
+from screens.ui import Button, tablerIcon, drawGlowTitle, getFont
 from screens.ui.primitives import OutlineIcon
 from screens.ui.levelcard import buildLevelCard
+from profiler import FrameProfiler
 
 _goldColor = (255, 215, 0)
 
 
+CardKey = tuple[int, str, bool, tuple[int, int]]
+
+
 class LevelSelectScreen:
     baseW: int = 1920
     baseH: int = 1080
+    # Time we allow per frame to render cards that aren't on screen yet (current page + neighbours)
+    prerenderBudget: float = 0.002
 
     def __init__(self, screenSize: ScreenSize,
                  setStateCallback: Callable[[GameState], None],
@@ -32,19 +39,13 @@ class LevelSelectScreen:
         self.screenSize: ScreenSize = screenSize
         self.scale: float = min(screenSize[0] / self.baseW, screenSize[1] / self.baseH)
 
-        lvl = lastCompletedLevel()
-        cfg = levelConfigs.get(lvl) if lvl else None
-        self.menuBg = MenuBackground(
-            screenSize,
-            cfg.backgroundPath if cfg else None,
-            cfg.bHasCeilingTiles if cfg else True,
-        )
+        self.menuBg: MenuBackground = sharedMenuBackground(self.screenSize)
 
-        self.titleFont: Font = Font(None, self._s(80))
-        self.numberFont: Font = Font(None, self._s(60))
-        self.nameFont: Font = Font(None, self._s(28))
-        self.infoFont: Font = Font(None, self._s(22))
-        self.buttonFont: Font = Font(None, self._s(28))
+        self.titleFont: Font = getFont(self._s(80))
+        self.numberFont: Font = getFont(self._s(60))
+        self.nameFont: Font = getFont(self._s(28))
+        self.infoFont: Font = getFont(self._s(22))
+        self.buttonFont: Font = getFont(self._s(28))
 
         self.backBtn: Button = self._createBackButton()
 
@@ -64,7 +65,11 @@ class LevelSelectScreen:
         self.chevronLeftRect: pygame.Rect = pygame.Rect(0, 0, 0, 0)
         self.chevronRightRect: pygame.Rect = pygame.Rect(0, 0, 0, 0)
 
-        self._cachedCards: dict[tuple[int, str, bool], Surface] = {}
+        # Every variant of every card is kept, hover / focus / page changes only pick another entry
+        # The cache is only dropped on resize or when the progress changes
+        self._cachedCards: dict[CardKey, Surface] = {}
+        self._cardSize: tuple[int, int] = (0, 0)
+        self._levelStates: tuple[str, ...] = ()
 
         self._computeLayout()
 
@@ -82,6 +87,7 @@ class LevelSelectScreen:
         cardW = self._s(240)
         cardH = self._s(170)
         gap = self._s(30)
+        self._cardSize = (cardW, cardH)
 
         self.cols = max(2, min(4, screenW // self._s(280)))
 
@@ -129,13 +135,12 @@ class LevelSelectScreen:
         return "locked"
 
     def _buildCardSurf(self, levelId: int, state: str, bHighlight: bool) -> Surface:
-        key = (levelId, state, bHighlight)
+        key = (levelId, state, bHighlight, self._cardSize)
         if key in self._cachedCards:
             return self._cachedCards[key]
 
         cfg = levelConfigs[levelId]
-        idx = self._pageIds().index(levelId)
-        w, h = self.cardRects[idx].size
+        w, h = self._cardSize
 
         surf = buildLevelCard(
             w, h, levelId, cfg.name, cfg.finaleScore,
@@ -149,12 +154,36 @@ class LevelSelectScreen:
     def _invalidateCache(self) -> None:
         self._cachedCards.clear()
 
+    def _checkProgress(self) -> None:
+        states = tuple(self._getLevelState(lid) for lid in self.levelIds)
+        if states != self._levelStates:
+            self._levelStates = states
+            self._invalidateCache()
+
+    # Current page first, then the next one and the previous one
+    def _cardsToPrerender(self) -> Iterator[tuple[int, str, bool]]:
+        for page in (self.currentPage, self.currentPage + 1, self.currentPage - 1):
+            if not 0 <= page < self.totalPages:
+                continue
+            for lid in self.levelIds[page * self.perPage:(page + 1) * self.perPage]:
+                state = self._getLevelState(lid)
+                for bHighlight in (False, True):
+                    if (lid, state, bHighlight, self._cardSize) not in self._cachedCards:
+                        yield lid, state, bHighlight
+
+    def _prerenderCards(self) -> None:
+        deadline = time.perf_counter() + self.prerenderBudget
+        with FrameProfiler().section("cards"):
+            for lid, state, bHighlight in self._cardsToPrerender():
+                self._buildCardSurf(lid, state, bHighlight)
+                if time.perf_counter() >= deadline:
+                    break
+
     def _setPage(self, page: int) -> None:
         clamped = max(0, min(page, self.totalPages - 1))
         if clamped != self.currentPage:
             self.currentPage = clamped
             self._computeLayout()
-            self._invalidateCache()
 
     def _focusedIndex(self) -> int:
         return self.focusRow * self.cols + self.focusCol
@@ -174,11 +203,11 @@ class LevelSelectScreen:
         self.screenSize = newSize
         self.scale = min(newSize[0] / self.baseW, newSize[1] / self.baseH)
 
-        self.titleFont = Font(None, self._s(80))
-        self.numberFont = Font(None, self._s(60))
-        self.nameFont = Font(None, self._s(28))
-        self.infoFont = Font(None, self._s(22))
-        self.buttonFont = Font(None, self._s(28))
+        self.titleFont = getFont(self._s(80))
+        self.numberFont = getFont(self._s(60))
+        self.nameFont = getFont(self._s(28))
+        self.infoFont = getFont(self._s(22))
+        self.buttonFont = getFont(self._s(28))
 
         self.menuBg.onResize(newSize)
         self.backBtn = self._createBackButton()
@@ -190,14 +219,11 @@ class LevelSelectScreen:
 
         if event.type == pygame.MOUSEMOTION:
             self.bJoystickNavMode = False
-            oldHover = self.hoveredCard
             self.hoveredCard = -1
             for i, rect in enumerate(self.cardRects):
                 if rect.collidepoint(event.pos):
                     self.hoveredCard = i
                     break
-            if oldHover != self.hoveredCard:
-                self._invalidateCache()
 
         if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
             if self.chevronLeftRect.collidepoint(event.pos):
@@ -216,7 +242,6 @@ class LevelSelectScreen:
         if inputEvent:
             if inputEvent.source == InputSource.JOYSTICK and not self.bJoystickNavMode:
                 self.bJoystickNavMode = True
-                self._invalidateCache()
 
             if inputEvent.bPressed:
                 pageIds = self._pageIds()
@@ -230,7 +255,6 @@ class LevelSelectScreen:
                         self._setPage(self.currentPage + 1)
                         self.focusCol = 0
                         self._clampFocus()
-                    self._invalidateCache()
 
                 elif inputEvent.action == GameAction.MENU_LEFT:
                     if self.focusCol > 0:
@@ -243,19 +267,16 @@ class LevelSelectScreen:
                         self.focusRow = min(self.focusRow, nRows - 1)
                         lastRowCols = nPage - self.focusRow * self.cols
                         self.focusCol = min(self.cols - 1, lastRowCols - 1)
-                    self._invalidateCache()
 
                 elif inputEvent.action == GameAction.MENU_DOWN:
                     if self.focusRow < nRows - 1:
                         self.focusRow += 1
                         self._clampFocus()
-                    self._invalidateCache()
 
                 elif inputEvent.action == GameAction.MENU_UP:
                     if self.focusRow > 0:
                         self.focusRow -= 1
                         self._clampFocus()
-                    self._invalidateCache()
 
                 elif inputEvent.action in (GameAction.MENU_CONFIRM, GameAction.JUMP):
                     if self.bJoystickNavMode:
@@ -273,6 +294,8 @@ class LevelSelectScreen:
 
     def update(self, dt: float) -> None:
         self.menuBg.update(dt)
+        self._checkProgress()
+        self._prerenderCards()
 
     def _drawTitle(self, screen: Surface) -> None:
         cx = self.screenSize[0] // 2
@@ -9,11 +9,10 @@ from pygame.font import Font
 if TYPE_CHECKING:
     from entities.input.manager import InputEvent
 
-from settings import width, height, GameState, ScreenSize, lastCompletedLevel
+from settings import width, height, GameState, ScreenSize
 from strings import btnPlay, btnOptions, btnQuit
-from levels import levelConfigs
-from screens.menu_bg import MenuBackground
-from screens.ui import Button, drawGlowTitle
+from screens.menu_bg import MenuBackground, sharedMenuBackground
+from screens.ui import Button, drawGlowTitle, getFont, renderText
 
 
 class MainMenu:
@@ -26,22 +25,17 @@ class MainMenu:
         self.screenSize: ScreenSize = (width, height)
         self.scale: float = min(width / self.baseW, height / self.baseH)
 
-        # We are getting the last completed level to draw the background of this level into our start menu
-        lvl = lastCompletedLevel()
-        cfg = levelConfigs.get(lvl) if lvl else None
-        self.menuBg = MenuBackground(
-            self.screenSize,
-            cfg.backgroundPath if cfg else None,
-            cfg.bHasCeilingTiles if cfg else True,
-        )
+        self.menuBg: MenuBackground = sharedMenuBackground(self.screenSize)
 
-        self.buttonFont: Font = pygame.font.Font(None, self._s(28))
+        self.buttonFont: Font = getFont(self._s(28))
         self.playBtn: Button
         self.optionsBtn: Button
         self.quitBtn: Button
         self._createButtons()
 
-        self.titleFont: Font = pygame.font.Font(None, self._s(160))
+        self.titleFont: Font = getFont(self._s(160))
+        self._titleLayers: tuple[Surface, Surface] | None = None
+        self._titleLayersFont: Font | None = None
 
         self.time: float = 0.0
         self.titlePulse: float = 0.0
@@ -114,8 +108,18 @@ class MainMenu:
                       (180, 180, 190), (139, 0, 0), (20, 0, 0),
                       self._s(20), peakAlpha=80, shadowOffset=self._s(5), pulse=pulse)
 
-        base = self.titleFont.render(text, True, (180, 180, 190))
-        baseRect = base.get_rect(center=(cx, ty))
+        if self._titleLayers is None or self._titleLayersFont is not self.titleFont:
+            self._titleLayers = self._buildTitleLayers(text)
+            self._titleLayersFont = self.titleFont
+
+        gradientSurf, highlightMasked = self._titleLayers
+        baseRect = gradientSurf.get_rect(center=(cx, ty))
+        surf.blit(gradientSurf, baseRect)
+        surf.blit(highlightMasked, baseRect, special_flags=pygame.BLEND_ADD)
+
+    # The gradient + highlight only depends on the font size, so it's built once and reused every frame
+    def _buildTitleLayers(self, text: str) -> tuple[Surface, Surface]:
+        base = renderText(self.titleFont, text, (180, 180, 190))
 
         gradientSurf = pygame.Surface(base.get_size(), pygame.SRCALPHA)
         tw, th = base.get_size()
@@ -134,26 +138,25 @@ class MainMenu:
         mask = pygame.mask.from_surface(base)
         maskSurf = mask.to_surface(setcolor=(255, 255, 255, 255), unsetcolor=(0, 0, 0, 0))
         gradientSurf.blit(maskSurf, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        surf.blit(gradientSurf, baseRect)
 
-        highlightSurf = pygame.Surface((tw, th // 3), pygame.SRCALPHA)
+        highlightSurf = pygame.Surface((tw, max(1, th // 3)), pygame.SRCALPHA)
         for y in range(th // 3):
             alpha = int(60 * (1 - y / (th // 3)))
             pygame.draw.line(highlightSurf, (255, 255, 255, alpha), (0, y), (tw, y))
         highlightMasked = pygame.Surface((tw, th), pygame.SRCALPHA)
         highlightMasked.blit(highlightSurf, (0, 0))
         highlightMasked.blit(maskSurf, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        surf.blit(highlightMasked, baseRect, special_flags=pygame.BLEND_ADD)
+        return gradientSurf, highlightMasked
 
     def onResize(self, newSize: ScreenSize) -> None:
         self.screenSize = newSize
         self.scale = min(newSize[0] / self.baseW, newSize[1] / self.baseH)
-        self.buttonFont = pygame.font.Font(None, self._s(28))
+        self.buttonFont = getFont(self._s(28))
         for btn in [self.playBtn, self.optionsBtn, self.quitBtn]:
             btn.setFont(self.buttonFont)
         self.menuBg.onResize(newSize)
         self._updateButtonPositions()
-        self.titleFont = pygame.font.Font(None, self._s(160))
+        self.titleFont = getFont(self._s(160))
 
     def handleEvent(self, event: Event, inputEvent: "InputEvent | None" = None) -> None:
         from entities.input.manager import InputEvent, GameAction, InputSource
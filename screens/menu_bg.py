@@ -8,17 +8,21 @@ from pathlib import Path
 import pygame
 from pygame import Surface
 
-from settings import ScreenSize
+from quality import QualityGovernor
+from settings import ScreenSize, lastCompletedLevel
 from entities import (
     Player,
     TileSet, GroundTilemap, CeilingTileSet, CeilingTilemap, Ceiling
 )
+from levels import levelConfigs
 from paths import assetsPath, screensPath
 
 tilesPath = assetsPath / "tiles" / "ground"
 ceilingTilesPath = assetsPath / "tiles" / "ceiling"
 
 
+# All the menu screens draw the same background, there's only one instance (see sharedMenuBackground)
+# so switching between menus keeps the scroll position and nothing gets reloaded
 class MenuBackground:
     baseW: int = 1280
     baseH: int = 720
@@ -26,6 +30,7 @@ class MenuBackground:
     groundRatio: float = 1.0
     ceilingRatio: float = 0.0542
     overlayAlpha: int = 130
+    overlayDownscale: int = 4
 
     def __init__(self, screenSize: ScreenSize, backgroundPath: Path | None = None,
                  bHasCeilingTiles: bool = True) -> None:
@@ -67,17 +72,30 @@ class MenuBackground:
         self.ceilingTileset = CeilingTileSet(ceilingTilesPath)
         self.ceilingTilemap = CeilingTilemap(self.ceilingTileset, w, self.ceiling.height)
 
+    # The vignette is a smooth gradient so we draw it at a quarter of the resolution and scale it up
     def _buildOverlay(self) -> None:
         w, h = self.screenSize
-        self.overlaySurf = Surface((w, h), pygame.SRCALPHA)
-        self.overlaySurf.fill((0, 0, 0, self.overlayAlpha))
-        cx, cy = w // 2, h // 2
+        sw, sh = max(1, w // self.overlayDownscale), max(1, h // self.overlayDownscale)
+        small = Surface((sw, sh), pygame.SRCALPHA)
+        small.fill((0, 0, 0, self.overlayAlpha))
+        cx, cy = sw // 2, sh // 2
         maxDist = math.hypot(cx, cy)  # diagonal distance center -> corner
-        for ring in range(0, int(maxDist), 6):
+        for ring in range(0, int(maxDist), 2):
             t = ring / maxDist
             alpha = int(60 * (t ** 2.5))
             if alpha > 0:
-                pygame.draw.circle(self.overlaySurf, (0, 0, 0, alpha), (cx, cy), int(maxDist - ring), 6)
+                pygame.draw.circle(small, (0, 0, 0, alpha), (cx, cy), int(maxDist - ring), 2)
+        self.overlaySurf = pygame.transform.smoothscale(small, (w, h))
+
+    # Switches to another level's background, only reloads if it actually changed
+    def setLevel(self, backgroundPath: Path | None, bHasCeilingTiles: bool) -> None:
+        if backgroundPath == self.backgroundPath and bHasCeilingTiles == self.bHasCeilingTiles:
+            return
+        self.backgroundPath = backgroundPath
+        self.bHasCeilingTiles = bHasCeilingTiles
+        self._loadBackground()
+        if self.bHasCeilingTiles:
+            self._initCeilingTilemap()
 
     def update(self, dt: float) -> None:
         scrollDelta = self.scrollSpeed * dt
@@ -104,10 +122,18 @@ class MenuBackground:
         if self.bHasCeilingTiles:
             self.ceilingTilemap.draw(screen)
 
-        screen.blit(self.overlaySurf, (0, 0))
+        # Without the vignette we only darken, a multiply fill is a lot cheaper than the alpha blit
+        if QualityGovernor().tier.bVignette:
+            screen.blit(self.overlaySurf, (0, 0))
+        else:
+            keep = 255 - self.overlayAlpha
+            screen.fill((keep, keep, keep), special_flags=pygame.BLEND_RGB_MULT)
 
     # Won't work well have to do more tests
     def onResize(self, newSize: ScreenSize) -> None:
+        # Every menu screen forwards its resize here, only the first one has something to do
+        if newSize == self.screenSize:
+            return
         self.screenSize = newSize
         self.scale = min(newSize[0] / self.baseW, newSize[1] / self.baseH)
         self.groundY = int(newSize[1] * self.groundRatio)
@@ -120,3 +146,22 @@ class MenuBackground:
             self.ceilingTilemap.on_resize(newSize[0], self.ceiling.height)
         self.demoPlayer.setGroundY(self.groundY)
         self._buildOverlay()
+
+
+_shared: MenuBackground | None = None
+
+
+# We are getting the last completed level to draw the background of this level into the menus
+def sharedMenuBackground(screenSize: ScreenSize) -> MenuBackground:
+    global _shared
+    lvl = lastCompletedLevel()
+    cfg = levelConfigs.get(lvl) if lvl else None
+    backgroundPath = cfg.backgroundPath if cfg else None
+    bHasCeilingTiles = cfg.bHasCeilingTiles if cfg else True
+
+    if _shared is None:
+        _shared = MenuBackground(screenSize, backgroundPath, bHasCeilingTiles)
+    else:
+        _shared.setLevel(backgroundPath, bHasCeilingTiles)
+        _shared.onResize(screenSize)
+    return _shared
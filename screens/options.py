@@ -11,17 +11,18 @@ from pygame.font import Font
 if TYPE_CHECKING:
     from entities.input.manager import InputEvent
 
+import audio
 import config
 import settings
-from settings import GameState, ScreenSize
+from settings import GameState, ScreenSize, FrameCap
 from keybindings import keyBindings
 from strings import (
     optionsTitle, optionsControls, optionsJump, optionsSlide, optionsRestart,
-    optionsReset, optionsBack, optionsPressKey, optionsSound
+    optionsReset, optionsBack, optionsPressKey, optionsSound, optionsDisplay, optionsFrameCap,
+    optionsUncapped, optionsVsync
 )
-from levels import levelConfigs, level1Config
-from screens.menu_bg import MenuBackground
-from screens.ui import Button, drawGlowTitle, drawSectionHeader
+from screens.menu_bg import MenuBackground, sharedMenuBackground
+from screens.ui import Button, drawGlowTitle, drawSectionHeader, getFont, renderText
 
 _bindingDefs: list[tuple[str, str]] = [
     (optionsJump, "jump"),
@@ -29,6 +30,17 @@ _bindingDefs: list[tuple[str, str]] = [
     (optionsRestart, "restart"),
 ]
 
+# Order of the frame cap selector, left click goes forward, right click back
+_frameCaps: list[FrameCap] = [FrameCap.FPS_60, FrameCap.FPS_120, FrameCap.FPS_144, FrameCap.UNCAPPED, FrameCap.VSYNC]
+
+
+def _frameCapLabel(cap: FrameCap) -> str:
+    if cap == FrameCap.UNCAPPED:
+        return optionsUncapped
+    if cap == FrameCap.VSYNC:
+        return optionsVsync
+    return str(cap.value)
+
 
 class OptionsScreen:
     baseW: int = 1920
@@ -39,12 +51,12 @@ class OptionsScreen:
         self.screenSize: ScreenSize = screenSize
         self.scale: float = min(screenSize[0] / self.baseW, screenSize[1] / self.baseH)
 
-        self.menuBg = self._createMenuBg(screenSize)
+        self.menuBg: MenuBackground = sharedMenuBackground(screenSize)
 
         self.panelSurf: Surface | None = None
 
-        self.buttonFont: Font = pygame.font.Font(None, self._s(28))
-        self.labelFont: Font = pygame.font.Font(None, self._s(32))
+        self.buttonFont: Font = getFont(self._s(28))
+        self.labelFont: Font = getFont(self._s(32))
 
         self.iconSize: int = self._s(50)
         self._icons: list[Surface | None] = [None] * len(_bindingDefs)
@@ -58,6 +70,10 @@ class OptionsScreen:
         self._soundToggleRect: pygame.Rect = pygame.Rect(0, 0, 0, 0)
         self._soundHovered: bool = False
 
+        self._displayPanelSurf: Surface | None = None
+        self._frameCapRect: pygame.Rect = pygame.Rect(0, 0, 0, 0)
+        self._frameCapHovered: bool = False
+
         self.resetBtn: Button
         self.backBtn: Button
 
@@ -65,21 +81,14 @@ class OptionsScreen:
         self._computeLayout()
         self._createActionButtons()
 
-        self.titleFont: Font = pygame.font.Font(None, self._s(120))
-        self.sectionFont: Font = pygame.font.Font(None, self._s(48))
+        self.titleFont: Font = getFont(self._s(120))
+        self.sectionFont: Font = getFont(self._s(48))
 
         self.time: float = 0.0
         self.titlePulse: float = 0.0
 
-    @staticmethod
-    def _createMenuBg(screenSize: ScreenSize) -> MenuBackground:
-        levelId = settings.lastCompletedLevel() or 1
-        cfg = levelConfigs.get(levelId, level1Config)
-        return MenuBackground(screenSize, backgroundPath=cfg.backgroundPath,
-                              bHasCeilingTiles=cfg.bHasCeilingTiles)
-
     def refreshBackground(self) -> None:
-        self.menuBg = self._createMenuBg(self.screenSize)
+        self.menuBg = sharedMenuBackground(self.screenSize)
 
     def _s(self, val: int) -> int:
         return max(1, int(val * self.scale))
@@ -88,7 +97,7 @@ class OptionsScreen:
         w, h = self.screenSize
         cx = w // 2
 
-        labels = [self.labelFont.render(label, True, (240, 240, 245)) for label, _ in _bindingDefs]
+        labels = [renderText(self.labelFont, label, (240, 240, 245)) for label, _ in _bindingDefs]
         maxLabelW = max(l.get_width() for l in labels)
 
         rowH = self._s(60)
@@ -121,7 +130,7 @@ class OptionsScreen:
         soundHeaderH = self._s(55)
         soundPadBottom = self._s(15)
 
-        soundLabel = self.labelFont.render(optionsSound, True, (240, 240, 245))
+        soundLabel = renderText(self.labelFont, optionsSound, (240, 240, 245))
         toggleW = self._s(70)
         toggleGap = self._s(30)
         soundContentW = soundLabel.get_width() + toggleGap + toggleW
@@ -138,10 +147,25 @@ class OptionsScreen:
         toggleX = self._soundLabelX + soundLabel.get_width() + toggleGap
         self._soundToggleRect = pygame.Rect(toggleX, soundRowCY - toggleH // 2, toggleW, toggleH)
 
+        capLabel = renderText(self.labelFont, optionsFrameCap, (240, 240, 245))
+        capW = max(renderText(self.labelFont, _frameCapLabel(cap), (240, 240, 245)).get_width()
+                   for cap in _frameCaps) + self._s(30)
+        displayContentW = capLabel.get_width() + toggleGap + capW
+        self._displayPanelW = displayContentW + soundPadX * 2
+        self._displayPanelH = soundHeaderH + soundRowH + soundPadBottom
+        self._displayPanelX = cx - self._displayPanelW // 2
+        self._displayPanelY = self._soundPanelY + self._soundPanelH + soundGap
+
+        self._displayLabelX = self._displayPanelX + soundPadX
+        self._displayRowCY = self._displayPanelY + soundHeaderH + soundRowH // 2
+        capH = self._s(40)
+        capX = self._displayLabelX + capLabel.get_width() + toggleGap
+        self._frameCapRect = pygame.Rect(capX, self._displayRowCY - capH // 2, capW, capH)
+
     def _getActionButtonRects(self) -> tuple[pygame.Rect, pygame.Rect]:
         w, h = self.screenSize
         cx = w // 2
-        baseY = self._soundPanelY + self._soundPanelH + self._s(30)
+        baseY = self._displayPanelY + self._displayPanelH + self._s(30)
         btnW, btnH = self._s(220), self._s(55)
         gap = self._s(40)
 
@@ -201,7 +225,7 @@ class OptionsScreen:
         for i, (label, attr) in enumerate(_bindingDefs):
             rowCY = self._rowCentersY[i]
 
-            labelSurf = self.labelFont.render(label, True, (240, 240, 245))
+            labelSurf = renderText(self.labelFont, label, (240, 240, 245))
             labelRect = labelSurf.get_rect(midleft=(self._labelX, rowCY))
             surf.blit(labelSurf, labelRect)
 
@@ -233,12 +257,47 @@ class OptionsScreen:
         sectionY = self._soundPanelY + self._s(25)
         drawSectionHeader(surf, optionsSound, self.sectionFont, cx, sectionY)
 
-        labelSurf = self.labelFont.render(optionsSound, True, (240, 240, 245))
+        labelSurf = renderText(self.labelFont, optionsSound, (240, 240, 245))
         labelRect = labelSurf.get_rect(midleft=(self._soundLabelX, self._soundRowCY))
         surf.blit(labelSurf, labelRect)
 
         self._drawToggle(surf, self._soundToggleRect, settings.bSoundEnabled, self._soundHovered)
 
+    def _buildDisplayPanelSurf(self) -> None:
+        pw, ph = self._displayPanelW, self._displayPanelH
+        surf = pygame.Surface((pw, ph), pygame.SRCALPHA)
+        cr = self._s(12)
+        pygame.draw.rect(surf, (15, 17, 24, 200), (0, 0, pw, ph), border_radius=cr)
+        pygame.draw.rect(surf, (45, 48, 60), (0, 0, pw, ph), 1, border_radius=cr)
+        self._displayPanelSurf = surf
+
+    def _drawDisplayPanel(self, surf: Surface) -> None:
+        cx = self.screenSize[0] // 2
+
+        if self._displayPanelSurf is None:
+            self._buildDisplayPanelSurf()
+
+        assert self._displayPanelSurf is not None
+        surf.blit(self._displayPanelSurf, (self._displayPanelX, self._displayPanelY))
+
+        sectionY = self._displayPanelY + self._s(25)
+        drawSectionHeader(surf, optionsDisplay, self.sectionFont, cx, sectionY)
+
+        labelSurf = renderText(self.labelFont, optionsFrameCap, (240, 240, 245))
+        surf.blit(labelSurf, labelSurf.get_rect(midleft=(self._displayLabelX, self._displayRowCY)))
+
+        rect = self._frameCapRect
+        cr = self._s(8)
+        pygame.draw.rect(surf, (60, 62, 75) if self._frameCapHovered else (40, 42, 55), rect, border_radius=cr)
+        pygame.draw.rect(surf, (80, 82, 95), rect, 1, border_radius=cr)
+        valueSurf = renderText(self.labelFont, _frameCapLabel(settings.frameCap), (255, 215, 0))
+        surf.blit(valueSurf, valueSurf.get_rect(center=rect.center))
+
+    def _cycleFrameCap(self, step: int) -> None:
+        idx = _frameCaps.index(settings.frameCap) if settings.frameCap in _frameCaps else 0
+        settings.frameCap = _frameCaps[(idx + step) % len(_frameCaps)]
+        config.save()
+
     def _drawToggle(self, surf: Surface, rect: pygame.Rect, bOn: bool, bHovered: bool) -> None:
         cr = rect.height // 2
         bgColor = (40, 140, 50) if bOn else (60, 62, 75)
@@ -267,13 +326,13 @@ class OptionsScreen:
             surf.blit(highlight, (rect.x - pad, rect.y - pad))
 
         if bListening:
-            listenSurf = self.buttonFont.render(optionsPressKey, True, (255, 215, 0))
+            listenSurf = renderText(self.buttonFont, optionsPressKey, (255, 215, 0))
             listenRect = listenSurf.get_rect(center=rect.center)
             surf.blit(listenSurf, listenRect)
         elif icon:
             surf.blit(icon, rect)
         else:
-            textSurf = self.labelFont.render(fallbackText, True, (240, 240, 245))
+            textSurf = renderText(self.labelFont, fallbackText, (240, 240, 245))
             textRect = textSurf.get_rect(center=rect.center)
             surf.blit(textSurf, textRect)
 
@@ -281,8 +340,8 @@ class OptionsScreen:
         self.screenSize = newSize
         self.scale = min(newSize[0] / self.baseW, newSize[1] / self.baseH)
 
-        self.buttonFont = pygame.font.Font(None, self._s(28))
-        self.labelFont = pygame.font.Font(None, self._s(32))
+        self.buttonFont = getFont(self._s(28))
+        self.labelFont = getFont(self._s(32))
 
         for btn in [self.resetBtn, self.backBtn]:
             btn.setFont(self.buttonFont)
@@ -291,10 +350,11 @@ class OptionsScreen:
         self.menuBg.onResize(newSize)
         self.panelSurf = None
         self._soundPanelSurf = None
+        self._displayPanelSurf = None
         self._updateButtonPositions()
         self._loadKeyIcons()
-        self.titleFont = pygame.font.Font(None, self._s(120))
-        self.sectionFont = pygame.font.Font(None, self._s(48))
+        self.titleFont = getFont(self._s(120))
+        self.sectionFont = getFont(self._s(48))
 
     def handleEvent(self, event: Event, inputEvent: "InputEvent | None" = None) -> None:
         if self._listeningIdx >= 0:
@@ -310,10 +370,17 @@ class OptionsScreen:
             for i, rect in enumerate(self._iconRects):
                 self._hovered[i] = rect.collidepoint(event.pos)
             self._soundHovered = self._soundToggleRect.collidepoint(event.pos)
+            self._frameCapHovered = self._frameCapRect.collidepoint(event.pos)
+
+        if event.type == pygame.MOUSEBUTTONUP and event.button in (1, 3):
+            if self._frameCapRect.collidepoint(event.pos):
+                self._cycleFrameCap(1 if event.button == 1 else -1)
+                return
 
         if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
             if self._soundToggleRect.collidepoint(event.pos):
                 settings.bSoundEnabled = not settings.bSoundEnabled
+                audio.applyMute()
                 config.save()
                 return
             for i, rect in enumerate(self._iconRects):
@@ -339,5 +406,6 @@ class OptionsScreen:
         self._drawTitle(screen)
         self._drawControlsPanel(screen)
         self._drawSoundPanel(screen)
+        self._drawDisplayPanel(screen)
         self.resetBtn.draw(screen)
         self.backBtn.draw(screen)
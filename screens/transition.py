@@ -1,10 +1,13 @@
 from enum import Enum, auto
+from typing import Callable
 import math
 
 import pygame
 from pygame import Surface
 from pygame.math import Vector2
 
+from profiler import FrameProfiler
+
 # Transition using LERP (linear interpolation) to make some animations (like move to animations) when going to a ui from another
 # TODO: merge it into our ui lib
 
@@ -28,6 +31,10 @@ def _easeInOutSine(t: float) -> float:
     return 0.5 * (1.0 - math.cos(math.pi * t))
 
 
+# The two buffers are allocated by prepare() (Game calls it during warmup and after a resize), navigating between
+# screens never allocates
+# The outgoing frame is copied from what's already on screen and the incoming screen is rendered on the first
+# update of the transition (not in the frame that asked for the navigation), the slide only starts once it's ready
 class ScreenTransition:
     duration: float = 0.4
 
@@ -37,25 +44,27 @@ class ScreenTransition:
         self.elapsed: float = 0.0
         self.direction: SlideDir = SlideDir.LEFT
 
-        w, h = screenSize
-        self.fromSurf: Surface = Surface((w, h))
-        self.toSurf: Surface = Surface((w, h))
+        self.fromSurf: Surface = Surface((1, 1))
+        self.toSurf: Surface = Surface((1, 1))
         self.fromPos: Vector2 = Vector2(0, 0)
         self.toPos: Vector2 = Vector2(0, 0)
-        self._onComplete: type[None] | None = None
+        self._renderTo: Callable[[Surface], None] | None = None
+
+    def prepare(self) -> None:
+        if self.fromSurf.get_size() != self.screenSize:
+            self.fromSurf = Surface(self.screenSize)
+            self.toSurf = Surface(self.screenSize)
 
-    def start(self, fromSurf: Surface, toSurf: Surface, direction: SlideDir) -> None:
+    def start(self, lastFrame: Surface, renderTo: Callable[[Surface], None], direction: SlideDir) -> None:
         self.bActive = True
         self.elapsed = 0.0
         self.direction = direction
 
         w, h = self.screenSize
-        if self.fromSurf.get_size() != (w, h):
-            self.fromSurf = Surface((w, h))
-            self.toSurf = Surface((w, h))
-
-        self.fromSurf.blit(fromSurf, (0, 0))
-        self.toSurf.blit(toSurf, (0, 0))
+        with FrameProfiler().section("transition"):
+            self.prepare()
+            self.fromSurf.blit(lastFrame, (0, 0))
+        self._renderTo = renderTo
 
         self.fromPos = Vector2(0, 0)
         if direction == SlideDir.LEFT:
@@ -67,6 +76,13 @@ class ScreenTransition:
         if not self.bActive:
             return False
 
+        if self._renderTo is not None:
+            with FrameProfiler().section("transition"):
+                self.toSurf.fill((0, 0, 0))
+                self._renderTo(self.toSurf)
+            self._renderTo = None
+            return False
+
         self.elapsed += dt
         t = min(self.elapsed / self.duration, 1.0)
         eased = _easeOutCubic(t)
@@ -94,6 +110,8 @@ class ScreenTransition:
     def onResize(self, newSize: tuple[int, int]) -> None:
         self.screenSize = newSize
         self.bActive = False
+        self._renderTo = None
+        self.prepare()
 
 
 class FadeTransition:
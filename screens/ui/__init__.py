@@ -1,4 +1,6 @@
 from .primitives import _gradientRect, tablerIcon, drawTextWithShadow, glassPanel
+from .fonts import getFont, renderText
+from .surfaces import gradientPanel, roundedFill
 from .button import Button
 from .glow import drawGlowTitle, drawSectionHeader
 from .controls import ControlHint, buildControlsPanel
@@ -11,6 +13,8 @@ from .levelcard import buildLevelCard
 
 __all__ = [
     '_gradientRect', 'tablerIcon', 'drawTextWithShadow', 'glassPanel',
+    'getFont', 'renderText',
+    'gradientPanel', 'roundedFill',
     'Button',
     'drawGlowTitle', 'drawSectionHeader',
     'ControlHint', 'buildControlsPanel',
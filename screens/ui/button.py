@@ -5,7 +5,8 @@ from pygame import Surface, Rect
 from pygame.event import Event
 from pygame.font import Font
 
-from .primitives import _gradientRect
+from .fonts import renderText
+from .surfaces import gradientPanel, roundedFill
 
 _secTopN = (28, 30, 38)
 _secBotN = (18, 20, 26)
@@ -63,6 +64,9 @@ class Button:
         self._disabledSurf: Surface | None = None
         self._shadowSurf: Surface | None = None
         self._glowSurf: Surface | None = None
+        self._textSurf: Surface | None = None
+        self._textShadowSurf: Surface | None = None
+        self._disabledTextSurf: Surface | None = None
         self._dirty: bool = True
 
     def setText(self, text: str) -> None:
@@ -104,6 +108,7 @@ class Button:
             self.bPressed = False
         return False
 
+    # Backgrounds, shadow and glow come from the shared cache (same size buttons share them), the text is kept apart
     def _build(self) -> None:
         w, h = self.rect.size
         cr = max(1, _cornerR * min(w, h) // 65)
@@ -121,45 +126,29 @@ class Button:
 
         bgAlpha = 240 if self.variant == "primary" else 230
 
-        self._normalSurf = self._renderState(w, h, cr, topN, botN, bgAlpha, borderN)
-        self._hoverSurf = self._renderState(w, h, cr, topH, botH, bgAlpha, borderH)
-        self._pressedSurf = self._renderState(w, h, cr, topP, botP, bgAlpha, borderP, bPressed=True)
-        self._disabledSurf = self._renderState(w, h, cr, _disTopN, _disBotN, 200, _disBorder, textColor=_disText)
+        self._normalSurf = gradientPanel(w, h, topN, botN, bgAlpha, cr, border=borderN)
+        self._hoverSurf = gradientPanel(w, h, topH, botH, bgAlpha, cr, border=borderH)
+        self._pressedSurf = gradientPanel(w, h, topP, botP, bgAlpha, cr, border=borderP)
+        self._disabledSurf = gradientPanel(w, h, _disTopN, _disBotN, 200, cr, border=_disBorder)
 
-        sw, sh = w + 6, h + 6
-        self._shadowSurf = Surface((sw, sh), pygame.SRCALPHA)
-        pygame.draw.rect(self._shadowSurf, (0, 0, 0, _shadowAlpha), (0, _shadowOff, w + 6, h), border_radius=cr + 2)
+        self._textSurf = renderText(self.font, self.text, _textColor)
+        self._textShadowSurf = renderText(self.font, self.text, _textShadow)
+        self._disabledTextSurf = renderText(self.font, self.text, _disText)
+
+        self._shadowSurf = roundedFill(w + 6, h + 6, (0, 0, 0, _shadowAlpha), (0, _shadowOff, w + 6, h), cr + 2)
 
         gw, gh = w + 4, h + 4
-        self._glowSurf = Surface((gw, gh), pygame.SRCALPHA)
         glowColor = _secBorderH if self.variant == "secondary" else _priBorderH
-        pygame.draw.rect(self._glowSurf, (*glowColor, _glowAlpha), (0, 0, gw, gh), border_radius=cr + 2)
+        self._glowSurf = roundedFill(gw, gh, (*glowColor, _glowAlpha), (0, 0, gw, gh), cr + 2)
 
         self._dirty = False
 
-    def _renderState(
-        self, w: int, h: int, cr: int,
-        top: tuple[int, int, int], bot: tuple[int, int, int],
-        alpha: int, border: tuple[int, int, int],
-        bPressed: bool = False,
-        textColor: tuple[int, int, int] = _textColor,
-    ) -> Surface:
-        surf = Surface((w, h), pygame.SRCALPHA)
-        bg = _gradientRect(w, h, top, bot, alpha, cr)
-        surf.blit(bg, (0, 0))
-        pygame.draw.rect(surf, border, (0, 0, w, h), 1, border_radius=cr)
-
-        shadow = self.font.render(self.text, True, _textShadow)
-        main = self.font.render(self.text, True, textColor)
-        cx, cy = w // 2, h // 2
+    def _drawText(self, screen: Surface, textSurf: Surface, bPressed: bool = False) -> None:
+        assert self._textShadowSurf is not None
+        cx, cy = self.rect.center
         pressOff = 1 if bPressed else 0
-
-        sRect = shadow.get_rect(center=(cx + 1, cy + 1 + pressOff))
-        surf.blit(shadow, sRect)
-        mRect = main.get_rect(center=(cx, cy + pressOff))
-        surf.blit(main, mRect)
-
-        return surf
+        screen.blit(self._textShadowSurf, self._textShadowSurf.get_rect(center=(cx + 1, cy + 1 + pressOff)))
+        screen.blit(textSurf, textSurf.get_rect(center=(cx, cy + pressOff)))
 
     def draw(self, screen: Surface) -> None:
         if self._dirty or self._normalSurf is None:
@@ -173,9 +162,13 @@ class Button:
 
         screen.blit(self._shadowSurf, (self.rect.x - 3, self.rect.y - 1))
 
+        assert self._textSurf is not None
+
         if self.bDisabled:
             assert self._disabledSurf is not None
+            assert self._disabledTextSurf is not None
             screen.blit(self._disabledSurf, self.rect)
+            self._drawText(screen, self._disabledTextSurf)
             return
 
         bHighlight = self.bHovered or self.bFocused
@@ -188,3 +181,4 @@ class Button:
             screen.blit(self._hoverSurf, self.rect)
         else:
             screen.blit(self._normalSurf, self.rect)
+        self._drawText(screen, self._textSurf, self.bPressed)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+from pygame import Surface
+
+K = TypeVar("K", bound=Hashable)
+
+
+# Small LRU used by the UI lib to keep rendered surfaces around between frames / screens
+# The bound is on the number of entries, we also keep track of the bytes so we can show it in the profiler
+class SurfaceCache(Generic[K]):
+    def __init__(self, maxEntries: int) -> None:
+        self.maxEntries = maxEntries
+        self._entries: OrderedDict[K, Surface] = OrderedDict()
+        self.byteSize: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Surface | None:
+        surf = self._entries.get(key)
+        if surf is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return surf
+
+    def put(self, key: K, surf: Surface) -> Surface:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.byteSize -= _surfBytes(old)
+        self._entries[key] = surf
+        self.byteSize += _surfBytes(surf)
+        while len(self._entries) > self.maxEntries:
+            _, evicted = self._entries.popitem(last=False)
+            self.byteSize -= _surfBytes(evicted)
+        return surf
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.byteSize = 0
+
+
+def _surfBytes(surf: Surface) -> int:
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
@@ -7,6 +7,7 @@ from pygame import Surface
 from pygame.font import Font
 
 from screens.ui.primitives import glassPanel
+from screens.ui.fonts import renderText
 
 
 @dataclass
@@ -27,8 +28,8 @@ def buildControlsPanel(hints: list[ControlHint], font: Font, scale: float) -> Su
     textColor = (240, 240, 245)
     sepColor = (80, 82, 95)
 
-    labels = [font.render(h.label, True, textColor) for h in hints]
-    sep = font.render("|", True, sepColor)
+    labels = [renderText(font, h.label, textColor) for h in hints]
+    sep = renderText(font, "|", sepColor)
 
     totalW = 0
     for i, (hint, label) in enumerate(zip(hints, labels)):
@@ -37,7 +38,7 @@ def buildControlsPanel(hints: list[ControlHint], font: Font, scale: float) -> Su
         if hint.icon:
             totalW += iconSize
         else:
-            fb = font.render(hint.fallbackText, True, textColor)
+            fb = renderText(font, hint.fallbackText, textColor)
             totalW += fb.get_width()
         totalW += iconGap + label.get_width()
 
@@ -57,7 +58,7 @@ def buildControlsPanel(hints: list[ControlHint], font: Font, scale: float) -> Su
             bg.blit(hint.icon, (x, centerY - iconSize // 2))
             x += iconSize + iconGap
         else:
-            fb = font.render(hint.fallbackText, True, textColor)
+            fb = renderText(font, hint.fallbackText, textColor)
             bg.blit(fb, (x, centerY - fb.get_height() // 2))
             x += fb.get_width() + iconGap
 
@@ -13,6 +13,10 @@ class EcgMonitor:
     def __init__(self, scale: float) -> None:
         self.scale = scale
         self._startTick: int = 0
+        self._strip: Surface | None = None
+        self._stripYs: list[int] = []
+        self._stripKey: tuple[int, int, float, float, float] = (0, 0, 0.0, 0.0, 0.0)
+        self._cycleW: float = 1.0
 
     def _s(self, val: int) -> int:
         return max(1, int(val * self.scale))
@@ -22,6 +26,7 @@ class EcgMonitor:
 
     def onResize(self, scale: float) -> None:
         self.scale = scale
+        self._strip = None
 
     @staticmethod
     def _sample(t: float) -> float:
@@ -40,39 +45,50 @@ class EcgMonitor:
             return 0.2 * math.sin(math.pi * (t - 0.30) / 0.14)
         return 0.0
 
+    def _buildStrip(self, w: int, h: int) -> None:
+        # Inside a sweep every column maps to a fixed world time (elapsed - cursorFrac * sweep is the sweep start),
+        # so the trace only shifts by a phase once per sweep. We render one strip that is a full cycle wider than
+        # the monitor and each frame just blits the window matching the current phase, glow included
+        pad = self._s(5)
+        cycleW = w * self.cyclePeriod / self.sweepSpeed
+        stripW = w + int(math.ceil(cycleW)) + 1
+        midY = pad + h // 2
+        amplitude = h * 0.45
+
+        ys = [int(midY - self._sample(i / cycleW) * amplitude) for i in range(stripW)]
+        points = list(enumerate(ys))
+
+        strip = pygame.Surface((stripW, h + pad * 2), pygame.SRCALPHA)
+        pygame.draw.lines(strip, (200, 20, 20, 80), False, points, max(1, self._s(4)))
+        pygame.draw.aalines(strip, (255, 40, 40), False, points)
+
+        self._strip = strip
+        self._stripYs = ys
+        self._stripKey = (w, h, self.cyclePeriod, self.sweepSpeed, self.scale)
+        self._cycleW = cycleW
+
     def draw(self, screen: Surface, x: int, y: int, w: int, h: int) -> None:
-        elapsed = (pygame.time.get_ticks() - self._startTick) / 1000.0
-        cursorFrac = (elapsed % self.sweepSpeed) / self.sweepSpeed
+        if self._strip is None or self._stripKey != (w, h, self.cyclePeriod, self.sweepSpeed, self.scale):
+            self._buildStrip(w, h)
+        assert self._strip is not None
 
-        midY = y + h // 2
-        amplitude = h * 0.45
-        stepCount = max(2, w)
-
-        points: list[tuple[int, int]] = []
-        for i in range(stepCount):
-            frac = i / (stepCount - 1)
-            worldTime = elapsed - (cursorFrac - frac) * self.sweepSpeed
-            sample = self._sample(worldTime / self.cyclePeriod)
-            px = x + int(frac * w)
-            py = int(midY - sample * amplitude)
-            points.append((px, py))
-
-        gapStart = max(0, int(cursorFrac * stepCount))
-        gapEnd = min(stepCount, gapStart + max(1, stepCount // 12))
-
-        before = points[:gapStart]
-        after = points[gapEnd:]
-
-        for segment in (before, after):
-            if len(segment) >= 2:
-                glowSurf = pygame.Surface((w + self._s(10), h + self._s(10)), pygame.SRCALPHA)
-                ox, oy = x - self._s(5), y - self._s(5)
-                shifted = [(px - ox, py - oy) for px, py in segment]
-                pygame.draw.lines(glowSurf, (200, 20, 20, 80), False, shifted, max(1, self._s(4)))
-                screen.blit(glowSurf, (ox, oy))
-                pygame.draw.aalines(screen, (255, 40, 40), False, segment)
-
-        tipX = x + int(cursorFrac * w)
-        tipY = points[min(gapStart, stepCount - 1)][1]
+        elapsed = (pygame.time.get_ticks() - self._startTick) / 1000.0
+        sweepIdx, sweepTime = divmod(elapsed, self.sweepSpeed)
+        cursorFrac = sweepTime / self.sweepSpeed
+        phase = (sweepIdx * self.sweepSpeed / self.cyclePeriod) % 1.0
+        offset = int(phase * self._cycleW)
+
+        pad = self._s(5)
+        stripH = self._strip.get_height()
+        gapStart = max(0, int(cursorFrac * w))
+        gapEnd = min(w, gapStart + max(1, w // 12))
+
+        if gapStart > 0:
+            screen.blit(self._strip, (x, y - pad), (offset, 0, gapStart, stripH))
+        if gapEnd < w:
+            screen.blit(self._strip, (x + gapEnd, y - pad), (offset + gapEnd, 0, w - gapEnd, stripH))
+
+        tipX = x + gapStart
+        tipY = y - pad + self._stripYs[offset + min(gapStart, w - 1)]
         pygame.draw.circle(screen, (255, 100, 100), (tipX, tipY), self._s(4))
         pygame.draw.circle(screen, (255, 200, 200), (tipX, tipY), self._s(2))
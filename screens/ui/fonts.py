@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pygame
+from pygame import Surface
+from pygame.font import Font
+
+from .cache import SurfaceCache
+
+# Central place for fonts, before this every screen was creating its own Font objects in __init__ and again in
+# every onResize (and the HUD too), now they are interned by (face, size) so resizes / screen switches reuse them
+# Rendered strings are also cached, the surfaces returned by renderText are shared so never draw on them
+# (copy them first if you need to change them, like set_alpha)
+
+FontKey = tuple[str | None, int]
+TextKey = tuple[str | None, int, str, tuple[int, ...], bool]
+
+maxCachedTexts: int = 512
+
+_fonts: dict[FontKey, Font] = {}
+_fontKeys: dict[int, FontKey] = {}
+_texts: SurfaceCache[TextKey] = SurfaceCache(maxCachedTexts)
+
+
+def getFont(size: int, face: str | None = None) -> Font:
+    key = (face, max(1, size))
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(face, key[1])
+        _fonts[key] = font
+        _fontKeys[id(font)] = key
+    return font
+
+
+def renderText(font: Font, text: str, color: tuple[int, ...], bAntialias: bool = True) -> Surface:
+    fontKey = _fontKeys.get(id(font))
+    if fontKey is None:
+        # Font wasn't created through getFont, we can't key it so we just render it
+        return font.render(text, bAntialias, color)
+
+    key = (fontKey[0], fontKey[1], text, tuple(color), bAntialias)
+    surf = _texts.get(key)
+    if surf is None:
+        surf = _texts.put(key, font.render(text, bAntialias, color))
+    return surf
+
+
+def textCacheInfo() -> tuple[int, int, int]:
+    return len(_fonts), len(_texts), _texts.byteSize
+
+
+def clearTextCache() -> None:
+    _texts.clear()
@@ -4,6 +4,9 @@ import pygame
 from pygame import Surface
 from pygame.font import Font
 
+from quality import QualityGovernor
+from .fonts import renderText
+
 _dirs4 = [(-1, 0), (1, 0), (0, -1), (0, 1)]
 _diag4 = [(-1, -1), (1, -1), (-1, 1), (1, 1)]
 
@@ -24,11 +27,13 @@ def drawGlowTitle(
     pulse: float = 1.0,
     bDiagonal: bool = False,
 ) -> None:
-    rendered = font.render(text, True, mainColor)
+    rendered = renderText(font, text, mainColor)
 
-    for offset in range(glowSize, 0, -2):
+    # Copy because the cached surface is shared and we are changing its alpha for each ring
+    glow = renderText(font, text, glowColor).copy()
+    # Lower quality tiers skip rings, the alpha formula doesn't change so the glow just gets coarser
+    for offset in range(glowSize, 0, -QualityGovernor().tier.glowStep):
         alpha = int(peakAlpha * (1 - offset / glowSize) * pulse)
-        glow = font.render(text, True, glowColor)
         glow.set_alpha(alpha)
         for dx, dy in _dirs4:
             surf.blit(glow, _rect(rendered, cx + dx * offset, cy + dy * offset))
@@ -37,7 +42,7 @@ def drawGlowTitle(
             for dx, dy in _diag4:
                 surf.blit(glow, _rect(rendered, cx + dx * half, cy + dy * half))
 
-    shadow = font.render(text, True, shadowColor)
+    shadow = renderText(font, text, shadowColor)
     surf.blit(shadow, _rect(rendered, cx + shadowOffset, cy + shadowOffset))
     surf.blit(rendered, _rect(rendered, cx, cy))
 
@@ -48,9 +53,9 @@ def drawSectionHeader(
     color: tuple[int, int, int] = (255, 215, 0),
     glowAlpha: int = 40, glowDist: int = 2,
 ) -> None:
-    glow = font.render(text, True, color)
+    main = renderText(font, text, color)
+    glow = main.copy()
     glow.set_alpha(glowAlpha)
     for dx, dy in _dirs4:
         surf.blit(glow, _rect(glow, cx + dx * glowDist, cy + dy * glowDist))
-    main = font.render(text, True, color)
     surf.blit(main, _rect(main, cx, cy))
@@ -5,6 +5,7 @@ from pygame import Surface
 from pygame.font import Font
 
 from screens.ui.primitives import _gradientRect, tablerIcon
+from screens.ui.fonts import renderText
 
 _cardTopAvail = (30, 32, 42)
 _cardBotAvail = (18, 20, 28)
@@ -63,14 +64,14 @@ def buildLevelCard(
     y = _s(30)
 
     numText = str(levelId)
-    numSurf = numberFont.render(numText, True, textCol)
-    numShadow = numberFont.render(numText, True, (0, 0, 0))
+    numSurf = renderText(numberFont, numText, textCol)
+    numShadow = renderText(numberFont, numText, (0, 0, 0))
     surf.blit(numShadow, numShadow.get_rect(center=(cx + 2, y + 2)))
     surf.blit(numSurf, numSurf.get_rect(center=(cx, y)))
 
     y += _s(38)
-    nameSurf = nameFont.render(name, True, textCol)
-    nameShadow = nameFont.render(name, True, (0, 0, 0))
+    nameSurf = renderText(nameFont, name, textCol)
+    nameShadow = renderText(nameFont, name, (0, 0, 0))
     surf.blit(nameShadow, nameShadow.get_rect(center=(cx + 1, y + 1)))
     surf.blit(nameSurf, nameSurf.get_rect(center=(cx, y)))
 
@@ -86,7 +87,7 @@ def buildLevelCard(
 
     y += _s(30)
     targetCol = _dimText if state == "locked" else (180, 180, 190)
-    targetSurf = infoFont.render(targetLabel, True, targetCol)
+    targetSurf = renderText(infoFont, targetLabel, targetCol)
     surf.blit(targetSurf, targetSurf.get_rect(center=(cx, y)))
 
     return surf
@@ -1,49 +1,63 @@
 from __future__ import annotations
 
-import sys
+import json
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
 import pygame
 from pygame import Surface
 from pygame.font import Font
-from typing import Any
 
-_BROWSER: bool = sys.platform == "emscripten"
+from paths import assetsPath
+
+from .fonts import renderText
+from .surfaces import gradientPanel
+
 
-if _BROWSER:
-    from enum import Enum
+# Icons come from a pre-baked atlas (python -m tools.bake_icons), so neither Pillow nor pytablericons are needed
+# to run the game, the values are the keys in icons.json
+class OutlineIcon(Enum):
+    CHEVRON_LEFT = "OutlineIcon.CHEVRON_LEFT"
+    CHEVRON_RIGHT = "OutlineIcon.CHEVRON_RIGHT"
+    LOCK = "OutlineIcon.LOCK"
+    PLAYER_PLAY = "OutlineIcon.PLAYER_PLAY"
 
-    class OutlineIcon(Enum):
-        CHEVRON_LEFT = "chevron_left"
-        CHEVRON_RIGHT = "chevron_right"
-        LOCK = "lock"
-        PLAYER_PLAY = "player_play"
 
-    class FilledIcon(Enum):
-        HEART = "heart"
-        CIRCLE_CHECK = "circle_check"
+class FilledIcon(Enum):
+    HEART = "FilledIcon.HEART"
+    CIRCLE_CHECK = "FilledIcon.CIRCLE_CHECK"
 
-    _TablerIcons: Any = None
-else:
-    from pytablericons import TablerIcons as _TablerIcons, OutlineIcon, FilledIcon  # type: ignore[import-untyped,no-redef]
 
+iconsPath: Path = assetsPath / "icons"
+
+_atlas: Surface | None = None
+_atlasRects: dict[str, list[tuple[int, pygame.Rect]]] = {}
 _iconCache: dict[tuple[Any, ...], Surface] = {}
 
 
-def tablerIcon(icon: OutlineIcon | FilledIcon, size: int = 32, color: str = '#FFFFFF', strokeWidth: float = 2.0) -> Surface:
-    key = (icon, size, color, strokeWidth)
+def _loadAtlas() -> Surface:
+    global _atlas
+    if _atlas is None:
+        meta = json.loads((iconsPath / "icons.json").read_text())
+        for key, bySize in meta["icons"].items():
+            _atlasRects[key] = sorted((int(size), pygame.Rect(rect)) for size, rect in bySize.items())
+        _atlas = pygame.image.load(str(iconsPath / "icons.png")).convert_alpha()
+    return _atlas
+
+
+def tablerIcon(icon: OutlineIcon | FilledIcon, size: int = 32, color: str = '#FFFFFF') -> Surface:
+    key = (icon, size, color)
     if key in _iconCache:
         return _iconCache[key]
 
-    if _BROWSER:
-        surf = Surface((size, size), pygame.SRCALPHA)
-        r, g, b = _parseColor(color)
-        pygame.draw.circle(surf, (r, g, b), (size // 2, size // 2), size // 3)
-        _iconCache[key] = surf
-        return surf
-
-    pil = _TablerIcons.load(icon, size=size, color=color, stroke_width=strokeWidth)
-    surf = pygame.image.frombuffer(pil.tobytes(), pil.size, pil.mode)
-    if pil.mode == 'RGBA':
-        surf = surf.convert_alpha()
+    atlas = _loadAtlas()
+    baked = _atlasRects[icon.value]
+    # smallest baked size that is still >= the one asked, downscaling keeps the strokes clean
+    bakedSize, rect = next(((s, r) for s, r in baked if s >= size), baked[-1])
+    src = atlas.subsurface(rect)
+    surf = src.copy() if bakedSize == size else pygame.transform.smoothscale(src, (size, size))
+    surf.fill((*_parseColor(color), 255), special_flags=pygame.BLEND_RGBA_MULT)
     _iconCache[key] = surf
     return surf
 
@@ -55,32 +69,22 @@ def _parseColor(color: str) -> tuple[int, int, int]:
     return (255, 255, 255)
 
 
+# Returns a copy so callers can draw on it, the gradient itself comes from the shared cache (see surfaces.py)
 def _gradientRect(w: int, h: int, top: tuple[int, int, int], bot: tuple[int, int, int], alpha: int, cr: int) -> Surface:
-    surf = Surface((w, h), pygame.SRCALPHA)
-    if w < 1 or h < 1:
-        return surf
-    grad = Surface((1, 2), pygame.SRCALPHA)
-    grad.set_at((0, 0), (*top, alpha))
-    grad.set_at((0, 1), (*bot, alpha))
-    stretched = pygame.transform.smoothscale(grad, (w, h))
-    mask = Surface((w, h), pygame.SRCALPHA)
-    pygame.draw.rect(mask, (255, 255, 255, 255), (0, 0, w, h), border_radius=cr)
-    stretched.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-    surf.blit(stretched, (0, 0))
-    return surf
+    return gradientPanel(w, h, top, bot, alpha, cr).copy()
 
 
 def drawTextWithShadow(target: Surface, text: str, font: Font,
                        color: tuple[int, int, int], pos: tuple[int, int],
                        shadowOffset: int = 2) -> None:
-    shadow = font.render(text, True, (0, 0, 0))
-    surf = font.render(text, True, color)
+    shadow = renderText(font, text, (0, 0, 0))
+    surf = renderText(font, text, color)
     target.blit(shadow, (pos[0] + shadowOffset, pos[1] + shadowOffset))
     target.blit(surf, pos)
 
 
-def glassPanel(w: int, h: int, scale: float) -> Surface:
+# bShared skips the copy, only for callers that just blit the panel as is
+def glassPanel(w: int, h: int, scale: float, bShared: bool = False) -> Surface:
     cr = max(1, int(12 * scale))
-    panel = _gradientRect(w, h, (20, 22, 30), (12, 14, 20), 200, cr)
-    pygame.draw.rect(panel, (45, 48, 60), (0, 0, w, h), 1, border_radius=cr)
-    return panel
+    panel = gradientPanel(w, h, (20, 22, 30), (12, 14, 20), 200, cr, border=(45, 48, 60))
+    return panel if bShared else panel.copy()
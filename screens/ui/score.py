@@ -32,7 +32,7 @@ class ScoreDisplay:
 
     def draw(self, screen: Surface, x: int, y: int, score: int, dt: float, font: Font) -> None:
         if self._cachedBoxSurf is None:
-            self._cachedBoxSurf = glassPanel(self._s(260), self._s(56), self.scale)
+            self._cachedBoxSurf = glassPanel(self._s(260), self._s(56), self.scale, bShared=True)
 
         screen.blit(self._cachedBoxSurf, (x, y))
 
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pygame
+from pygame import Surface
+
+from .cache import SurfaceCache
+
+# Backgrounds shared by every widget (buttons, glass panels, cards...), keyed by size, colours, alpha and corner radius
+# Two buttons of the same size share the same surfaces, the text is drawn on top separately
+# Same rule as the text cache, never draw on what's returned here (copy it first)
+
+maxCachedShapes: int = 256
+
+_shapes: SurfaceCache[tuple[Any, ...]] = SurfaceCache(maxCachedShapes)
+
+
+def gradientPanel(w: int, h: int, top: tuple[int, int, int], bot: tuple[int, int, int], alpha: int, cr: int,
+                  border: tuple[int, int, int] | None = None, borderWidth: int = 1) -> Surface:
+    key = ("gradient", w, h, top, bot, alpha, cr, border, borderWidth)
+    surf = _shapes.get(key)
+    if surf is not None:
+        return surf
+
+    surf = Surface((max(0, w), max(0, h)), pygame.SRCALPHA)
+    if w >= 1 and h >= 1:
+        grad = Surface((1, 2), pygame.SRCALPHA)
+        grad.set_at((0, 0), (*top, alpha))
+        grad.set_at((0, 1), (*bot, alpha))
+        pygame.transform.smoothscale(grad, (w, h), surf)
+        mask = Surface((w, h), pygame.SRCALPHA)
+        pygame.draw.rect(mask, (255, 255, 255, 255), (0, 0, w, h), border_radius=cr)
+        surf.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        if border is not None:
+            pygame.draw.rect(surf, border, (0, 0, w, h), borderWidth, border_radius=cr)
+    return _shapes.put(key, surf)
+
+
+# Flat rounded rect inside a (w, h) transparent surface, used for shadows and glows
+def roundedFill(w: int, h: int, color: tuple[int, int, int, int], rect: tuple[int, int, int, int], cr: int) -> Surface:
+    key = ("fill", w, h, color, rect, cr)
+    surf = _shapes.get(key)
+    if surf is not None:
+        return surf
+
+    surf = Surface((w, h), pygame.SRCALPHA)
+    pygame.draw.rect(surf, color, rect, border_radius=cr)
+    return _shapes.put(key, surf)
+
+
+def uiCacheInfo() -> tuple[int, int]:
+    return len(_shapes), _shapes.byteSize
+
+
+def clearUiCache() -> None:
+    _shapes.clear()
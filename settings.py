@@ -11,11 +11,29 @@ height: Final[int] = 720
 minWidth: Final[int] = 640
 minHeight: Final[int] = 480
 
-# TODO: Add a option in UI so we change the fps limit
+# Frame rate limit, picked in the options and saved in config.json (see pacing.py)
+# VSYNC asks the renderer for vsync and keeps a limiter at the monitor refresh rate in case the driver ignores it
+class FrameCap(Enum):
+    FPS_60 = 60
+    FPS_120 = 120
+    FPS_144 = 144
+    UNCAPPED = 0
+    VSYNC = -1
+
+
 fps: Final[int] = 60
+frameCap: FrameCap = FrameCap.FPS_60
+
+# Menus never need more than menuFps, and after menuIdleAfterS without any input they drop to menuIdleFps
+menuFps: Final[int] = 60
+menuIdleFps: Final[int] = 30
+menuIdleAfterS: Final[float] = 3.0
 
 title: Final[str] = windowTitle
 
+# How long the window size must stay the same before we rebuild the screens
+resizeDebounceMs: Final[int] = 150
+
 displayFlags: Final[int] = pygame.RESIZABLE
 
 Color = tuple[int, int, int]
@@ -39,8 +57,6 @@ class GameState(Enum):
     QUIT = auto()
 
 
-obstacleSpawnEvent: Final[int] = pygame.USEREVENT + 1
-
 bSoundEnabled: bool = True
 
 levelCompleted: dict[int, bool] = {}
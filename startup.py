@@ -0,0 +1,89 @@
+import sys
+import time
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ModuleSpec
+from types import ModuleType
+from typing import Any, Final, Sequence
+
+# Startup budget, run with --startupReport
+# Records how long every module took to import (same numbers as python -X importtime) and the time until the first
+# frame is on screen, main.py imports this first so startTime is as close as possible to the process start
+
+startTime: Final[float] = time.perf_counter()
+
+# Time to first frame we want to stay under (desktop, warm disk cache)
+firstFrameBudgetMs: Final[float] = 1000.0
+reportTopImports: Final[int] = 15
+
+bEnabled: bool = False
+firstFrameMs: float = 0.0
+
+# (module, self ms, cumulative ms)
+_imports: list[tuple[str, float, float]] = []
+_childTimes: list[float] = []
+
+
+class _TimedLoader(Loader):
+    def __init__(self, loader: Loader) -> None:
+        self._loader = loader
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: ModuleSpec) -> ModuleType | None:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        _childTimes.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            total = time.perf_counter() - start
+            children = _childTimes.pop()
+            if _childTimes:
+                _childTimes[-1] += total
+            _imports.append((module.__name__, (total - children) * 1000.0, total * 1000.0))
+
+
+class _TimingFinder(MetaPathFinder):
+    def find_spec(self, fullname: str, path: Sequence[str] | None, target: ModuleType | None = None) -> ModuleSpec | None:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader)
+            return spec
+        return None
+
+
+def enable() -> None:
+    global bEnabled
+    if bEnabled:
+        return
+    bEnabled = True
+    sys.meta_path.insert(0, _TimingFinder())
+
+
+def markFirstFrame() -> None:
+    global firstFrameMs
+    if firstFrameMs:
+        return
+    firstFrameMs = (time.perf_counter() - startTime) * 1000.0
+    if bEnabled:
+        sys.meta_path[:] = [f for f in sys.meta_path if not isinstance(f, _TimingFinder)]
+        print(report())
+
+
+def report() -> str:
+    lines = ["import time: self [ms] | cumulative [ms] | module"]
+    top = sorted(_imports, key=lambda entry: entry[2], reverse=True)[:reportTopImports]
+    lines += [f"{selfMs:10.1f} | {totalMs:10.1f} | {name}" for name, selfMs, totalMs in top]
+    lines.append(f"{len(_imports)} modules imported, {sum(entry[1] for entry in _imports):.1f} ms total")
+
+    status = "OK" if firstFrameMs <= firstFrameBudgetMs else "OVER BUDGET"
+    lines.append(f"time to first frame: {firstFrameMs:.1f} ms (budget {firstFrameBudgetMs:.0f} ms) {status}")
+    return "\n".join(lines)
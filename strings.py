@@ -21,6 +21,10 @@ optionsJump: Final[str] = "SAUTER"
 optionsSlide: Final[str] = "GLISSER"
 optionsRestart: Final[str] = "RECOMMENCER"
 optionsSound: Final[str] = "SON"
+optionsDisplay: Final[str] = "AFFICHAGE"
+optionsFrameCap: Final[str] = "IMAGES/S"
+optionsUncapped: Final[str] = "ILLIMITE"
+optionsVsync: Final[str] = "VSYNC"
 optionsReset: Final[str] = "REINITIALISER"
 optionsBack: Final[str] = "RETOUR"
 optionsPressKey: Final[str] = "APPUYEZ..."
@@ -0,0 +1,280 @@
+import json
+import math
+import mmap
+import random
+import struct
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass
+from enum import IntEnum
+from pathlib import Path
+from typing import Final, Iterator
+
+from levels import LevelConfig
+from paths import assetsPath
+
+# Obstacle timelines: what to spawn and at which scroll distance, sorted by distance
+# The spawner streams the entries in as the level scrolls, instead of rolling dice on a timer
+# A level can ship its own timeline (assets/levels/level<id>.timeline, authored or pre-generated by
+# python -m tools.build_assets), otherwise it's assembled while the level is played from the level's chunk table
+# (assets/levels/chunks<id>.json, short obstacle sequences checked against the player physics by tools/build_chunks)
+# and as a last resort rolled from the LevelConfig with the same odds the spawner used to have
+#
+# File: header (magic, version, record size, count) then the records, 8 bytes each:
+# distance (uint32, scrolled px), kind, height tier, variant, extra (uint8 each)
+
+levelsPath: Final[Path] = assetsPath / "levels"
+timelineExt: Final[str] = ".timeline"
+
+magic: Final[bytes] = b"BSDT"
+formatVersion: Final[int] = 1
+header: Final[struct.Struct] = struct.Struct("<4sHHI")
+record: Final[struct.Struct] = struct.Struct("<IBBBB")
+
+# Above this the file is memory-mapped, we only ever touch the records around the cursor
+mmapAbove: Final[int] = 64 * 1024
+
+_BROWSER: Final[bool] = sys.platform == "emscripten"
+
+
+class Kind(IntEnum):
+    BODY = 0
+    CAGE = 1
+    SHAPE = 2
+
+
+@dataclass(frozen=True, slots=True)
+class TimelineEntry:
+    distance: int
+    kind: Kind
+    # 0 = on the ground, every tier is 100 px (at 1080p) higher
+    tier: int = 0
+    # texture for the bodies, shape for the geometric obstacles
+    variant: int = 0
+    # color of the geometric obstacles
+    extra: int = 0
+
+
+def pack(entries: list[TimelineEntry]) -> bytes:
+    ordered = sorted(entries, key=lambda e: e.distance)
+    out = bytearray(header.pack(magic, formatVersion, record.size, len(ordered)))
+    for e in ordered:
+        out += record.pack(e.distance, e.kind, e.tier, e.variant, e.extra)
+    return bytes(out)
+
+
+class Timeline:
+    batchSize: Final[int] = 32
+
+    def __init__(self, data: bytes | bytearray | mmap.mmap, offset: int = 0, count: int = 0,
+                 source: Iterator[TimelineEntry] | None = None) -> None:
+        self._data = data
+        self._offset = offset
+        self.count = count
+        # Generated timelines grow while the level is played
+        self._source = source
+
+    def distanceAt(self, index: int) -> int:
+        distance: int = record.unpack_from(self._data, self._offset + index * record.size)[0]
+        return distance
+
+    def entryAt(self, index: int) -> TimelineEntry:
+        d, kind, tier, variant, extra = record.unpack_from(self._data, self._offset + index * record.size)
+        return TimelineEntry(d, Kind(kind), tier, variant, extra)
+
+    # False once there is nothing left (end of an authored level)
+    def ensure(self, index: int) -> bool:
+        if index < self.count:
+            return True
+        if self._source is None or not isinstance(self._data, bytearray):
+            return False
+        while index >= self.count:
+            for _ in range(self.batchSize):
+                e = next(self._source)
+                self._data += record.pack(e.distance, e.kind, e.tier, e.variant, e.extra)
+                self.count += 1
+        return True
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+
+def load(path: Path) -> Timeline | None:
+    try:
+        with open(path, "rb") as f:
+            size = path.stat().st_size
+            data: bytes | mmap.mmap
+            if size > mmapAbove and not _BROWSER:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = f.read()
+    except (OSError, ValueError):
+        return None
+
+    try:
+        tag, version, recordSize, count = header.unpack_from(data, 0)
+    except struct.error:
+        return None
+    if tag != magic or version != formatVersion or recordSize != record.size \
+            or header.size + count * record.size > len(data):
+        return None
+    return Timeline(data, header.size, count)
+
+
+def pathFor(levelId: int) -> Path:
+    return levelsPath / f"level{levelId}{timelineExt}"
+
+
+# The level's own file if it has one, then its chunks, a fresh random one otherwise
+def forLevel(cfg: LevelConfig, rng: random.Random | None = None) -> Timeline:
+    path = pathFor(cfg.levelId)
+    if path.exists():
+        loaded = load(path)
+        if loaded is not None:
+            return loaded
+    rng = rng or random.Random()
+    table = loadChunks(cfg.levelId)
+    if table is not None:
+        return Timeline(bytearray(), source=assemble(cfg, table, rng))
+    return Timeline(bytearray(), source=generate(cfg, rng))
+
+
+# ---- random generation, the odds of the old timer based spawner
+
+
+tileSize: Final[int] = 64
+# A cage could show up on every ceiling tile, with at least minTilesBetweenCages tiles between two
+cageChance: Final[float] = 0.06
+minTilesBetweenCages: Final[int] = 10
+# Bodies and cages never come closer than that (in seconds at the speed of the moment)
+minGapBetweenTypes: Final[float] = 2.0
+# Kept in sync with the spawner (shapes / colors of the geometric obstacles)
+shapeCount: Final[int] = 3
+colorCount: Final[int] = 4
+tierCount: Final[int] = 4
+
+
+# Speed over time when the level speeds up (level 2), the obstacles came every x seconds, not every x px
+class _Pace:
+    def __init__(self, cfg: LevelConfig) -> None:
+        self.start = cfg.scrollSpeed
+        self.growth = cfg.speedGrowth if cfg.bSpeedGrowth else 0.0
+        self.maxSpeed = max(cfg.maxSpeed, cfg.scrollSpeed) if self.growth > 0 else cfg.scrollSpeed
+        self.rampS = (self.maxSpeed - self.start) / self.growth if self.growth > 0 else 0.0
+
+    def speedAt(self, t: float) -> float:
+        return min(self.start + self.growth * t, self.maxSpeed)
+
+    def distanceAt(self, t: float) -> float:
+        if t <= self.rampS:
+            return self.start * t + self.growth * t * t / 2
+        return self.distanceAt(self.rampS) + self.maxSpeed * (t - self.rampS)
+
+    def timeAt(self, distance: float) -> float:
+        rampD = self.distanceAt(self.rampS)
+        if distance <= rampD and self.growth > 0:
+            return (math.sqrt(self.start * self.start + 2 * self.growth * distance) - self.start) / self.growth
+        return self.rampS + (distance - rampD) / self.maxSpeed
+
+
+def generate(cfg: LevelConfig, rng: random.Random) -> Iterator[TimelineEntry]:
+    pace = _Pace(cfg)
+    t = rng.uniform(cfg.obstacleMinDelay, cfg.obstacleMaxDelay)
+    bodyDist = pace.distanceAt(t)
+    lastBody = lastCage = -1e9
+    tile = 0
+    tilesSinceCage = minTilesBetweenCages
+
+    while True:
+        # Next cage candidate (one per ceiling tile), only if it comes before the next body
+        if cfg.bFallingCages and (tile + 1) * tileSize < bodyDist:
+            tile += 1
+            d = tile * tileSize
+            if tilesSinceCage >= minTilesBetweenCages and rng.random() < cageChance:
+                tilesSinceCage = 0
+                if d - lastBody >= minGapBetweenTypes * pace.speedAt(t):
+                    lastCage = d
+                    yield TimelineEntry(int(d), Kind.CAGE)
+            else:
+                tilesSinceCage += 1
+            continue
+
+        if bodyDist - lastCage >= minGapBetweenTypes * pace.speedAt(t):
+            lastBody = bodyDist
+            if cfg.bGeometricObstacles:
+                yield TimelineEntry(int(bodyDist), Kind.SHAPE, rng.randrange(tierCount),
+                                    rng.randrange(shapeCount), rng.randrange(colorCount))
+            else:
+                yield TimelineEntry(int(bodyDist), Kind.BODY, 0, rng.randrange(256))
+        t += rng.uniform(cfg.obstacleMinDelay, cfg.obstacleMaxDelay)
+        bodyDist = pace.distanceAt(t)
+
+
+# ---- chunks, built offline by python -m tools.build_chunks
+
+
+chunksVersion: Final[int] = 1
+
+
+@dataclass(frozen=True, slots=True)
+class Chunk:
+    # distance from the start of the chunk, the next chunk starts at length
+    entries: tuple[TimelineEntry, ...]
+    length: int
+
+
+# The chunks that passed the checks, per speed range (speeds[i] .. speeds[i + 1], one range when the speed is fixed)
+# with their cumulative weights, so picking one is a bisect
+@dataclass(frozen=True, slots=True)
+class ChunkTable:
+    chunks: list[Chunk]
+    speeds: list[float]
+    buckets: list[tuple[list[int], list[float]]]
+
+    def pick(self, speed: float, rng: random.Random) -> Chunk:
+        b = min(max(bisect_right(self.speeds, speed) - 1, 0), len(self.buckets) - 1)
+        ids, weights = self.buckets[b]
+        return self.chunks[ids[bisect_right(weights, rng.random() * weights[-1])]]
+
+
+def chunksPathFor(levelId: int) -> Path:
+    return levelsPath / f"chunks{levelId}.json"
+
+
+def loadChunks(levelId: int) -> ChunkTable | None:
+    try:
+        with open(chunksPathFor(levelId)) as f:
+            data = json.load(f)
+        if data.get("version") != chunksVersion:
+            return None
+        chunks = [Chunk(tuple(TimelineEntry(int(d), Kind(k), int(tier), int(variant))
+                              for d, k, tier, variant in c["entries"]), int(c["length"]))
+                  for c in data["chunks"]]
+        buckets = [(list(b["chunks"]), [float(w) for w in b["weights"]]) for b in data["buckets"]]
+        speeds = [float(s) for s in data["speeds"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    # Every speed needs something to pick from
+    if not buckets or any(not ids or len(ids) != len(w) or w[-1] <= 0 for ids, w in buckets):
+        return None
+    if any(i < 0 or i >= len(chunks) for ids, _ in buckets for i in ids):
+        return None
+    return ChunkTable(chunks, speeds, buckets)
+
+
+# Chunks back to back, picked for the speed the level has when they start. Only the hitbox matters in a chunk, the
+# body textures and the shape colors are rolled here
+def assemble(cfg: LevelConfig, table: ChunkTable, rng: random.Random) -> Iterator[TimelineEntry]:
+    pace = _Pace(cfg)
+    start = 0
+    while True:
+        chunk = table.pick(pace.speedAt(pace.timeAt(start)), rng)
+        for e in chunk.entries:
+            if e.kind == Kind.SHAPE:
+                yield TimelineEntry(start + e.distance, e.kind, e.tier, e.variant, rng.randrange(colorCount))
+            elif e.kind == Kind.BODY:
+                yield TimelineEntry(start + e.distance, e.kind, 0, rng.randrange(256))
+            else:
+                yield TimelineEntry(start + e.distance, e.kind)
+        start += chunk.length
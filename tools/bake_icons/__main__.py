@@ -0,0 +1,64 @@
+# Rasterizes the tabler icons used by the game into one atlas (assets/icons/icons.png + icons.json)
+# Only this tool needs Pillow / pytablericons, the game just loads the png (see screens/ui/primitives.py)
+# Icons are baked in white at a few sizes, the game picks the closest bigger one, scales and tints it
+# Run it again after adding an icon to the enums in primitives.py: python -m tools.bake_icons
+
+from pathlib import Path
+import json
+
+import pygame
+from pytablericons import TablerIcons, OutlineIcon, FilledIcon  # type: ignore[import-untyped]
+
+root: Path = Path(__file__).parent.parent.parent
+outDir: Path = root / "assets" / "icons"
+
+bakeSizes: list[int] = [32, 64, 128]
+strokeWidth: float = 2.0
+
+# Keep in sync with the enums in screens/ui/primitives.py
+icons: list[OutlineIcon | FilledIcon] = [
+    OutlineIcon.CHEVRON_LEFT,
+    OutlineIcon.CHEVRON_RIGHT,
+    OutlineIcon.LOCK,
+    OutlineIcon.PLAYER_PLAY,
+    FilledIcon.HEART,
+    FilledIcon.CIRCLE_CHECK,
+]
+
+
+def iconKey(icon: OutlineIcon | FilledIcon) -> str:
+    return f"{type(icon).__name__}.{icon.name}"
+
+
+def rasterize(icon: OutlineIcon | FilledIcon, size: int) -> pygame.Surface:
+    pil = TablerIcons.load(icon, size=size, color='#FFFFFF', stroke_width=strokeWidth)
+    return pygame.image.frombuffer(pil.tobytes(), pil.size, pil.mode).copy()
+
+
+# One row per size, icons next to each other
+def main() -> None:
+    pygame.init()
+
+    atlasW = len(icons) * max(bakeSizes)
+    atlasH = sum(bakeSizes)
+    atlas = pygame.Surface((atlasW, atlasH), pygame.SRCALPHA)
+    rects: dict[str, dict[str, list[int]]] = {iconKey(icon): {} for icon in icons}
+
+    y = 0
+    for size in bakeSizes:
+        for i, icon in enumerate(icons):
+            x = i * size
+            atlas.blit(rasterize(icon, size), (x, y))
+            rects[iconKey(icon)][str(size)] = [x, y, size, size]
+        y += size
+
+    outDir.mkdir(parents=True, exist_ok=True)
+    pygame.image.save(atlas, str(outDir / "icons.png"))
+    (outDir / "icons.json").write_text(json.dumps({"sizes": bakeSizes, "icons": rects}, indent=2) + "\n")
+    print(f"Baked {len(icons)} icons at {bakeSizes} into {outDir}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+# One pipeline for everything that is generated under assets/: python -m tools.build_assets
+# Every stage is split in units (a source gif, an animation folder, the background...), the sha1 of their sources go
+# in assets/build_manifest.json and a unit only runs again when one of its sources changed, the stage version was
+# bumped or an output is missing. The jobs go in a process pool, so the big stages use all the cores
+# --force rebuilds everything, stage names only run those: python -m tools.build_assets obstacles icons
+#
+# Stages, in order (a stage sees what the previous ones wrote):
+# - tiles:      ground / ceiling tile atlases cropped from screens/background.png (tools/extract_tiles)
+# - gifs:       raw GIFs dropped in assets_raw/ (same layout as assets/) get their black background removed
+#               (tools/remove_gif_background) and land in assets/
+# - animations: frames.json next to every animation folder (delay, size and alpha bbox of every frame)
+# - obstacles:  obstacle textures cropped like Obstacle._cropToContent and packed in atlas.png + atlas.json,
+#               the game loads that instead of cropping every texture at load
+# - icons:      the UI icons atlas (tools/bake_icons), skipped when pytablericons isn't installed
+# - levels:     assets/levels/level<id>.json compiled into the binary timeline the spawner streams (timeline.py),
+#               either authored {"entries": [{"distance": 1200, "kind": "shape", "tier": 1, ...}]} or
+#               pre-generated from the level's odds {"generate": {"seed": 1, "length": 500000}} (length in px)
+# - chunks:     assets/levels/chunks<id>.json, the obstacle chunks checked against the player physics that the levels
+#               without a timeline file are assembled from (tools/build_chunks), rebuilt when the physics change
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+
+import pygame
+
+root: Path = Path(__file__).parent.parent.parent
+assetsDir: Path = root / "assets"
+rawDir: Path = root / "assets_raw"
+manifestPath: Path = assetsDir / "build_manifest.json"
+
+manifestVersion: int = 1
+framePattern = re.compile(r"frame_(\d+)_delay-([\d.]+)s\.gif")
+obstacleDirs: list[Path] = [assetsDir / "lanes"]
+atlasPadding: int = 1
+atlasMaxSize: int = 4096
+
+
+@dataclass
+class Unit:
+    key: str
+    sources: list[Path]
+    outputs: list[Path]
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    # bump it when the stage code changes, every unit is rebuilt
+    version: int
+    units: Callable[[], list[Unit]]
+    build: Callable[[Executor, list[Unit]], None]
+
+
+def rel(path: Path) -> str:
+    return path.relative_to(root).as_posix()
+
+
+def fileHash(path: Path) -> str:
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def unitDigest(stage: Stage, unit: Unit) -> str:
+    h = hashlib.sha1(f"{stage.name}:{stage.version}".encode())
+    for src in sorted(unit.sources):
+        h.update(f"{rel(src)}={fileHash(src)}\n".encode())
+    return h.hexdigest()
+
+
+# ---- tiles
+
+
+def tilesUnits() -> list[Unit]:
+    from tools.extract_tiles.__main__ import atlasName, bgPath, tilesDir
+    tool = root / "tools" / "extract_tiles" / "__main__.py"
+    outputs = [tilesDir / layer / f"{atlasName}.{ext}" for layer in ("ground", "ceiling") for ext in ("png", "json")]
+    return [Unit("background", [bgPath, tool], outputs)]
+
+
+def _tilesJob() -> None:
+    from tools.extract_tiles.__main__ import bgPath, extractGround, extractCeiling
+    # No window in the workers, the tiles are saved as they are loaded
+    bg = pygame.image.load(str(bgPath))
+    extractGround(bg)
+    extractCeiling(bg)
+
+
+def buildTiles(pool: Executor, units: list[Unit]) -> None:
+    pool.submit(_tilesJob).result()
+
+
+# ---- gifs
+
+
+def gifsUnits() -> list[Unit]:
+    return [Unit(rel(src), [src], [assetsDir / src.relative_to(rawDir)]) for src in sorted(rawDir.rglob("*.gif"))]
+
+
+def _gifJob(src: Path, out: Path) -> int:
+    from tools.remove_gif_background.main import blackTh, processFile
+    out.parent.mkdir(parents=True, exist_ok=True)
+    return len(processFile(src, out, blackTh))
+
+
+def buildGifs(pool: Executor, units: list[Unit]) -> None:
+    futures = [pool.submit(_gifJob, u.sources[0], u.outputs[0]) for u in units]
+    frames = sum(f.result() for f in futures)
+    print(f"gifs: {len(units)} files, {frames} frames")
+
+
+# ---- animations
+
+
+def _animationDirs() -> list[Path]:
+    dirs = {p.parent for p in assetsDir.rglob("*.gif") if framePattern.match(p.name)}
+    return sorted(dirs)
+
+
+def animationsUnits() -> list[Unit]:
+    from entities.animation import framesMetaName
+    return [Unit(rel(d), sorted(d.glob("*.gif")), [d / framesMetaName]) for d in _animationDirs()]
+
+
+def _animationJob(path: Path) -> int:
+    from entities.animation import framesMetaName
+    frames: list[dict[str, Any]] = []
+    for file in sorted(path.glob("*.gif")):
+        match = framePattern.match(file.name)
+        surf = pygame.image.load(str(file))
+        bbox = surf.get_bounding_rect()
+        frames.append({
+            "file": file.name,
+            "delay": float(match.group(2)) if match else 0.1,
+            "size": list(surf.get_size()),
+            "bbox": [bbox.x, bbox.y, bbox.width, bbox.height],
+        })
+    (path / framesMetaName).write_text(json.dumps({"frames": frames}, indent=1) + "\n")
+    return len(frames)
+
+
+def buildAnimations(pool: Executor, units: list[Unit]) -> None:
+    futures = [pool.submit(_animationJob, root / u.key) for u in units]
+    for u, f in zip(units, futures):
+        print(f"animations: {u.key} ({f.result()} frames)")
+
+
+# ---- obstacles
+
+
+def obstaclesUnits() -> list[Unit]:
+    from entities.obstacle.lane import atlasName
+    units: list[Unit] = []
+    for d in obstacleDirs:
+        sources = [p for p in sorted(d.glob("*.png")) if p.stem != atlasName]
+        if sources:
+            units.append(Unit(rel(d), sources, [d / f"{atlasName}.png", d / f"{atlasName}.json"]))
+    return units
+
+
+def _rectList(r: pygame.Rect) -> list[int]:
+    return [r.x, r.y, r.width, r.height]
+
+
+# Cropped texture + metadata, the pixels come back as RGBA bytes
+def _obstacleJob(path: Path) -> dict[str, Any]:
+    from entities.obstacle.lane import contentRect
+    surf = pygame.image.load(str(path))
+    crop = contentRect(surf) or surf.get_rect()
+    cropped = pygame.Surface(crop.size, pygame.SRCALPHA)
+    cropped.blit(surf, (0, 0), crop)
+    return {
+        "file": path.name,
+        "size": list(surf.get_size()),
+        "crop": _rectList(crop),
+        "pixels": pygame.image.tobytes(cropped, "RGBA"),
+    }
+
+
+# Shelves, tallest first
+def _pack(sizes: list[tuple[int, int]]) -> tuple[list[tuple[int, int]], tuple[int, int]]:
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    width = max(max(w for w, _ in sizes), min(atlasMaxSize, sum(w + atlasPadding for w, _ in sizes)))
+    places: list[tuple[int, int]] = [(0, 0)] * len(sizes)
+    x = y = shelfH = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > width:
+            x, y, shelfH = 0, y + shelfH + atlasPadding, 0
+        places[i] = (x, y)
+        x += w + atlasPadding
+        shelfH = max(shelfH, h)
+    return places, (width, y + shelfH)
+
+
+def buildObstacles(pool: Executor, units: list[Unit]) -> None:
+    from entities.obstacle.lane import atlasName
+    for u in units:
+        textures = list(pool.map(_obstacleJob, u.sources))
+        sizes = [(t["crop"][2], t["crop"][3]) for t in textures]
+        places, size = _pack(sizes)
+        if max(size) > atlasMaxSize:
+            raise ValueError(f"{u.key}: the cropped textures don't fit in a {atlasMaxSize} atlas ({size})")
+
+        atlas = pygame.Surface(size, pygame.SRCALPHA)
+        for t, (x, y), (w, h) in zip(textures, places, sizes):
+            atlas.blit(pygame.image.frombytes(t.pop("pixels"), (w, h), "RGBA"), (x, y))
+            t["rect"] = [x, y, w, h]
+
+        out = root / u.key
+        pygame.image.save(atlas, str(out / f"{atlasName}.png"))
+        (out / f"{atlasName}.json").write_text(json.dumps({"textures": textures}, indent=1) + "\n")
+        print(f"obstacles: {u.key} ({len(textures)} textures, atlas {size[0]}x{size[1]})")
+
+
+# ---- icons
+
+
+def iconsUnits() -> list[Unit]:
+    tool = root / "tools" / "bake_icons" / "__main__.py"
+    return [Unit("icons", [tool], [assetsDir / "icons" / "icons.png", assetsDir / "icons" / "icons.json"])]
+
+
+def _iconsJob() -> bool:
+    try:
+        from tools.bake_icons.__main__ import main as bakeIcons
+    except ImportError:
+        return False
+    bakeIcons()
+    return True
+
+
+def buildIcons(pool: Executor, units: list[Unit]) -> None:
+    if not pool.submit(_iconsJob).result():
+        raise RuntimeError("pytablericons is not installed (pip install .[tools])")
+
+
+# ---- levels
+
+
+def levelsUnits() -> list[Unit]:
+    from timeline import levelsPath, timelineExt
+    return [Unit(rel(src), [src], [src.with_suffix(timelineExt)]) for src in sorted(levelsPath.glob("level*.json"))]
+
+
+def _levelJob(src: Path) -> int:
+    import itertools
+    import random
+    from levels import levelConfigs
+    from timeline import Kind, TimelineEntry, generate, pack, timelineExt
+
+    spec = json.loads(src.read_text())
+    entries: list[TimelineEntry] = []
+    for e in spec.get("entries", []):
+        entries.append(TimelineEntry(int(e["distance"]), Kind[e["kind"].upper()], int(e.get("tier", 0)),
+                                     int(e.get("variant", 0)), int(e.get("extra", 0))))
+    if "generate" in spec:
+        levelId = int(src.stem.removeprefix("level"))
+        gen = generate(levelConfigs[levelId], random.Random(spec["generate"].get("seed", 0)))
+        length = int(spec["generate"]["length"])
+        entries += itertools.takewhile(lambda e: e.distance <= length, gen)
+
+    src.with_suffix(timelineExt).write_bytes(pack(entries))
+    return len(entries)
+
+
+def buildLevels(pool: Executor, units: list[Unit]) -> None:
+    futures = [pool.submit(_levelJob, u.sources[0]) for u in units]
+    for u, f in zip(units, futures):
+        print(f"levels: {u.key} ({f.result()} entries)")
+
+
+# ---- chunks
+
+
+# Everything the solver reads the physics / hitboxes from
+chunkSources: list[str] = [
+    "levels.py", "settings.py", "pacing.py", "timeline.py", "entities/player.py", "entities/obstacle/lane.py",
+    "entities/obstacle/geometric.py", "entities/obstacle/cage.py", "screens/game/spawner.py",
+    "screens/game/collision.py", "screens/game/screen.py", "tools/build_chunks/__main__.py",
+]
+
+
+def chunksUnits() -> list[Unit]:
+    from levels import levelConfigs
+    from timeline import chunksPathFor
+    sources = [root / p for p in chunkSources]
+    return [Unit(f"level{levelId}", sources, [chunksPathFor(levelId)]) for levelId in sorted(levelConfigs)]
+
+
+def _chunksJob(levelId: int) -> list[str]:
+    from tools.build_chunks.__main__ import buildLevel
+    return buildLevel(levelId)
+
+
+def buildChunks(pool: Executor, units: list[Unit]) -> None:
+    futures = [pool.submit(_chunksJob, int(u.key.removeprefix("level"))) for u in units]
+    for f in futures:
+        for line in f.result():
+            print(f"chunks: {line}")
+
+
+stages: list[Stage] = [
+    Stage("tiles", 2, tilesUnits, buildTiles),
+    Stage("gifs", 1, gifsUnits, buildGifs),
+    Stage("animations", 1, animationsUnits, buildAnimations),
+    Stage("obstacles", 2, obstaclesUnits, buildObstacles),
+    Stage("icons", 1, iconsUnits, buildIcons),
+    Stage("levels", 1, levelsUnits, buildLevels),
+    Stage("chunks", 1, chunksUnits, buildChunks),
+]
+
+
+def loadManifest() -> dict[str, dict[str, str]]:
+    try:
+        data = json.loads(manifestPath.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != manifestVersion:
+        return {}
+    stagesData = data.get("stages", {})
+    return stagesData if isinstance(stagesData, dict) else {}
+
+
+def saveManifest(manifest: dict[str, dict[str, str]]) -> None:
+    data = {"version": manifestVersion, "stages": manifest}
+    manifestPath.write_text(json.dumps(data, indent=1, sort_keys=True) + "\n")
+
+
+def runStage(stage: Stage, pool: Executor, manifest: dict[str, dict[str, str]], bForce: bool) -> None:
+    known = manifest.get(stage.name, {})
+    units = stage.units()
+    digests = {u.key: unitDigest(stage, u) for u in units}
+    dirty = [u for u in units
+             if bForce or known.get(u.key) != digests[u.key] or not all(p.exists() for p in u.outputs)]
+
+    start = time.perf_counter()
+    if dirty:
+        stage.build(pool, dirty)
+    # Units that are gone are dropped from the manifest too
+    manifest[stage.name] = {u.key: digests[u.key] for u in units}
+    print(f"[{stage.name}] {len(dirty)}/{len(units)} rebuilt in {time.perf_counter() - start:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Builds the generated assets, only what changed")
+    parser.add_argument("stages", nargs="*", help=", ".join(s.name for s in stages))
+    parser.add_argument("--force", action="store_true")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    unknown = set(args.stages) - {s.name for s in stages}
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+
+    manifest = loadManifest()
+    selected = [s for s in stages if not args.stages or s.name in args.stages]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for stage in selected:
+            try:
+                runStage(stage, pool, manifest, args.force)
+            except (RuntimeError, ValueError, KeyError, OSError, pygame.error) as e:
+                print(f"[{stage.name}] failed: {e}")
+            # Saved after every stage, an error later doesn't throw away what was already built
+            saveManifest(manifest)
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
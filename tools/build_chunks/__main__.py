@@ -0,0 +1,484 @@
+# Builds the obstacle chunks the level timelines are assembled from (timeline.ChunkTable), one table per level in
+# assets/levels/chunks<id>.json: python -m tools.build_chunks [level ids] [--candidates N] [--seed S]
+# (also the "chunks" stage of tools/build_assets, it runs again when the physics / hitbox code changes)
+#
+# The old spawner rolled every obstacle on its own, so it could put a body right where you land, or a row of shapes
+# too high to matter. Here the level's random timeline (timeline.generate) is cut in short chunks (1 to 3 obstacles,
+# cut in the middle of the gaps) and every chunk goes through a reachability solver: the player starts running on
+# the ground, and at every frame the solver keeps every state the player can be in after any input (running /
+# jumping / sliding, height, velocity, slide / laser timers, double jump left, shapes already shot) minus the ones
+# that hit something. All the candidates are solved together, their states are the rows of the same numpy arrays
+#
+# A chunk is kept when:
+# - it can be cleared with every hitbox widened by reactionSlack of scroll, so not only with a frame perfect input
+# - the player can be back on the ground with the slide ready when it ends, so any chunk can come after it
+# - it can't be cleared without pressing anything (trivial)
+# - its obstacles only reach the player inside the chunk
+# Level 2 speeds up: its speeds are split in speedBuckets, a chunk goes in a bucket if it passes at both ends
+# The weight of a chunk is how many times it came out of the candidates (offsets rounded to roundTo px)
+#
+# Everything is simulated like the game does it, one frame per fixed world step (pacing.simStepS, whatever the frame
+# cap the player picked), in the smallest and the largest window of windowSizes
+# (the ground, the spawn point and the cage fall depend on the window), a chunk is only kept when it passes in both.
+# Not modelled: coyote time / jump buffer (the solver can press on any frame anyway) and shots at the obstacles of
+# the next chunk
+
+from collections import Counter
+from dataclasses import dataclass, replace
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator
+import argparse
+import json
+import math
+import random
+import time
+
+import numpy as np
+import numpy.typing as npt
+import pygame
+
+import settings
+from entities.animation import loadFramesMeta
+from entities.obstacle.cage import CageState, FallingCage
+from entities.obstacle.geometric import GeometricObstacle
+from entities.obstacle.lane import Obstacle
+from entities.player import Player, PlayerState, runningFramesPath, slidingFramesPath
+from entities.tilemap import tileSize
+from levels import LevelConfig, levelConfigs
+from pacing import simStepS
+from screens.game.collision import GameCollision
+from screens.game.screen import GameScreen
+from screens.game.spawner import ObstacleSpawner, shapes
+from settings import ScreenSize
+from timeline import Chunk, Kind, TimelineEntry, chunksPathFor, chunksVersion, generate
+
+candidates: int = 600
+minEntries: int = 1
+maxEntries: int = 3
+speedBuckets: int = 4
+reactionSlack: float = 0.05
+roundTo: int = 8
+# Jobs solved together, bounds the memory (and the job id in the state key)
+batchSize: int = 2048
+
+# The world step of the game, all the movement is in whole px per step so the solver has to use the same one
+dt: float = simStepS
+# Smallest window the game allows and 1080p fullscreen: the obstacles don't scale with the window (see
+# ObstacleSpawner.scale) but the ground, the spawn point and the height the cages fall from do. Bigger windows only
+# make the cages fall from higher (so later, they never get harder), but they can make a cage chunk trivial
+windowSizes: list[ScreenSize] = [(settings.minWidth, settings.minHeight), (1920, 1080)]
+
+# Player modes in the solver
+RUN, JUMP, SLIDE = 0, 1, 2
+# Hazard kinds, 0 is an empty slot
+BODY, CAGE = 1, 2
+
+IntArray = npt.NDArray[np.int32]
+BoolArray = npt.NDArray[np.bool_]
+# (frame, left, right, top, bottom, kind)
+Track = tuple[int, int, int, int, int, int]
+# (frame, left, right, top, bottom, kind, entry)
+Hit = tuple[int, int, int, int, int, int, int]
+# (frame, entry, left, right, top, bottom)
+Shot = tuple[int, int, int, int, int, int]
+
+
+# Frames until a timer of the game (decremented by dt every frame, done at <= 0) runs out
+def timerFrames(duration: float) -> int:
+    t, n = duration, 0
+    while t > 0:
+        t -= dt
+        n += 1
+    return n
+
+
+# The getHitbox of the game only look at rect (and state), no need for a whole sprite
+def hitbox(getHitbox: Callable[[Any], pygame.Rect], rect: pygame.Rect, **attrs: Any) -> pygame.Rect:
+    return getHitbox(SimpleNamespace(rect=rect, **attrs))
+
+
+def _s(scale: float, val: int) -> int:
+    return max(1, int(val * scale))
+
+
+# Sizes and positions the game uses in a window of that size
+class Geometry:
+    def __init__(self, size: ScreenSize) -> None:
+        w, h = size
+        screenScale = min(w / GameScreen.baseW, h / GameScreen.baseH)
+        self.spawnScale = ObstacleSpawner.scale
+        collisionScale = GameCollision.scale
+
+        self.groundY = int(h * GameScreen.groundRatio)
+        self.ceilingY = int(h * GameScreen.ceilingRatio)
+        self.playerX = _s(screenScale, GameScreen.playerX)
+        self.obstacleX = w + _s(self.spawnScale, ObstacleSpawner.spawnOffset)
+        self.cageX = w + tileSize // 2
+        self.clearance = _s(collisionScale, GameCollision.jumpClearance)
+
+        # Like Player.__init__, from the frames.json of the animations
+        running = loadFramesMeta(runningFramesPath)
+        sliding = loadFramesMeta(slidingFramesPath)
+        if running is None or len(running) <= 116 or not sliding:
+            raise RuntimeError("frames.json missing, run python -m tools.build_assets animations first")
+        rw, rh = running[116]["size"]
+        self.runW, self.runH = int(rw * Player.playerScale), int(rh * Player.playerScale)
+        sw, sh = sliding[0]["size"]
+        self.slideH = int(self.runH * Player.slideScaleMult)
+        self.slideW = int(sw * self.slideH / sh)
+
+        run = pygame.Rect(0, 0, self.runW, self.runH)
+        run.midbottom = (self.playerX, self.groundY)
+        runBox = hitbox(Player.getHitbox, run, state=PlayerState.RUNNING)
+        slide = pygame.Rect(0, 0, self.slideW, self.slideH)
+        slide.centerx, slide.bottom = self.playerX, self.groundY + (self.slideH - self.runH) // 2
+        slideBox = hitbox(Player.getHitbox, slide, state=PlayerState.SLIDING)
+        # x range, then top / bottom on the ground (minus the height for a jump)
+        self.runBox = (runBox.left, runBox.right, runBox.top, runBox.bottom)
+        self.slideBox = (slideBox.left, slideBox.right, slideBox.top, slideBox.bottom)
+        self.left = min(runBox.left, slideBox.left)
+        self.right = max(runBox.right, slideBox.right)
+
+        # GameScreen._fireLaser / GameCollision.checkLaserHit, the beam starts at the right of the player
+        self.runGun = run.right
+        self.slideGun = slide.right
+        self.runEye = run.top + GameScreen.eyeOffset - GameCollision.laserThickness // 2
+        self.slideEye = slide.centery + GameScreen.slideEyeOffset - GameCollision.laserThickness // 2
+        self.beamH = GameCollision.laserThickness
+
+    def obstacleRect(self, e: TimelineEntry) -> tuple[pygame.Rect, Callable[[Any], pygame.Rect]]:
+        if e.kind == Kind.SHAPE:
+            size = GeometricObstacle._getSizeForShape(shapes[e.variant % len(shapes)], self.spawnScale)
+            posY = self.groundY - _s(self.spawnScale, ObstacleSpawner.tierHeight * e.tier) if e.tier else self.groundY
+            rect = pygame.Rect(0, 0, size * 2, size * 2)
+            rect.centerx, rect.bottom = self.obstacleX, posY
+            return rect, GeometricObstacle.getHitbox
+        h = max(1, int(self.runH * Obstacle.heightRatio * self.spawnScale))
+        rect = pygame.Rect(0, 0, max(1, int(h * Obstacle.widthRatio)), h)
+        rect.centerx, rect.bottom = self.obstacleX, self.groundY
+        return rect, Obstacle.getHitbox
+
+    # Hitbox of an entry spawned on frame 0 for every frame until it's behind the player
+    def track(self, e: TimelineEntry, speed: float, reach: int) -> list[Track]:
+        out: list[Track] = []
+        for f, box, kind in self._frames(e, speed):
+            if box.right + reach <= self.left:
+                break
+            out.append((f, box.left, box.right, box.top, box.bottom, kind))
+        return out
+
+    def _frames(self, e: TimelineEntry, speed: float) -> Iterator[tuple[int, pygame.Rect, int]]:
+        if e.kind == Kind.CAGE:
+            # The real cage, its fall only depends on where the player is
+            cage = FallingCage(self.cageX, self.ceilingY, self.groundY, speed)
+            f = 0
+            while cage.state != CageState.GROUNDED and cage.rect.right >= -50:
+                cage.update(dt, self.playerX)
+                if cage.state == CageState.FALLING:
+                    yield f, cage.getHitbox(), CAGE
+                f += 1
+            return
+
+        rect, getHitbox = self.obstacleRect(e)
+        step = int(speed * dt)
+        f = 0
+        while rect.right >= -50:
+            rect.x -= step
+            yield f, hitbox(getHitbox, rect), BODY
+            f += 1
+
+
+@dataclass
+class Job:
+    chunk: int
+    speed: float
+    # px added left and right of every hitbox
+    margin: int
+    # no input at all
+    bFree: bool
+    hits: list[Hit]
+    # where the shapes are for a shot fired on a frame (before they move)
+    shots: list[Shot]
+    frames: int
+    # an obstacle reaches the player outside of the window
+    bSpill: bool
+
+
+# Frame 0 of a chunk is when something spawned at its start would reach the player, so the windows of the chunks
+# follow each other like the chunks do
+def makeJob(cfg: LevelConfig, geom: Geometry, tracks: dict[tuple[TimelineEntry, float], list[Track]], index: int,
+            chunk: Chunk, speed: float, margin: int, bFree: bool) -> Job:
+    perFrame = speed * dt
+    start = (geom.obstacleX - geom.playerX) // int(perFrame)
+    frames = max(1, round(chunk.length / perFrame))
+    beamL = min(geom.runGun, geom.slideGun)
+    beamR = max(geom.runGun, geom.slideGun) + int(cfg.laserRange)
+    hits: list[Hit] = []
+    shots: list[Shot] = []
+    bSpill = False
+    for n, e in enumerate(chunk.entries):
+        spawn = max(0, math.ceil(e.distance / perFrame) - 1)
+        for f, left, right, top, bottom, kind in tracks[(e, speed)]:
+            t = spawn + f - start
+            if cfg.bLaserEnabled and e.kind == Kind.SHAPE and 0 <= t + 1 < frames and right > beamL and left < beamR:
+                shots.append((t + 1, n, left, right, top, bottom))
+            left, right = left - margin, right + margin
+            if right <= geom.left or left >= geom.right:
+                continue
+            if 0 <= t < frames:
+                hits.append((t, left, right, top, bottom, kind, n))
+            else:
+                bSpill = True
+    return Job(index, speed, margin, bFree, hits, shots, frames, bSpill)
+
+
+# Every job at once: True for the jobs whose end can be reached
+def solve(cfg: LevelConfig, geom: Geometry, jobs: list[Job]) -> BoolArray:
+    return np.concatenate([_solve(cfg, geom, jobs[i:i + batchSize]) for i in range(0, len(jobs), batchSize)]
+                          or [np.zeros(0, dtype=bool)])
+
+
+def _solve(cfg: LevelConfig, geom: Geometry, jobs: list[Job]) -> BoolArray:
+    n = len(jobs)
+    ok = np.zeros(n, dtype=bool)
+    live = [i for i, j in enumerate(jobs) if not j.bSpill]
+    if not live:
+        return ok
+    frames = np.array([j.frames for j in jobs], dtype=np.int32)
+    free = np.array([j.bFree for j in jobs], dtype=bool)
+
+    slots = max((Counter(h[0] for h in j.hits).most_common(1)[0][1] for j in jobs if j.hits), default=1)
+    # left, right, top, bottom, kind, entry
+    hazards = np.zeros((n, int(frames.max()), slots, 6), dtype=np.int32)
+    # left, right, top, bottom of the shapes a shot can reach
+    laser = np.zeros((n, int(frames.max()), maxEntries, 4), dtype=np.int32)
+    for i, j in enumerate(jobs):
+        used: Counter[int] = Counter()
+        for t, *box in j.hits:
+            hazards[i, t, used[t]] = box
+            used[t] += 1
+        for t, entry, *box in j.shots:
+            laser[i, t, entry] = box
+
+    slideN = timerFrames(Player.slideDuration)
+    coolN = timerFrames(Player.slideCooldown)
+    laserN = timerFrames(cfg.laserCooldown)
+    runL, runR, runT, runB = geom.runBox
+    slideL, slideR, slideT, slideB = geom.slideBox
+
+    # job, mode, up, vy, slide timer, slide cooldown, double jump left, laser cooldown, bit per entry already shot
+    rows = len(live)
+    state: list[npt.NDArray[Any]] = [np.array(live, dtype=np.int64), np.zeros(rows, dtype=np.int8),
+                                     np.zeros(rows, dtype=np.int32), np.zeros(rows, dtype=np.float64),
+                                     np.zeros(rows, dtype=np.int32), np.zeros(rows, dtype=np.int32),
+                                     np.zeros(rows, dtype=bool), np.zeros(rows, dtype=np.int32),
+                                     np.zeros(rows, dtype=np.int32)]
+
+    for t in range(hazards.shape[1]):
+        job, mode, up, vy, st, cool, dbl, lcool, gone = state
+        # Inputs: nothing, jump, double jump, slide (Player._jump / _slide), shot (GameScreen._fireLaser)
+        act = ~free[job]
+        cols: list[list[npt.NDArray[Any]]] = [state]
+        m = act & (mode == RUN)
+        k = int(m.sum())
+        cols.append([job[m], np.full(k, JUMP, np.int8), up[m], np.full(k, cfg.jumpForce), st[m], cool[m],
+                     np.full(k, cfg.bDoubleJump), lcool[m], gone[m]])
+        if cfg.bDoubleJump:
+            m = act & (mode == JUMP) & dbl
+            k = int(m.sum())
+            cols.append([job[m], mode[m], up[m], np.full(k, cfg.doubleJumpForce), st[m], cool[m],
+                         np.zeros(k, dtype=bool), lcool[m], gone[m]])
+        if cfg.bSlideEnabled:
+            m = act & (mode == RUN) & (cool == 0)
+            k = int(m.sum())
+            cols.append([job[m], np.full(k, SLIDE, np.int8), up[m], vy[m], np.full(k, slideN, np.int32),
+                         np.full(k, coolN, np.int32), dbl[m], lcool[m], gone[m]])
+        if cfg.bLaserEnabled:
+            # The beam stops on the first shape it meets, shots that hit nothing are never worth it
+            m = act & (lcool == 0)
+            b = laser[job[m], t]
+            bSlide = (mode[m] == SLIDE)[:, None]
+            gun = np.where(bSlide, geom.slideGun, geom.runGun)
+            eye = np.where(bSlide, geom.slideEye, geom.runEye - up[m][:, None])
+            hit = ((gun < b[..., 1]) & (gun + int(cfg.laserRange) > b[..., 0]) & (eye < b[..., 3])
+                   & (eye + geom.beamH > b[..., 2]) & (((gone[m][:, None] >> np.arange(maxEntries)) & 1) == 0))
+            first = np.argmin(np.where(hit, b[..., 0], np.iinfo(np.int32).max), axis=1)
+            shot = hit.any(axis=1)
+            idx = np.flatnonzero(m)[shot]
+            cols.append([job[idx], mode[idx], up[idx], vy[idx], st[idx], cool[idx], dbl[idx],
+                         np.full(len(idx), laserN, np.int32), gone[idx] | (1 << first[shot]).astype(np.int32)])
+        job, mode, up, vy, st, cool, dbl, lcool, gone = (np.concatenate(c) for c in zip(*cols))
+
+        # Player.update
+        m = mode == JUMP
+        vy[m] += cfg.gravity * dt
+        up[m] -= np.trunc(vy[m] * dt).astype(np.int32)
+        m &= up <= 0
+        up[m], vy[m], mode[m], dbl[m] = 0, 0.0, RUN, False
+        m = mode == SLIDE
+        st[m] -= 1
+        mode[m & (st == 0)] = RUN
+        np.maximum(cool - 1, 0, out=cool)
+        np.maximum(lcool - 1, 0, out=lcool)
+
+        # GameCollision: bodies unless jumping over them, cages while falling unless sliding, not what was shot
+        h = hazards[job, t]
+        bSlide = mode == SLIDE
+        pl = np.where(bSlide, slideL, runL)[:, None]
+        pr = np.where(bSlide, slideR, runR)[:, None]
+        pt = np.where(bSlide, slideT, runT - up)[:, None]
+        pb = np.where(bSlide, slideB, runB - up)[:, None]
+        over = ((pl < h[..., 1]) & (pr > h[..., 0]) & (pt < h[..., 3]) & (pb > h[..., 2])
+                & (((gone[:, None] >> h[..., 5]) & 1) == 0))
+        body = over & (h[..., 4] == BODY) & ~((mode == JUMP)[:, None] & (pb < h[..., 2] + geom.clearance))
+        cage = over & (h[..., 4] == CAGE) & ~bSlide[:, None]
+        m = ~(body | cage).any(axis=1)
+
+        # Same state twice is the same future
+        key = ((job << 51) | (gone.astype(np.int64) << 48) | (lcool.astype(np.int64) << 43)
+               | (mode.astype(np.int64) << 41) | (up.astype(np.int64) << 31)
+               | ((np.round(vy * 2).astype(np.int64) + 32768) << 14) | (st.astype(np.int64) << 8)
+               | (cool.astype(np.int64) << 1) | dbl)
+        _, first = np.unique(np.where(m, key, -1), return_index=True)
+        first = first[m[first]]
+        state = [a[first] for a in (job, mode, up, vy, st, cool, dbl, lcool, gone)]
+
+        # Windows ending on this frame: back on the ground with the slide and the laser ready
+        job, mode, cool, lcool = state[0], state[1], state[5], state[7]
+        done = frames[job] == t + 1
+        if done.any():
+            ok[job[done & (mode == RUN) & (cool == 0) & (lcool == 0)]] = True
+            state = [a[~done] for a in state]
+        if not len(state[0]):
+            break
+    return ok
+
+
+def _round(val: float) -> int:
+    return roundTo * round(val / roundTo)
+
+
+# Cut from the level's random timeline at a fixed speed, a chunk starts and ends in the middle of a gap
+def sampleChunks(cfg: LevelConfig, speed: float, count: int, rng: random.Random) -> list[Chunk]:
+    stream = generate(replace(cfg, scrollSpeed=speed, bSpeedGrowth=False, maxSpeed=speed), rng)
+    prev, cur = next(stream), next(stream)
+    out: list[Chunk] = []
+    while len(out) < count:
+        group = [cur] + [next(stream) for _ in range(rng.randint(minEntries, maxEntries) - 1)]
+        nxt = next(stream)
+        start = (prev.distance + group[0].distance) / 2
+        end = (group[-1].distance + nxt.distance) / 2
+        entries = tuple(TimelineEntry(_round(e.distance - start), e.kind, e.tier,
+                                      e.variant if e.kind == Kind.SHAPE else 0) for e in group)
+        out.append(Chunk(entries, max(roundTo, _round(end - start))))
+        prev, cur = group[-1], nxt
+    return out
+
+
+def bucketSpeeds(cfg: LevelConfig) -> list[float]:
+    if not cfg.bSpeedGrowth or cfg.maxSpeed <= cfg.scrollSpeed:
+        return [cfg.scrollSpeed]
+    step = (cfg.maxSpeed - cfg.scrollSpeed) / speedBuckets
+    return [cfg.scrollSpeed + i * step for i in range(speedBuckets + 1)]
+
+
+# fair: with the slack, free: without pressing anything, raw: can it be done at all (only asked when fair fails,
+# it's just to tell tight from impossible)
+def check(cfg: LevelConfig, geom: Geometry, pool: list[Chunk],
+          pairs: list[tuple[int, float]]) -> dict[tuple[int, float, str], tuple[bool, bool]]:
+    margins = {s: round(reactionSlack / dt) * int(s * dt) for _, s in pairs}
+    reach = max(margins.values())
+    tracks: dict[tuple[TimelineEntry, float], list[Track]] = {}
+    for i, s in pairs:
+        for e in pool[i].entries:
+            if (e, s) not in tracks:
+                tracks[(e, s)] = geom.track(e, s, reach)
+
+    jobs = [makeJob(cfg, geom, tracks, i, pool[i], s, margins[s], False) for i, s in pairs]
+    jobs += [makeJob(cfg, geom, tracks, i, pool[i], s, 0, True) for i, s in pairs]
+    ok = solve(cfg, geom, jobs)
+    result = {(j.chunk, j.speed, "free" if j.bFree else "fair"): (bool(ok[n]), j.bSpill) for n, j in enumerate(jobs)}
+    raw = [makeJob(cfg, geom, tracks, i, pool[i], s, 0, False) for i, s in pairs if not result[(i, s, "fair")][0]]
+    ok = solve(cfg, geom, raw)
+    result.update({(j.chunk, j.speed, "raw"): (bool(ok[n]), j.bSpill) for n, j in enumerate(raw)})
+    return result
+
+
+def buildLevel(levelId: int, count: int = candidates, seed: int = 0) -> list[str]:
+    pygame.init()
+    cfg = levelConfigs[levelId]
+    rng = random.Random(seed * 1000 + levelId)
+    speeds = bucketSpeeds(cfg)
+    ranges = list(zip(speeds, speeds[1:])) or [(speeds[0], speeds[0])]
+
+    pool: list[Chunk] = []
+    bucketCounts: list[Counter[Chunk]] = []
+    for lo, hi in ranges:
+        bucketCounts.append(Counter(sampleChunks(cfg, (lo + hi) / 2, count, rng)))
+        pool.extend(c for c in bucketCounts[-1] if c not in pool)
+    index = {c: i for i, c in enumerate(pool)}
+
+    pairs = sorted({(index[c], s) for (lo, hi), counts in zip(ranges, bucketCounts) for c in counts for s in (lo, hi)})
+    results = [check(cfg, Geometry(size), pool, pairs) for size in windowSizes]
+
+    kept: list[Chunk] = []
+    buckets: list[dict[str, list[Any]]] = []
+    report: list[str] = []
+    for (lo, hi), counts in zip(ranges, bucketCounts):
+        stats: Counter[str] = Counter()
+        ids: list[int] = []
+        weights: list[float] = []
+        total = 0
+        for c, weight in counts.items():
+            i = index[c]
+            ends = (lo, hi)
+            if any(r[(i, s, "fair")][1] for r in results for s in ends):
+                stats["spill"] += weight
+            elif not all(r.get((i, s, "raw"), (True, False))[0] for r in results for s in ends):
+                stats["impossible"] += weight
+            elif not all(r[(i, s, "fair")][0] for r in results for s in ends):
+                stats["tight"] += weight
+            elif any(all(r[(i, s, "free")][0] for s in ends) for r in results):
+                stats["trivial"] += weight
+            else:
+                if c not in kept:
+                    kept.append(c)
+                ids.append(kept.index(c))
+                total += weight
+                weights.append(total)
+        buckets.append({"chunks": ids, "weights": weights})
+        report.append(f"level {levelId} @ {lo:.0f}-{hi:.0f} px/s: {len(ids)} chunks kept ({total}/{count} candidates)"
+                      + "".join(f", {v} {k}" for k, v in sorted(stats.items())))
+
+    data = {
+        "version": chunksVersion,
+        "level": levelId,
+        "speeds": [lo for lo, _ in ranges],
+        "chunks": [{"length": c.length, "entries": [[e.distance, int(e.kind), e.tier, e.variant] for e in c.entries]}
+                   for c in kept],
+        "buckets": buckets,
+    }
+    path = chunksPathFor(levelId)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, separators=(",", ":")) + "\n")
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Builds the validated obstacle chunks of the levels")
+    parser.add_argument("levels", nargs="*", type=int, default=sorted(levelConfigs))
+    parser.add_argument("--candidates", type=int, default=candidates, help="candidates per speed bucket")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for levelId in args.levels:
+        if levelId not in levelConfigs:
+            parser.error(f"unknown level {levelId}")
+        start = time.perf_counter()
+        for line in buildLevel(levelId, args.candidates, args.seed):
+            print(line)
+        print(f"level {levelId}: {chunksPathFor(levelId)} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
 # Allow us to convert the ground & ceilling from the background images into tiles
 # Which allow us to do things like cages
+# Every layer is written as one atlas (atlas.png) + an index (atlas.json) that TileSet loads with a single decode:
+# columns that look the same are stored once (sha1 of the pixels) and the index says which tile every column of
+# the background uses. Extra pre-scaled rows can be stored, the game uses them as they are instead of scaling
 
 from pathlib import Path
+import hashlib
+import json
 import sys
 import pygame
 
@@ -9,6 +14,14 @@ tileSize: int = 64
 groundRatio: float = 0.85
 ceilingHeight: int = 60
 
+# Keep in sync with GameScreen / MenuBackground.ceilingRatio, the tilemap is as tall as the ceiling
+ceilingRatio: float = 0.0542
+# Window heights we store a pre-scaled ceiling row for. Empty on purpose: a row costs ~2 ms of png decode at load,
+# scaling the whole native row at runtime (CeilingTilemap) costs ~0.3 ms
+targetScreenHeights: list[int] = []
+
+atlasName: str = "atlas"
+
 root: Path = Path(__file__).parent.parent.parent
 bgPath: Path = root / "screens" / "background.png"
 tilesDir: Path = root / "assets" / "tiles"
@@ -19,35 +32,74 @@ def initPygame() -> pygame.Surface:
     pygame.display.set_mode((1, 1))
     return pygame.image.load(str(bgPath)).convert()
 
+def tileHash(tile: pygame.Surface) -> str:
+    return hashlib.sha1(pygame.image.tobytes(tile, "RGB")).hexdigest()
+
+# Returns the unique tiles and, for every column, the index of its tile
+def dedupe(tiles: list[pygame.Surface]) -> tuple[list[pygame.Surface], list[int]]:
+    unique: list[pygame.Surface] = []
+    seen: dict[str, int] = {}
+    columns: list[int] = []
+    for tile in tiles:
+        key = tileHash(tile)
+        if key not in seen:
+            seen[key] = len(unique)
+            unique.append(tile)
+        columns.append(seen[key])
+    return unique, columns
+
+# One row per height, the first one is the native height, scaled with transform.scale like the game did at runtime
+def writeAtlas(out: Path, tiles: list[pygame.Surface], heights: list[int]) -> None:
+    unique, columns = dedupe(tiles)
+    nativeH = unique[0].get_height()
+    rowHeights = [nativeH] + sorted({h for h in heights if h != nativeH})
+
+    atlas = pygame.Surface((len(unique) * tileSize, sum(rowHeights)))
+    rows: dict[str, int] = {}
+    y = 0
+    for h in rowHeights:
+        for i, tile in enumerate(unique):
+            if h != nativeH:
+                tile = pygame.transform.scale(tile, (tileSize, h))
+            atlas.blit(tile, (i * tileSize, y))
+        rows[str(h)] = y
+        y += h
+
+    out.mkdir(parents=True, exist_ok=True)
+    # The one-png-per-column layout from before
+    for old in out.glob("*.png"):
+        if old.stem != atlasName:
+            old.unlink()
+    pygame.image.save(atlas, str(out / f"{atlasName}.png"))
+    index = {"tileWidth": tileSize, "count": len(unique), "rows": rows, "columns": columns}
+    (out / f"{atlasName}.json").write_text(json.dumps(index, indent=1) + "\n")
+    print(f"Done: {len(tiles)} columns, {len(unique)} unique tiles, rows {rowHeights} saved to {out}")
+
 def extractGround(bg: pygame.Surface) -> None:
     w, h = bg.get_size()
     groundY = int(h * groundRatio)
     groundH = h - groundY
-    out = tilesDir / "ground"
-    out.mkdir(parents=True, exist_ok=True)
 
+    tiles: list[pygame.Surface] = []
     for i in range(w // tileSize):
         x = i * tileSize
         rect = pygame.Rect(x, groundY, tileSize, min(tileSize, groundH))
-        tile = bg.subsurface(rect).copy()
-        pygame.image.save(tile, str(out / f"mat_{i:02d}.png"))
-        print(f"Extracted ground tile {i}")
+        tiles.append(bg.subsurface(rect).copy())
 
-    print(f"Done: {w // tileSize} ground tiles saved to {out}")
+    # The ground is drawn at its native size
+    writeAtlas(tilesDir / "ground", tiles, [])
 
 def extractCeiling(bg: pygame.Surface) -> None:
     w, _ = bg.get_size()
-    out = tilesDir / "ceiling"
-    out.mkdir(parents=True, exist_ok=True)
 
+    tiles: list[pygame.Surface] = []
     for i in range(w // tileSize):
         x = i * tileSize
         rect = pygame.Rect(x, 0, tileSize, ceilingHeight)
-        tile = bg.subsurface(rect).copy()
-        pygame.image.save(tile, str(out / f"ceiling_{i:02d}.png"))
-        print(f"Extracted ceiling tile {i}")
+        tiles.append(bg.subsurface(rect).copy())
 
-    print(f"Done: {w // tileSize} ceiling tiles saved to {out}")
+    heights = [max(1, int(h * ceilingRatio)) for h in targetScreenHeights]
+    writeAtlas(tilesDir / "ceiling", tiles, heights)
 
 def main(mode: str) -> None:
     bg = initPygame()
@@ -0,0 +1,101 @@
+# Local stand-in for the Discord client, speaks just enough of the IPC protocol (handshake + SET_ACTIVITY) for
+# pypresence, so the presence worker in discord.py can be tried without Discord (Linux / macOS only, unix socket)
+#   python -m tools.fake_discord --delay 3        then in another terminal: XDG_RUNTIME_DIR=<dir it prints> python main.py
+# --delay / --hang / --dropAfter simulate a slow, stuck or crashing Discord, the game should not drop a frame
+
+import argparse
+import asyncio
+import json
+import os
+import struct
+import tempfile
+import time
+
+opHandshake = 0
+opFrame = 1
+opClose = 2
+
+
+def pack(op: int, payload: dict[str, object]) -> bytes:
+    data = json.dumps(payload).encode("utf-8")
+    return struct.pack("<II", op, len(data)) + data
+
+
+async def readFrame(reader: asyncio.StreamReader) -> tuple[int, dict[str, object]]:
+    op, length = struct.unpack("<II", await reader.readexactly(8))
+    return op, json.loads(await reader.readexactly(length))
+
+
+class FakeDiscord:
+    def __init__(self, delay: float, bHang: bool, dropAfter: int) -> None:
+        self.delay = delay
+        self.bHang = bHang
+        self.dropAfter = dropAfter
+        self.frames = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        start = time.perf_counter()
+        try:
+            while True:
+                op, payload = await readFrame(reader)
+                if op == opHandshake:
+                    print(f"handshake client_id={payload.get('client_id')}")
+                    writer.write(pack(opFrame, {"cmd": "DISPATCH", "evt": "READY", "data": {"v": 1}}))
+                elif op == opClose:
+                    print("client closed")
+                    break
+                else:
+                    self.frames += 1
+                    args = payload.get("args")
+                    activity = args.get("activity") if isinstance(args, dict) else None
+                    state = activity.get("state") if isinstance(activity, dict) else None
+                    print(f"[{time.perf_counter() - start:7.2f}s] {payload.get('cmd')}: {state}")
+                    if self.dropAfter and self.frames >= self.dropAfter:
+                        print("dropping the connection")
+                        self.frames = 0
+                        break
+                    if self.bHang:
+                        continue
+                    if self.delay > 0:
+                        await asyncio.sleep(self.delay)
+                    writer.write(pack(opFrame, {"cmd": payload.get("cmd"), "nonce": payload.get("nonce"),
+                                                "evt": None, "data": activity}))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            print("client gone")
+        finally:
+            writer.close()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    directory = args.dir or tempfile.mkdtemp(prefix="fake-discord-")
+    path = os.path.join(directory, f"discord-ipc-{args.pipe}")
+    if os.path.exists(path):
+        os.unlink(path)
+
+    fake = FakeDiscord(args.delay, args.hang, args.dropAfter)
+    server = await asyncio.start_unix_server(fake.handle, path)
+    print(f"Fake Discord listening on {path}")
+    print(f"Run the game with: XDG_RUNTIME_DIR={directory} python main.py")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        os.unlink(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m tools.fake_discord")
+    parser.add_argument("--dir", default=None, help="Directory for the socket (default: a new temp dir)")
+    parser.add_argument("--pipe", type=int, default=0, help="discord-ipc-N number")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds before answering each update")
+    parser.add_argument("--hang", action="store_true", help="Never answer updates")
+    parser.add_argument("--dropAfter", type=int, default=0, help="Close the connection after N updates")
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,103 +1,294 @@
+
 # Not made by us, taken from a gist
+# Rewritten on numpy arrays, the original did a per-pixel BFS with sets of tuples and took minutes on the running
+# animation. Same thresholds and same output pixel for pixel:
+# - transparent = dark pixels (<= th) 8-connected to a dark pixel of the border
+# - every visible edge pixel loses up to 30% alpha (by the share of transparent neighbours) once per transparent
+#   4-neighbour
+# Works on a single GIF or on a whole directory of GIFs (the frames/ folders), files are split over a process pool,
+# and every run also writes an atlas (trimmed frames packed in PNG pages + a json with the rects and delays)
 
 from PIL import Image, ImageSequence
-from collections import deque
-import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+import argparse
+import json
+import os
+import re
+import time
+
+import numpy as np
+import numpy.typing as npt
 
 blackTh: int = 15
+# The gist also had a second threshold (40) for the pixels it queued, they were only kept when under blackTh anyway
+# so it never changed the result
 alphaTh: int = 40
 
-dirs4: list[tuple[int, int]] = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-dirs8: list[tuple[int, int]] = dirs4 + [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+atlasMaxSize: int = 4096
+atlasPadding: int = 1
+
+BoolArray = npt.NDArray[np.bool_]
+Rgba = npt.NDArray[np.uint8]
+
+delayRe = re.compile(r"delay-([\d.]+)s")
+
+
+def isBlack(rgba: Rgba, th: int) -> BoolArray:
+    return (rgba[..., 0] <= th) & (rgba[..., 1] <= th) & (rgba[..., 2] <= th)
+
+
+# Runs of True along the rows: every run with at least one reached pixel gets reached entirely
+class _Runs:
+    def __init__(self, mask: BoolArray) -> None:
+        h, w = mask.shape
+        padded = np.zeros((h, w + 1), dtype=bool)
+        padded[:, :w] = mask
+        flat = padded.ravel()
+        starts = flat.copy()
+        starts[1:] &= ~flat[:-1]
+        self.mask = mask
+        self.ids = np.cumsum(starts, dtype=np.int32).reshape(h, w + 1)[:, :w]
+        self.count = int(self.ids[-1, -1]) + 1
+
+    def fill(self, reach: BoolArray) -> BoolArray:
+        hit = np.zeros(self.count, dtype=bool)
+        hit[self.ids[reach]] = True
+        result: BoolArray = hit[self.ids] & self.mask
+        return result
+
+
+def _dilate8(a: BoolArray) -> BoolArray:
+    rows = a.copy()
+    rows[1:] |= a[:-1]
+    rows[:-1] |= a[1:]
+    out = rows.copy()
+    out[:, 1:] |= rows[:, :-1]
+    out[:, :-1] |= rows[:, 1:]
+    return out
+
+
+# Part of the mask 8-connected to its border: straight runs are filled in one go (rows then columns) and the
+# diagonal steps come from the dilation, so it only loops once per turn of the region and not once per pixel
+def borderConnected(mask: BoolArray) -> BoolArray:
+    reach = np.zeros_like(mask)
+    reach[0] = mask[0]
+    reach[-1] = mask[-1]
+    reach[:, 0] |= mask[:, 0]
+    reach[:, -1] |= mask[:, -1]
+
+    rows = _Runs(mask)
+    cols = _Runs(mask.T)
+    count = -1
+    while True:
+        reach = rows.fill(_dilate8(reach) & mask)
+        reach = cols.fill(reach.T).T
+        n = int(np.count_nonzero(reach))
+        if n == count:
+            return reach
+        count = n
+
+
+# How many neighbours (4 or 8) are set, outside the frame counts as not set
+def _neighbours(a: npt.NDArray[np.uint8]) -> tuple[npt.NDArray[np.int32], npt.NDArray[np.int32]]:
+    h, w = a.shape
+    p = np.zeros((h + 2, w + 2), dtype=np.int32)
+    p[1:-1, 1:-1] = a
+    n4 = p[:-2, 1:-1] + p[2:, 1:-1] + p[1:-1, :-2] + p[1:-1, 2:]
+    n8 = n4 + p[:-2, :-2] + p[:-2, 2:] + p[2:, :-2] + p[2:, 2:]
+    return n4, n8
+
+
+def processFrame(rgba: Rgba, th: int = blackTh) -> Rgba:
+    out = rgba.copy()
+    transparent = borderConnected(isBlack(rgba, th))
+    out[transparent] = 0
+
+    n4, n8 = _neighbours(transparent.view(np.uint8))
+    _, total = _neighbours(np.ones(transparent.shape, dtype=np.uint8))
+    alpha = out[..., 3].astype(np.int64)
+    edges = ~transparent & (n4 > 0) & (alpha > 0) & ~isBlack(out, th)
+
+    # The gist listed an edge pixel once per transparent 4-neighbour and faded it every time
+    factor = 1 - (n8 / total) * 0.3
+    for k in range(1, 5):
+        sel = edges & (n4 >= k)
+        if not sel.any():
+            break
+        alpha[sel] = np.maximum(0, (alpha[sel] * factor[sel]).astype(np.int64))
+    out[..., 3] = alpha
+    return out
 
-def isBlack(r: int, g: int, b: int, th: int) -> bool:
-    return r <= th and g <= th and b <= th
 
 def floodFill(frame: Image.Image, th: int) -> Image.Image:
-    frame = frame.convert('RGBA')
-    w, h = frame.size
-    px = frame.load()
-    visited: set[tuple[int, int]] = set()
-    transparent: set[tuple[int, int]] = set()
-
-    starts: list[tuple[int, int]] = [(x, 0) for x in range(w)] + [(x, h-1) for x in range(w)]
-    starts += [(0, y) for y in range(h)] + [(w-1, y) for y in range(h)]
-
-    q: deque[tuple[int, int]] = deque()
-    for p in starts:
-        r, g, b = px[p][0], px[p][1], px[p][2]
-        if p not in visited and isBlack(r, g, b, th):
-            q.append(p)
-            visited.add(p)
-
-    while q:
-        x, y = q.popleft()
-        r, g, b = px[x, y][0], px[x, y][1], px[x, y][2]
-        if isBlack(r, g, b, th):
-            transparent.add((x, y))
-            for dx, dy in dirs8:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < w and 0 <= ny < h and (nx, ny) not in visited:
-                    nr, ng, nb = px[nx, ny][0], px[nx, ny][1], px[nx, ny][2]
-                    if isBlack(nr, ng, nb, alphaTh):
-                        visited.add((nx, ny))
-                        q.append((nx, ny))
-
-    for x, y in transparent:
-        px[x, y] = (0, 0, 0, 0)
-
-    antialias(frame, transparent, th)
-    return frame
-
-
-def antialias(frame: Image.Image, transparent: set[tuple[int, int]], th: int) -> None:
-    w, h = frame.size
-    px = frame.load()
-
-    edges: list[tuple[int, int]] = []
-    for x, y in transparent:
-        for dx, dy in dirs4:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < w and 0 <= ny < h and (nx, ny) not in transparent:
-                r, g, b, a = px[nx, ny]
-                if a > 0 and not isBlack(r, g, b, th):
-                    edges.append((nx, ny))
-
-    for x, y in edges:
-        r, g, b, a = px[x, y]
-        transN = total = 0
-        for dx in range(-1, 2):
-            for dy in range(-1, 2):
-                if dx == 0 and dy == 0:
-                    continue
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < w and 0 <= ny < h:
-                    total += 1
-                    if (nx, ny) in transparent:
-                        transN += 1
-
-        if total > 0 and transN > 0:
-            blend = transN / total
-            px[x, y] = (r, g, b, max(0, int(a * (1 - blend * 0.3))))
-
-
-def removeBg(inp: str, out: str, th: int = blackTh) -> None:
+    rgba = np.asarray(frame.convert('RGBA'))
+    return Image.fromarray(processFrame(rgba, th), 'RGBA')
+
+
+@dataclass
+class Frame:
+    name: str
+    index: int
+    # in seconds, from the file name (frame_000_delay-0.03s.gif) or the GIF itself
+    delay: float
+    size: tuple[int, int]
+    # alpha bounding box in the frame (x, y, w, h) and its pixels, the atlas only stores that part
+    bbox: tuple[int, int, int, int]
+    pixels: Rgba
+
+
+def _trim(name: str, index: int, delay: float, rgba: Rgba) -> Frame:
+    h, w = rgba.shape[:2]
+    ys, xs = np.nonzero(rgba[..., 3])
+    if len(xs) == 0:
+        return Frame(name, index, delay, (w, h), (0, 0, 0, 0), rgba[:0, :0].copy())
+    x0, x1, y0, y1 = int(xs.min()), int(xs.max()) + 1, int(ys.min()), int(ys.max()) + 1
+    return Frame(name, index, delay, (w, h), (x0, y0, x1 - x0, y1 - y0), rgba[y0:y1, x0:x1].copy())
+
+
+def _decode(inp: Path) -> tuple[list[Rgba], list[float], dict[str, Any]]:
     img = Image.open(inp)
-    frames: list[Image.Image] = [floodFill(f.copy(), th) for f in ImageSequence.Iterator(img)]
+    match = delayRe.search(inp.name)
+    frames: list[Rgba] = []
+    delays: list[float] = []
+    for f in ImageSequence.Iterator(img):
+        frames.append(np.asarray(f.copy().convert('RGBA')))
+        delays.append(float(match.group(1)) if match else f.info.get('duration', 100) / 1000.0)
+    return frames, delays, {str(k): v for k, v in img.info.items()}
+
 
-    frames[0].save(
-        out, save_all=True, append_images=frames[1:], optimize=False,
-        duration=img.info.get('duration', 100), loop=img.info.get('loop', 0),
+def _saveGif(out: Path, frames: list[Rgba], info: dict[str, Any]) -> None:
+    images = [Image.fromarray(f, 'RGBA') for f in frames]
+    images[0].save(
+        out, save_all=True, append_images=images[1:], optimize=False,
+        duration=info.get('duration', 100), loop=info.get('loop', 0),
         transparency=0, disposal=2
     )
+
+
+# One whole file in a worker, only the trimmed frames come back for the atlas
+def processFile(inp: Path, out: Path, th: int) -> list[Frame]:
+    frames, delays, info = _decode(inp)
+    done = [processFrame(f, th) for f in frames]
+    _saveGif(out, done, info)
+    return [_trim(inp.name, i, delays[i], f) for i, f in enumerate(done)]
+
+
+def _pool(workers: int) -> ProcessPoolExecutor | None:
+    return ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+
+def _map(pool: ProcessPoolExecutor | None, fn: Any, *args: Any) -> Iterator[Any]:
+    return pool.map(fn, *args) if pool is not None else map(fn, *args)
+
+
+# Single GIF: the frames are split over the workers
+def removeBg(inp: str, out: str, th: int = blackTh, workers: int = 1) -> list[Frame]:
+    frames, delays, info = _decode(Path(inp))
+    pool = _pool(min(workers, len(frames)))
+    try:
+        done: list[Rgba] = list(_map(pool, processFrame, frames, [th] * len(frames)))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    _saveGif(Path(out), done, info)
     print(f"GIF traite: {inp} ({len(frames)} frames)")
+    return [_trim(Path(inp).name, i, delays[i], f) for i, f in enumerate(done)]
+
+
+# Directory: one job per GIF, same names in the output directory
+def removeBgDir(inp: str, out: str, th: int = blackTh, workers: int = 1) -> list[Frame]:
+    files = sorted(Path(inp).glob("*.gif"))
+    outDir = Path(out)
+    outDir.mkdir(parents=True, exist_ok=True)
+
+    result: list[Frame] = []
+    pool = _pool(min(workers, len(files)))
+    try:
+        for frames in _map(pool, processFile, files, [outDir / f.name for f in files], [th] * len(files)):
+            result.extend(frames)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    print(f"Dossier traite: {inp} ({len(files)} GIF, {len(result)} frames)")
+    return result
+
+
+# Shelf packing, tallest first, a new page when a shelf doesn't fit anymore
+def writeAtlas(frames: list[Frame], base: Path) -> None:
+    order = sorted(range(len(frames)), key=lambda i: -frames[i].bbox[3])
+    pages: list[list[int]] = []
+    places: dict[int, tuple[int, int, int]] = {}
+    x = y = shelfH = 0
+    for i in order:
+        _, _, w, h = frames[i].bbox
+        if w > atlasMaxSize or h > atlasMaxSize:
+            raise ValueError(f"{frames[i].name} is bigger than an atlas page ({w}x{h})")
+        if not pages or x + w > atlasMaxSize:
+            x, y, shelfH = 0, y + shelfH + atlasPadding, 0
+        if not pages or y + h > atlasMaxSize:
+            pages.append([])
+            x = y = shelfH = 0
+        places[i] = (len(pages) - 1, x, y)
+        pages[-1].append(i)
+        x += w + atlasPadding
+        shelfH = max(shelfH, h)
+
+    pageNames: list[str] = []
+    for p, members in enumerate(pages):
+        pw = max((places[i][1] + frames[i].bbox[2] for i in members), default=1)
+        ph = max((places[i][2] + frames[i].bbox[3] for i in members), default=1)
+        sheet = np.zeros((max(1, ph), max(1, pw), 4), dtype=np.uint8)
+        for i in members:
+            _, px, py = places[i]
+            _, _, w, h = frames[i].bbox
+            sheet[py:py + h, px:px + w] = frames[i].pixels
+        name = f"{base.name}_{p}.png"
+        Image.fromarray(sheet, 'RGBA').save(base.with_name(name))
+        pageNames.append(name)
+
+    meta = {
+        "pages": pageNames,
+        "frames": [
+            {
+                "file": f.name,
+                "index": f.index,
+                "delay": f.delay,
+                "size": list(f.size),
+                "page": places[i][0],
+                "rect": [places[i][1], places[i][2], f.bbox[2], f.bbox[3]],
+                "offset": [f.bbox[0], f.bbox[1]],
+            }
+            for i, f in enumerate(frames)
+        ],
+    }
+    with open(base.with_name(base.name + ".json"), "w") as fp:
+        json.dump(meta, fp, indent=1)
+    print(f"Atlas: {base}.json ({len(pageNames)} pages)")
 
 
 def main() -> None:
-    inp = sys.argv[1]
-    out = sys.argv[2] if len(sys.argv) >= 3 else inp[:-4] + '_transparent.gif'
-    th = int(sys.argv[3]) if len(sys.argv) >= 4 else blackTh
-    removeBg(inp, out, th)
+    parser = argparse.ArgumentParser(description="Removes the black background of GIFs (file or directory)")
+    parser.add_argument("inp")
+    parser.add_argument("out", nargs="?", default=None)
+    parser.add_argument("th", nargs="?", type=int, default=blackTh)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if Path(args.inp).is_dir():
+        out = args.out or args.inp.rstrip("/\\") + "_transparent"
+        frames = removeBgDir(args.inp, out, args.th, args.workers)
+        base = Path(out) / "atlas"
+    else:
+        out = args.out or args.inp[:-4] + '_transparent.gif'
+        frames = removeBg(args.inp, out, args.th, args.workers)
+        base = Path(out).with_suffix("").with_name(Path(out).stem + "_atlas")
+    if frames:
+        writeAtlas(frames, base)
+    print(f"Done in {time.perf_counter() - start:.1f}s")
 
 
 if __name__ == "__main__":